@@ -0,0 +1,4 @@
+"""
+Пакет бенчмарков конвейера калькулятора.
+Каждый модуль запускается отдельно: python -m benchmarks.<имя модуля>
+"""
@@ -0,0 +1,70 @@
+"""
+Бенчмарк единой точки входа Validator.compile в сравнении со старым
+конвейером, в котором выражение токенизировалось дважды
+"""
+
+from src.tokenizer import Tokenizer
+from src.validator import Validator
+
+import argparse
+import timeit
+
+
+def build_expression(terms: int) -> str:
+    """
+    Строит длинное корректное выражение из заданного количества слагаемых
+
+    Аргументы:
+        terms (int): количество слагаемых
+
+    Возвращаемое значение:
+        str: выражение
+    """
+    parts = [f"({index} * 3.5 - {index} // 2)" for index in range(1, terms + 1)]
+    return " + ".join(parts)
+
+
+def run(terms: int, repeat: int) -> dict[str, float]:
+    """
+    Замеряет среднее время обработки одного выражения обоими способами
+
+    Аргументы:
+        terms (int): количество слагаемых в выражении
+        repeat (int): количество повторов замера
+
+    Возвращаемое значение:
+        dict[str, float]: время на одно выражение в микросекундах
+    """
+    tokenizer = Tokenizer()
+    validator = Validator(tokenizer)
+    expression = build_expression(terms)
+
+    def old_pipeline() -> None:
+        validator.check_correctness_expression(expression)
+        tokenizer.tokenize(expression)
+
+    def new_pipeline() -> None:
+        validator.compile(expression)
+
+    old_time = min(timeit.repeat(old_pipeline, number=1, repeat=repeat))
+    new_time = min(timeit.repeat(new_pipeline, number=1, repeat=repeat))
+
+    return {
+        "old_us": old_time * 1e6,
+        "new_us": new_time * 1e6,
+        "speedup": old_time / new_time,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--terms", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    arguments = parser.parse_args()
+
+    report = run(arguments.terms, arguments.repeat)
+    print(
+        f"validate + tokenize: {report['old_us']:.1f} мкс\n"
+        f"compile:             {report['new_us']:.1f} мкс\n"
+        f"ускорение:           x{report['speedup']:.2f}"
+    )
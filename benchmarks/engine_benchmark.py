@@ -0,0 +1,78 @@
+"""
+Бенчмарк для A/B сравнения движков калькулятора: рекурсивного спуска
+и стекового движка без рекурсии
+"""
+
+from src.calculator import Calculator
+from src.tokenizer import Tokenizer
+
+import argparse
+import timeit
+
+
+def build_expressions(size: int) -> dict[str, str]:
+    """
+    Строит набор выражений разной формы
+
+    Аргументы:
+        size (int): размер выражений
+
+    Возвращаемое значение:
+        dict[str, str]: выражения по названиям
+    """
+    return {
+        "flat_sum": " + ".join(str(index) for index in range(size)),
+        "mixed": " + ".join(f"({index} * 3 - {index} // 2) ** 2" for index in range(size)),
+        "nested": "(" * size + "1" + " + 1)" * size,
+        "unary_nested": "-(" * size + "1" + ")" * size,
+    }
+
+
+def run(size: int, repeat: int) -> dict[str, dict[str, float | None]]:
+    """
+    Замеряет время вычисления каждого выражения обоими движками.
+    Если рекурсивный движок не справляется с глубиной вложенности,
+    вместо времени возвращается None
+
+    Аргументы:
+        size (int): размер выражений
+        repeat (int): количество повторов замера
+
+    Возвращаемое значение:
+        dict[str, dict[str, float | None]]: время в миллисекундах по выражениям и движкам
+    """
+    tokenizer = Tokenizer()
+    report = dict()
+
+    for name, expression in build_expressions(size).items():
+        tokens = tokenizer.tokenize(expression)
+        report[name] = dict()
+
+        for engine in (Calculator.RECURSIVE_ENGINE, Calculator.STACK_ENGINE):
+            calculator = Calculator(engine)
+            try:
+                elapsed = min(
+                    timeit.repeat(
+                        lambda: calculator.calculate(tokens), number=1, repeat=repeat
+                    )
+                )
+            except RecursionError:
+                report[name][engine] = None
+            else:
+                report[name][engine] = elapsed * 1e3
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+
+    for name, timings in run(arguments.size, arguments.repeat).items():
+        columns = [
+            f"{engine}: " + ("RecursionError" if value is None else f"{value:.2f} мс")
+            for engine, value in timings.items()
+        ]
+        print(f"{name:<14}" + "   ".join(columns))
@@ -0,0 +1,345 @@
+"""
+Набор бенчмарков всего конвейера калькулятора на сгенерированных корпусах
+выражений. Валидация, токенизация и вычисление замеряются отдельно для
+каждого выражения, а отчёт с пропускной способностью и перцентилями
+задержки печатается в формате JSON, чтобы его можно было сохранить как
+базовую линию и сравнить со следующей версией
+"""
+
+from src.calculator import Calculator
+from src.tokenizer import Tokenizer
+from src.validator import Validator
+
+import argparse
+import json
+import platform
+import random
+import time
+
+
+CORPORA = (
+    "flat_sums",
+    "deep_nesting",
+    "power_towers",
+    "huge_literals",
+    "floats",
+    "errors",
+)
+STAGES = ("symbols", "tokenizer", "tokens", "calculator")
+PERCENTILES = (50, 90, 99)
+
+
+def _random_operand(generator: random.Random) -> str:
+    """
+    Генерирует небольшое целое или вещественное число
+
+    Аргументы:
+        generator (random.Random): генератор случайных чисел
+
+    Возвращаемое значение:
+        str: запись числа
+    """
+    if generator.random() < 0.5:
+        return str(generator.randint(1, 10_000))
+    return f"{generator.uniform(0.5, 1000):.3f}"
+
+
+def _flat_sum(generator: random.Random, size: int) -> str:
+    """
+    Строит длинную сумму целых чисел без скобок
+
+    Аргументы:
+        generator (random.Random): генератор случайных чисел
+        size (int): количество слагаемых
+
+    Возвращаемое значение:
+        str: выражение
+    """
+    parts = [str(generator.randint(0, 10**6))]
+    for _ in range(size - 1):
+        parts.append(generator.choice(("+", "-")))
+        parts.append(str(generator.randint(0, 10**6)))
+    return " ".join(parts)
+
+
+def _deep_nesting(generator: random.Random, size: int) -> str:
+    """
+    Строит выражение с глубиной вложенности скобок size
+
+    Аргументы:
+        generator (random.Random): генератор случайных чисел
+        size (int): глубина вложенности
+
+    Возвращаемое значение:
+        str: выражение
+    """
+    operators = [generator.choice(("+", "-", "*")) for _ in range(size)]
+    return (
+        "(" * size
+        + "1"
+        + "".join(f" {operator} {generator.randint(1, 3)})" for operator in operators)
+    )
+
+
+def _power_tower(generator: random.Random, size: int) -> str:
+    """
+    Строит правоассоциативную башню степеней. Высокие башни переполняются,
+    поэтому корпус нагружает и оценку количества цифр результата
+
+    Аргументы:
+        generator (random.Random): генератор случайных чисел
+        size (int): высота башни
+
+    Возвращаемое значение:
+        str: выражение
+    """
+    height = generator.randint(2, max(2, size // 10))
+    return " ** ".join(str(generator.randint(1, 3)) for _ in range(height))
+
+
+def _huge_literals(generator: random.Random, size: int) -> str:
+    """
+    Строит сумму и произведение длинных целых литералов, не превышающих
+    допустимого количества цифр
+
+    Аргументы:
+        generator (random.Random): генератор случайных чисел
+        size (int): желаемое количество цифр литерала
+
+    Возвращаемое значение:
+        str: выражение
+    """
+    digits = max(1, min(size * 10, Calculator.MAX_INTEGER_COUNT_DIGITS // 4))
+    literals = [
+        str(generator.randint(1, 9)) + "".join(generator.choices("0123456789", k=digits - 1))
+        for _ in range(4)
+    ]
+    return f"{literals[0]} + {literals[1]} * {literals[2]} // {literals[3]}"
+
+
+def _floats(generator: random.Random, size: int) -> str:
+    """
+    Строит выражение из вещественных чисел со всеми операциями над ними
+
+    Аргументы:
+        generator (random.Random): генератор случайных чисел
+        size (int): количество операндов
+
+    Возвращаемое значение:
+        str: выражение
+    """
+    parts = [f"{generator.uniform(0.5, 1000):.4f}"]
+    for _ in range(size - 1):
+        parts.append(generator.choice(("+", "-", "*", "/")))
+        parts.append(f"{generator.uniform(0.5, 1000):.4f}")
+    return " ".join(parts)
+
+
+def _error(generator: random.Random, size: int) -> str:
+    """
+    Строит корректное выражение и портит его ошибкой одного из видов,
+    которую обнаруживает валидатор или калькулятор
+
+    Аргументы:
+        generator (random.Random): генератор случайных чисел
+        size (int): количество операндов
+
+    Возвращаемое значение:
+        str: выражение
+    """
+    operands = [_random_operand(generator) for _ in range(size)]
+    expression = " + ".join(operands)
+    defect = generator.choice(
+        ("1 $ 2", "1..2", "1 2", "1 + * 2", "()", "(1 + 2", "1 / 0", "1.5 // 2")
+    )
+    return f"{expression} + {defect}"
+
+
+GENERATORS = {
+    "flat_sums": _flat_sum,
+    "deep_nesting": _deep_nesting,
+    "power_towers": _power_tower,
+    "huge_literals": _huge_literals,
+    "floats": _floats,
+    "errors": _error,
+}
+
+
+def build_corpora(
+    names: list[str], count: int, size: int, seed: int
+) -> dict[str, list[str]]:
+    """
+    Генерирует воспроизводимые корпуса выражений
+
+    Аргументы:
+        names (list[str]): названия корпусов из CORPORA
+        count (int): количество выражений в каждом корпусе
+        size (int): параметр размера выражений
+        seed (int): начальное значение генератора случайных чисел
+
+    Возвращаемое значение:
+        dict[str, list[str]]: выражения по названиям корпусов
+    """
+    corpora = dict()
+    for name in names:
+        generator = random.Random(f"{seed}:{name}")
+        corpora[name] = [GENERATORS[name](generator, size) for _ in range(count)]
+    return corpora
+
+
+def _percentile(sorted_values: list[int], percent: int) -> int:
+    """
+    Вычисляет перцентиль методом ближайшего ранга
+
+    Аргументы:
+        sorted_values (list[int]): отсортированные значения
+        percent (int): перцентиль от 1 до 100
+
+    Возвращаемое значение:
+        int: значение перцентиля
+    """
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[rank - 1]
+
+
+def summarize(durations: list[int], characters: int, errors: dict[str, int]) -> dict:
+    """
+    Сводит замеры одной стадии в статистику
+
+    Аргументы:
+        durations (list[int]): время обработки каждого выражения в наносекундах
+        characters (int): суммарная длина обработанных выражений
+        errors (dict[str, int]): количество ошибок по классам исключений
+
+    Возвращаемое значение:
+        dict: количество выражений, пропускная способность и перцентили в микросекундах
+    """
+    total = sum(durations)
+    report = {
+        "expressions": len(durations),
+        "errors": errors,
+        "total_ms": total / 1e6,
+        "expressions_per_second": len(durations) / total * 1e9 if total else None,
+        "characters_per_second": characters / total * 1e9 if total else None,
+    }
+
+    ordered = sorted(durations)
+    for percent in PERCENTILES:
+        report[f"p{percent}_us"] = _percentile(ordered, percent) / 1e3 if ordered else None
+    report["max_us"] = ordered[-1] / 1e3 if ordered else None
+
+    return report
+
+
+def run_corpus(
+    expressions: list[str], validator: Validator, calculator: Calculator
+) -> dict[str, dict]:
+    """
+    Прогоняет корпус через конвейер, замеряя каждую стадию отдельно.
+    Выражение, на котором стадия выбросила исключение, дальше не проходит
+
+    Аргументы:
+        expressions (list[str]): выражения корпуса
+        validator (Validator): валидатор с внедрённым токенайзером
+        calculator (Calculator): калькулятор
+
+    Возвращаемое значение:
+        dict[str, dict]: статистика по стадиям
+    """
+    tokenizer = validator.tokenizer
+    durations = {stage: list() for stage in STAGES}
+    characters = {stage: 0 for stage in STAGES}
+    errors = {stage: dict() for stage in STAGES}
+
+    def measure(stage, function, argument, length):
+        start = time.perf_counter_ns()
+        try:
+            result = function(argument)
+        except Exception as exception:
+            name = type(exception).__name__
+            errors[stage][name] = errors[stage].get(name, 0) + 1
+            return False, None
+        finally:
+            durations[stage].append(time.perf_counter_ns() - start)
+            characters[stage] += length
+        return True, result
+
+    for expression in expressions:
+        length = len(expression)
+        success, _ = measure(
+            "symbols", validator.check_correctness_symbols, expression, length
+        )
+        if not success:
+            continue
+        success, tokens = measure("tokenizer", tokenizer.tokenize, expression, length)
+        if not success:
+            continue
+        success, _ = measure(
+            "tokens", validator.check_correctness_tokens, tokens, length
+        )
+        if not success:
+            continue
+        measure("calculator", calculator.calculate, tokens, length)
+
+    return {
+        stage: summarize(durations[stage], characters[stage], errors[stage])
+        for stage in STAGES
+    }
+
+
+def run(names: list[str], count: int, size: int, seed: int, engine: str) -> dict:
+    """
+    Строит корпуса и прогоняет каждый из них через конвейер
+
+    Аргументы:
+        names (list[str]): названия корпусов
+        count (int): количество выражений в корпусе
+        size (int): параметр размера выражений
+        seed (int): начальное значение генератора случайных чисел
+        engine (str): движок калькулятора
+
+    Возвращаемое значение:
+        dict: отчёт с параметрами запуска и статистикой по корпусам
+    """
+    validator = Validator(Tokenizer())
+    calculator = Calculator(engine)
+
+    return {
+        "parameters": {
+            "count": count,
+            "size": size,
+            "seed": seed,
+            "engine": engine,
+            "python": platform.python_version(),
+        },
+        "corpora": {
+            name: run_corpus(expressions, validator, calculator)
+            for name, expressions in build_corpora(names, count, size, seed).items()
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpora", nargs="+", choices=CORPORA, default=list(CORPORA))
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--engine",
+        choices=(Calculator.RECURSIVE_ENGINE, Calculator.STACK_ENGINE),
+        default=Calculator.RECURSIVE_ENGINE,
+    )
+    parser.add_argument("--output", help="файл для отчёта, по умолчанию stdout")
+    arguments = parser.parse_args()
+
+    report = run(
+        arguments.corpora, arguments.count, arguments.size, arguments.seed, arguments.engine
+    )
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+
+    if arguments.output is None:
+        print(text)
+    else:
+        with open(arguments.output, "w", encoding="utf-8") as output:
+            output.write(text + "\n")
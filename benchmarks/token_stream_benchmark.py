@@ -0,0 +1,62 @@
+"""
+Бенчмарк памяти, занимаемой токенами выражения: список объектов Token
+в сравнении с компактным TokenStream
+"""
+
+from src.tokenizer import Tokenizer
+
+import argparse
+import gc
+import tracemalloc
+
+
+def build_expression(tokens_count: int) -> str:
+    """
+    Строит выражение примерно из заданного количества токенов
+
+    Аргументы:
+        tokens_count (int): количество токенов
+
+    Возвращаемое значение:
+        str: выражение
+    """
+    PART = "(12345 + 6.75) * 3 - "
+    return PART * (tokens_count // 8) + "1"
+
+
+def measure(function, expression: str) -> int:
+    """
+    Замеряет количество байт, которые удерживает результат функции
+
+    Аргументы:
+        function: функция токенизации
+        expression (str): выражение
+
+    Возвращаемое значение:
+        int: занятая результатом память в байтах
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = function(expression)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=10_000_000)
+    arguments = parser.parse_args()
+
+    tokenizer = Tokenizer()
+    expression = build_expression(arguments.tokens)
+
+    list_size = measure(tokenizer.tokenize, expression)
+    stream_size = measure(tokenizer.tokenize_compact, expression)
+
+    print(
+        f"list[Token]: {list_size / 2**20:.1f} МиБ\n"
+        f"TokenStream: {stream_size / 2**20:.1f} МиБ\n"
+        f"экономия:    x{list_size / stream_size:.1f}"
+    )
@@ -0,0 +1,68 @@
+"""
+Микро-бенчмарк пропускной способности Tokenizer.tokenize на выражениях
+размером в несколько мегабайт
+"""
+
+from src.tokenizer import Tokenizer
+
+import argparse
+import timeit
+
+
+def build_expression(size: int) -> str:
+    """
+    Строит выражение заданного размера со всеми видами токенов:
+    целыми числами, числами вида .5, операторами ** и //, скобками
+
+    Аргументы:
+        size (int): примерный размер выражения в байтах
+
+    Возвращаемое значение:
+        str: выражение
+    """
+    PART = "(12345 + .5) * 3.25 ** 2 // 7 - 100 % 9 / 4 + "
+    return PART * (size // len(PART)) + "1"
+
+
+def run(size: int, repeat: int) -> dict[str, float]:
+    """
+    Замеряет пропускную способность токенизатора
+
+    Аргументы:
+        size (int): размер выражения в байтах
+        repeat (int): количество повторов замера
+
+    Возвращаемое значение:
+        dict[str, float]: размер в мегабайтах, количество токенов,
+        лучшее время в секундах, мегабайты и миллионы токенов в секунду
+    """
+    tokenizer = Tokenizer()
+    expression = build_expression(size)
+    tokens_count = len(tokenizer.tokenize(expression))
+
+    elapsed = min(
+        timeit.repeat(lambda: tokenizer.tokenize(expression), number=1, repeat=repeat)
+    )
+    megabytes = len(expression) / 1e6
+
+    return {
+        "megabytes": megabytes,
+        "tokens": tokens_count,
+        "seconds": elapsed,
+        "megabytes_per_second": megabytes / elapsed,
+        "million_tokens_per_second": tokens_count / elapsed / 1e6,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=4_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+
+    report = run(arguments.size, arguments.repeat)
+    print(
+        f"{report['megabytes']:.1f} МБ, {report['tokens']} токенов за "
+        f"{report['seconds']:.3f} с: {report['megabytes_per_second']:.1f} МБ/с, "
+        f"{report['million_tokens_per_second']:.2f} млн токенов/с"
+    )
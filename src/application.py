@@ -5,37 +5,142 @@
 from src.tokenizer import Tokenizer
 from src.validator import Validator
 from src.calculator import Calculator
-from src.exception import ExpressionError, DigitsOverFlow
+from src.supervisor import SupervisedCalculator
+from src.exception import (
+    ExpressionError,
+    DigitsOverFlow,
+    BudgetExceededError,
+    EvaluationTimeoutError,
+    WorkerCrashedError,
+)
 from src.tokens import Token
+from src.cache import ResultCache, normalize_expression
+from src.metrics import PipelineMetrics
+from src.formatter import ResultFormatter
+from src.logs import configure_logging
 
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import TextIO
+import hashlib
+import itertools
 import logging
+import sys
+import time
+
+_batch_worker_application = None
+
+
+def _init_batch_worker(application: "Application") -> None:
+    """
+    Инициализатор процесса пула: сохраняет копию приложения,
+    которая будет использоваться для всех блоков этого процесса
+
+    Аргументы:
+        application (Application): приложение
+
+    Возвращаемое значение:
+        None
+    """
+    global _batch_worker_application
+    _batch_worker_application = application
+
+
+def _process_batch_chunk(
+    start: int, expressions: list[str], separate_errors: bool
+) -> tuple[str, str, PipelineMetrics | None]:
+    """
+    Функция, выполняемая в процессе пула для одного блока выражений.
+    Если приложение собирает метрики, для блока заводятся новые метрики,
+    которые возвращаются в основной процесс вместе с текстом
+
+    Аргументы:
+        start (int): номер первого выражения блока во всём входе
+        expressions (list[str]): выражения блока
+        separate_errors (bool): писать ли ошибки отдельно от результатов
+
+    Возвращаемое значение:
+        tuple[str, str, PipelineMetrics | None]: текст результатов, текст
+        ошибок и метрики блока
+    """
+    application = _batch_worker_application
+    if application.metrics is not None:
+        application.metrics = PipelineMetrics()
+
+    output_text, error_text = application.process_chunk(
+        start, expressions, separate_errors
+    )
+
+    return output_text, error_text, application.metrics
 
 
 class Application:
     """
     Класс-приложения
 
+    Атрибуты класса:
+        EVALUATION_ERRORS (tuple): ошибки выражений, которые приложение
+            обрабатывает, а не пробрасывает дальше
+        BUDGET_MESSAGES (dict[str, str]): сообщения о превышении каждого
+            из ограничений бюджета вычисления
+        LOG_FILENAME (str): файл журнала интерактивного режима
+
     Атрибуты:
         validator (Validator): валидатор
         tokenizer (Tokenizer): токенизатор
-        calculator (Calculator): калькулятор
+        calculator (Calculator | SupervisedCalculator): калькулятор
+        cache (ResultCache | None): необязательный кэш результатов выражений
+        metrics (PipelineMetrics | None): необязательные метрики конвейера.
+            Без них стадии не замеряются
+        formatter (ResultFormatter): форматирование результатов
     """
 
+    EVALUATION_ERRORS = (
+        ExpressionError,
+        ZeroDivisionError,
+        TypeError,
+        DigitsOverFlow,
+        BudgetExceededError,
+        EvaluationTimeoutError,
+        WorkerCrashedError,
+    )
+    BUDGET_MESSAGES = {
+        BudgetExceededError.OPERATIONS: "Превышено допустимое количество операций",
+        BudgetExceededError.BITS: "Превышен допустимый размер операндов",
+        BudgetExceededError.DEADLINE: "Превышено допустимое время вычисления",
+    }
+    STATISTICS_COMMAND = "stats"
+    LOG_FILENAME = "log.txt"
+
     validator: Validator
     tokenizer: Tokenizer
-    calculator: Calculator
+    calculator: Calculator | SupervisedCalculator
+    cache: ResultCache | None
+    metrics: PipelineMetrics | None
+    formatter: ResultFormatter
     logger: logging.Logger
 
     def __init__(
-        self, validator: Validator, tokenizer: Tokenizer, calculator: Calculator
+        self,
+        validator: Validator,
+        tokenizer: Tokenizer,
+        calculator: Calculator | SupervisedCalculator,
+        cache: ResultCache | None = None,
+        metrics: PipelineMetrics | None = None,
+        formatter: ResultFormatter | None = None,
     ) -> None:
         """
-        Внедрение зависимостей
+        Внедрение зависимостей. Без форматирования результаты выводятся
+        полной десятичной записью
         """
         self.validator = validator
         self.tokenizer = tokenizer
         self.calculator = calculator
-        self.logger = None
+        self.cache = cache
+        self.metrics = metrics
+        self.formatter = formatter if formatter is not None else ResultFormatter()
+        self.logger = logging.getLogger(__name__)
 
     def execute(self) -> None:
         """
@@ -49,7 +154,8 @@ class Application:
 
     def _start_main_loop(self) -> None:
         """
-        Вспомогательная функция, организующая запуск главного цикла программы
+        Вспомогательная функция, организующая запуск главного цикла программы.
+        Команда STATISTICS_COMMAND выводит собранные метрики
 
         Возвращаемое значение:
             None
@@ -63,30 +169,528 @@ class Application:
             if user_input.replace(" ", "") == "":
                 continue
 
+            if user_input.strip() == Application.STATISTICS_COMMAND:
+                self._output_statistics()
+                continue
+
+            try:
+                tokens, result = self.process(user_input)
+            except Application.EVALUATION_ERRORS as exception:
+                output_started = time.perf_counter_ns()
+                self.log_error(user_input, exception)
+            else:
+                output_started = time.perf_counter_ns()
+                self._output_result(tokens, result)
+
+            if self.metrics is not None:
+                self.metrics.record_stage(
+                    PipelineMetrics.OUTPUT, time.perf_counter_ns() - output_started
+                )
+
+    def execute_batch(
+        self,
+        input_stream: TextIO,
+        output_stream: TextIO,
+        error_stream: TextIO | None = None,
+        workers: int = 1,
+        chunk_size: int = 4096,
+    ) -> None:
+        """
+        Функция, запускающая неинтерактивную обработку: выражения читаются
+        построчно из input_stream блоками по chunk_size строк, результаты
+        пишутся по одному на строку в output_stream. Ошибки пишутся на место
+        результата либо, если передан error_stream, в него с номером строки,
+        а на месте результата остаётся пустая строка.
+        При workers > 1 блоки вычисляются в пуле процессов, но результаты
+        всё равно пишутся в порядке входных строк
+
+        Аргументы:
+            input_stream (TextIO): поток выражений
+            output_stream (TextIO): поток результатов
+            error_stream (TextIO | None): отдельный поток ошибок
+            workers (int): количество процессов
+            chunk_size (int): количество строк в блоке
+
+        Возвращаемое значение:
+            None
+        """
+        separate_errors = error_stream is not None
+        expressions = (line.rstrip("\r\n") for line in input_stream)
+        chunks = self._read_chunks(expressions, chunk_size)
+
+        if workers > 1:
+            results = self._process_chunks_parallel(chunks, separate_errors, workers)
+        else:
+            results = (
+                self.process_chunk(start, chunk, separate_errors)
+                for start, chunk in chunks
+            )
+
+        for output_text, error_text in results:
+            output_stream.write(output_text)
+            if separate_errors:
+                error_stream.write(error_text)
+
+    def process_chunk(
+        self, start: int, expressions: list[str], separate_errors: bool
+    ) -> tuple[str, str]:
+        """
+        Функция, вычисляющая блок выражений и формирующая текст для вывода
+
+        Аргументы:
+            start (int): номер первого выражения блока во всём входе
+            expressions (list[str]): выражения блока
+            separate_errors (bool): писать ли ошибки отдельно от результатов
+
+        Возвращаемое значение:
+            tuple[str, str]: текст результатов и текст ошибок блока
+        """
+        output_lines = list()
+        error_lines = list()
+        measured = self.metrics is not None
+
+        for index, result in self.evaluate_many(expressions):
+            if measured:
+                output_started = time.perf_counter_ns()
+
+            if result is None:
+                output_lines.append("\n")
+            elif not isinstance(result, Exception):
+                output_lines.append(self.formatter.format(result) + "\n")
+            elif not separate_errors:
+                output_lines.append(self.format_error_line(result) + "\n")
+            else:
+                output_lines.append("\n")
+                error_lines.append(
+                    f"{start + index + 1}: {self.format_error_line(result)}\n"
+                )
+
+            if measured:
+                self.metrics.record_stage(
+                    PipelineMetrics.OUTPUT, time.perf_counter_ns() - output_started
+                )
+
+        return "".join(output_lines), "".join(error_lines)
+
+    def _read_chunks(
+        self, expressions: Iterable[str], chunk_size: int
+    ) -> Iterator[tuple[int, list[str]]]:
+        """
+        Вспомогательный генератор, разбивающий поток выражений на блоки
+
+        Аргументы:
+            expressions (Iterable[str]): выражения
+            chunk_size (int): количество выражений в блоке
+
+        Возвращаемое значение:
+            Iterator[tuple[int, list[str]]]: пары (номер первого выражения, блок)
+        """
+        iterator = iter(expressions)
+        start = 0
+
+        while chunk := list(itertools.islice(iterator, chunk_size)):
+            yield start, chunk
+            start += len(chunk)
+
+    def _process_chunks_parallel(
+        self,
+        chunks: Iterator[tuple[int, list[str]]],
+        separate_errors: bool,
+        workers: int,
+    ) -> Iterator[tuple[str, str]]:
+        """
+        Вспомогательный генератор, вычисляющий блоки в пуле процессов.
+        Одновременно в работе находится не больше 2 * workers блоков, поэтому
+        вход читается по мере записи результатов. При любой ошибке, в том числе
+        KeyboardInterrupt, невыполненные блоки отменяются, а пул закрывается.
+        Метрики блоков добавляются к метрикам приложения
+
+        Аргументы:
+            chunks (Iterator[tuple[int, list[str]]]): блоки выражений
+            separate_errors (bool): писать ли ошибки отдельно от результатов
+            workers (int): количество процессов
+
+        Возвращаемое значение:
+            Iterator[tuple[str, str]]: текст результатов и ошибок блоков по порядку
+        """
+        MAX_PENDING = 2 * workers
+
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(self,),
+        )
+        pending = deque()
+
+        try:
+            for start, chunk in chunks:
+                pending.append(
+                    executor.submit(
+                        _process_batch_chunk, start, chunk, separate_errors
+                    )
+                )
+                if len(pending) >= MAX_PENDING:
+                    yield self._collect_chunk(pending.popleft().result())
+
+            while pending:
+                yield self._collect_chunk(pending.popleft().result())
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+        else:
+            executor.shutdown(wait=True)
+
+    def _collect_chunk(
+        self, chunk_result: tuple[str, str, PipelineMetrics | None]
+    ) -> tuple[str, str]:
+        """
+        Вспомогательная функция, добавляющая метрики блока из процесса пула
+        к метрикам приложения
+
+        Аргументы:
+            chunk_result (tuple[str, str, PipelineMetrics | None]): текст
+                результатов, текст ошибок и метрики блока
+
+        Возвращаемое значение:
+            tuple[str, str]: текст результатов и текст ошибок блока
+        """
+        output_text, error_text, metrics = chunk_result
+
+        if metrics is not None:
+            self.metrics.merge(metrics)
+
+        return output_text, error_text
+
+    def evaluate_many(
+        self, expressions: Iterable[str]
+    ) -> Iterator[tuple[int, int | float | Exception | None]]:
+        """
+        Генератор, лениво вычисляющий выражения из итерируемого объекта одним
+        набором валидатора, токенизатора и калькулятора. Ошибки выражений
+        возвращаются как значения, пустые выражения дают None
+
+        Аргументы:
+            expressions (Iterable[str]): выражения
+
+        Возвращаемое значение:
+            Iterator[tuple[int, int | float | Exception | None]]: пары
+            (номер выражения, результат или ошибка)
+        """
+        for index, expression in enumerate(expressions):
+            if expression.isspace() or expression == "":
+                yield index, None
+                continue
+
+            try:
+                _, result = self.process(expression)
+            except Application.EVALUATION_ERRORS as exception:
+                yield index, exception
+            else:
+                yield index, result
+
+    def process(self, expression: str) -> tuple[list[Token], int | float]:
+        """
+        Функция, проводящая выражение через весь конвейер: валидацию,
+        токенизацию и вычисление. При наличии кэша результат, как и ошибка
+        вычисления, берётся из него. Превышение времени и аварийное завершение
+        процесса вычислений зависят от нагрузки, а не от выражения,
+        поэтому такие ошибки не кэшируются
+
+        Аргументы:
+            expression (str): выражение
+
+        Возвращаемое значение:
+            tuple[list[Token], int | float]: токены выражения и результат
+
+        Исключения:
+            ExpressionError, ZeroDivisionError, TypeError, DigitsOverFlow,
+            BudgetExceededError, EvaluationTimeoutError, WorkerCrashedError
+        """
+        if self.cache is None:
+            return self._compute(expression)
+
+        key = normalize_expression(expression)
+        entry = self.cache.get(key)
+
+        if entry is ResultCache.MISSING:
+            try:
+                entry = self._compute(expression)
+            except Application.EVALUATION_ERRORS as exception:
+                self._cache_error(key, exception)
+                raise
+            self.cache.put(key, entry, sys.getsizeof(entry[1]))
+
+        return self._unpack_cached(entry)
+
+    async def process_async(self, expression: str) -> tuple[list[Token], int | float]:
+        """
+        Функция, проводящая выражение через конвейер так же, как process,
+        для цикла событий asyncio: дорогие выражения SupervisedCalculator
+        ожидаются без остановки цикла, в том числе при сборе метрик.
+        С другим калькулятором выражение вычисляется синхронно
+
+        Аргументы:
+            expression (str): выражение
+
+        Возвращаемое значение:
+            tuple[list[Token], int | float]: токены выражения и результат
+
+        Исключения:
+            ExpressionError, ZeroDivisionError, TypeError, DigitsOverFlow,
+            BudgetExceededError, EvaluationTimeoutError, WorkerCrashedError
+        """
+        if not isinstance(self.calculator, SupervisedCalculator):
+            return self.process(expression)
+
+        key = normalize_expression(expression) if self.cache is not None else None
+        entry = self.cache.get(key) if key is not None else ResultCache.MISSING
+
+        if entry is ResultCache.MISSING:
             try:
-                self.validator.check_correctness_expression(user_input)
-                tokens = self.tokenizer.tokenize(user_input)
-                result = self.calculator.calculate(tokens)
-            except ExpressionError as exception:
-                self.logger.error(exception.__str__())
-            except ZeroDivisionError as exception:
-                self.logger.error(
+                entry = await self._compute_async(expression)
+            except Application.EVALUATION_ERRORS as exception:
+                if key is not None:
+                    self._cache_error(key, exception)
+                raise
+            if key is not None:
+                self.cache.put(key, entry, sys.getsizeof(entry[1]))
+
+        return self._unpack_cached(entry)
+
+    def _cache_error(self, key: str, exception: Exception) -> None:
+        """
+        Вспомогательная функция, кэширующая ошибку вычисления,
+        если она зависит только от выражения
+
+        Аргументы:
+            key (str): нормализованное выражение
+            exception (Exception): одна из EVALUATION_ERRORS
+
+        Возвращаемое значение:
+            None
+        """
+        if not self._is_transient_error(exception):
+            self.cache.put(key, exception, sys.getsizeof(exception))
+
+    def _unpack_cached(
+        self, entry: tuple[list[Token], int | float] | Exception
+    ) -> tuple[list[Token], int | float]:
+        """
+        Вспомогательная функция, возвращающая результат записи кэша
+        или выбрасывающая сохранённую ошибку
+
+        Аргументы:
+            entry (tuple[list[Token], int | float] | Exception): запись кэша
+
+        Возвращаемое значение:
+            tuple[list[Token], int | float]: токены выражения и результат
+        """
+        if isinstance(entry, Exception):
+            if self.metrics is not None:
+                self.metrics.record_error(entry)
+            raise entry.with_traceback(None)
+
+        return entry
+
+    def _compute(self, expression: str) -> tuple[list[Token], int | float]:
+        """
+        Вспомогательная функция, вычисляющая выражение без обращения к кэшу
+
+        Аргументы:
+            expression (str): выражение
+
+        Возвращаемое значение:
+            tuple[list[Token], int | float]: токены выражения и результат
+        """
+        if self.metrics is not None:
+            return self._compute_measured(expression)
+
+        tokens = self.validator.compile(expression)
+        result = self.calculator.calculate(tokens)
+
+        return tokens, result
+
+    async def _compute_async(self, expression: str) -> tuple[list[Token], int | float]:
+        """
+        Вспомогательная функция, вычисляющая выражение так же, как _compute,
+        через SupervisedCalculator.calculate_async
+
+        Аргументы:
+            expression (str): выражение
+
+        Возвращаемое значение:
+            tuple[list[Token], int | float]: токены выражения и результат
+        """
+        if self.metrics is not None:
+            return await self._compute_measured_async(expression)
+
+        tokens = self.validator.compile(expression)
+        result = await self.calculator.calculate_async(tokens)
+
+        return tokens, result
+
+    def _compute_measured(self, expression: str) -> tuple[list[Token], int | float]:
+        """
+        Вспомогательная функция, вычисляющая выражение так же, как _compute,
+        но по отдельным стадиям валидатора, с замером каждой стадии,
+        подсчётом токенов и ошибок
+
+        Аргументы:
+            expression (str): выражение
+
+        Возвращаемое значение:
+            tuple[list[Token], int | float]: токены выражения и результат
+        """
+        clock = time.perf_counter_ns
+        marks = [clock()]
+
+        try:
+            tokens = self._validate_measured(expression, marks)
+            result = self.calculator.calculate(tokens)
+            marks.append(clock())
+        except Application.EVALUATION_ERRORS as exception:
+            marks.append(clock())
+            self.metrics.record_error(exception)
+            raise
+        finally:
+            self.metrics.record_compute(marks)
+
+        return tokens, result
+
+    async def _compute_measured_async(
+        self, expression: str
+    ) -> tuple[list[Token], int | float]:
+        """
+        Вспомогательная функция, вычисляющая выражение так же, как
+        _compute_measured, но ожидающая SupervisedCalculator.calculate_async.
+        Задержка вычисления включает ожидание процесса вычислений
+
+        Аргументы:
+            expression (str): выражение
+
+        Возвращаемое значение:
+            tuple[list[Token], int | float]: токены выражения и результат
+        """
+        clock = time.perf_counter_ns
+        marks = [clock()]
+
+        try:
+            tokens = self._validate_measured(expression, marks)
+            result = await self.calculator.calculate_async(tokens)
+            marks.append(clock())
+        except Application.EVALUATION_ERRORS as exception:
+            marks.append(clock())
+            self.metrics.record_error(exception)
+            raise
+        finally:
+            self.metrics.record_compute(marks)
+
+        return tokens, result
+
+    def _validate_measured(self, expression: str, marks: list[int]) -> list[Token]:
+        """
+        Вспомогательная функция, проводящая выражение через стадии валидатора
+        с отметкой времени после каждой стадии и подсчётом токенов
+
+        Аргументы:
+            expression (str): выражение
+            marks (list[int]): отметки времени, дополняемые функцией
+
+        Возвращаемое значение:
+            list[Token]: токены выражения
+        """
+        clock = time.perf_counter_ns
+
+        self.validator.check_correctness_symbols(expression)
+        marks.append(clock())
+        tokens = self.validator.tokenizer.tokenize(expression)
+        marks.append(clock())
+        self.metrics.record_tokens(len(tokens))
+        self.validator.check_correctness_tokens(tokens)
+        marks.append(clock())
+
+        return tokens
+
+    def _format_error(self, exception: Exception) -> str:
+        """
+        Вспомогательная функция, формирующая сообщение об ошибке выражения
+
+        Аргументы:
+            exception (Exception): одна из EVALUATION_ERRORS
+
+        Возвращаемое значение:
+            str: сообщение об ошибке
+        """
+        match exception:
+            case ExpressionError():
+                return exception.__str__()
+            case ZeroDivisionError():
+                return (
                     "ОШИБКА: Запрещено делить на ноль"
                     + "\n"
                     + f"Эта часть выражения вызывает ошибку -> '{exception.args[0]}'"
                 )
-            except TypeError as exception:
-                self.logger.error(
+            case TypeError():
+                return (
                     "ОШИБКА: Операнд слева и справа должны быть целыми для операция % и //"
                     + "\n"
                     + f"Эта часть выражения вызывает ошибку -> '{exception.args[0]}'"
                 )
-            except DigitsOverFlow as exception:
-                self.logger.error(
-                    f"ОШИБКА: Слишком большие размеры операндов -> {exception.log}"
-                )
-            else:
-                self._output_result(tokens, result)
+            case DigitsOverFlow():
+                return f"ОШИБКА: Слишком большие размеры операндов -> {exception.log}"
+            case BudgetExceededError():
+                message = Application.BUDGET_MESSAGES[exception.limit]
+                return f"ОШИБКА: {message} -> {exception.log}"
+            case EvaluationTimeoutError():
+                return f"ОШИБКА: Вычисление прервано по истечении времени -> {exception.log}"
+            case WorkerCrashedError():
+                return f"ОШИБКА: Процесс вычислений завершился аварийно -> {exception.log}"
+
+    def _is_transient_error(self, exception: Exception) -> bool:
+        """
+        Вспомогательная функция, проверяющая, что ошибка зависит не от
+        выражения, а от нагрузки: вычисление прервано по истечении времени
+        или процесс вычислений завершился аварийно
+
+        Аргументы:
+            exception (Exception): одна из EVALUATION_ERRORS
+
+        Возвращаемое значение:
+            bool
+        """
+        if isinstance(exception, (EvaluationTimeoutError, WorkerCrashedError)):
+            return True
+        return (
+            isinstance(exception, BudgetExceededError)
+            and exception.limit == BudgetExceededError.DEADLINE
+        )
+
+    def format_error_line(self, exception: Exception) -> str:
+        """
+        Функция, формирующая однострочное сообщение об ошибке
+        для пакетного режима и сервера
+
+        Аргументы:
+            exception (Exception): одна из EVALUATION_ERRORS
+
+        Возвращаемое значение:
+            str: сообщение об ошибке в одну строку
+        """
+        if isinstance(exception, ExpressionError):
+            return exception.message
+        return self._format_error(exception).replace("\n", " ")
+
+    def _output_statistics(self) -> None:
+        """
+        Вспомогательная функция, выводящая собранные метрики конвейера
+
+        Возвращаемое значение:
+            None
+        """
+        if self.metrics is None:
+            print("Сбор метрик отключён, запустите приложение с флагом --metrics")
+        else:
+            self.metrics.dump(sys.stdout)
 
     def _output_result(self, tokens: list[Token], result: int | float) -> None:
         """
@@ -102,21 +706,46 @@ class Application:
         expression = ""
         for token in tokens:
             expression += token.get_token() + " "
-        print(f"{expression}= {result}")
+        print(f"{expression}= {self.formatter.format(result)}")
 
-    def _init_logger(self) -> None:
+    def log_error(self, expression: str, exception: Exception) -> None:
         """
-        Функция, инициализирующая логгер
+        Функция, записывающая ошибку выражения в журнал. Кроме сообщения
+        запись получает поля error (класс ошибки), position (позиция ошибки
+        или None) и expression_hash (хэш выражения), которые выводятся
+        в журнал формата JSON и по которым ограничивается частота записей
+
+        Аргументы:
+            expression (str): выражение
+            exception (Exception): одна из EVALUATION_ERRORS
 
         Возвращаемое значение:
             None
         """
+        position = None
+        if isinstance(exception, ExpressionError):
+            position = exception.invalid_position
 
-        LOG_FORMAT = "[%(asctime)s.%(msecs)03d][%(name)s][%(levelname)s]\n%(message)s"
-        LOG_LEVEL = logging.ERROR
-        LOG_FILENAME = "log.txt"
-        HANLDERS = [logging.FileHandler(LOG_FILENAME), logging.StreamHandler()]
+        expression_hash = hashlib.blake2b(expression.encode(), digest_size=8)
+        self.logger.error(
+            self._format_error(exception),
+            extra={
+                "error": type(exception).__name__,
+                "position": position,
+                "expression_hash": expression_hash.hexdigest(),
+            },
+        )
 
-        logging.basicConfig(format=LOG_FORMAT, level=LOG_LEVEL, handlers=HANLDERS)
+    def _init_logger(self) -> None:
+        """
+        Функция, инициализирующая логгер. Если журнал уже настроен
+        через configure_logging, например с записью в фоновом потоке,
+        настройка не меняется
+
+        Возвращаемое значение:
+            None
+        """
+        if not logging.getLogger().handlers:
+            configure_logging(Application.LOG_FILENAME)
 
         self.logger = logging.getLogger(__name__)
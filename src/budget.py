@@ -0,0 +1,50 @@
+"""
+Модуль бюджета вычисления одного выражения: ограничения количества
+операций, размера операндов в битах и времени вычисления
+"""
+
+import time
+
+
+class Budget:
+    """
+    Бюджет вычисления одного выражения. Калькулятор проверяет его перед
+    каждой бинарной операцией и прерывает вычисление исключением
+    BudgetExceededError, как только одно из ограничений превышено.
+    Ограничение со значением None не проверяется
+
+    Атрибуты:
+        max_operations (int | None): максимальное количество бинарных операций
+        max_bits (int | None): максимальная длина двоичной записи целых
+            операндов и оценки результата операции
+        timeout (float | None): максимальное время вычисления в секундах
+    """
+
+    max_operations: int | None
+    max_bits: int | None
+    timeout: float | None
+
+    def __init__(
+        self,
+        max_operations: int | None = None,
+        max_bits: int | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        """
+        Установка ограничений
+        """
+        self.max_operations = max_operations
+        self.max_bits = max_bits
+        self.timeout = timeout
+
+    def get_deadline(self) -> float | None:
+        """
+        Функция, вычисляющая момент, до которого должно завершиться
+        вычисление, начатое сейчас
+
+        Возвращаемое значение:
+            float | None: значение time.monotonic() или None без ограничения времени
+        """
+        if self.timeout is None:
+            return None
+        return time.monotonic() + self.timeout
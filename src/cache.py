@@ -0,0 +1,147 @@
+"""
+Модуль кэша результатов вычисления выражений
+"""
+
+from collections import OrderedDict
+
+
+def normalize_expression(expression: str) -> str:
+    """
+    Приводит выражение к виду ключа кэша: убирает пробелы по краям и сжимает
+    группы пробелов внутри до одного. Пробел между числами сохраняется,
+    поэтому "1 2" и "12" остаются разными ключами
+
+    Аргументы:
+        expression (str): выражение
+
+    Возвращаемое значение:
+        str: нормализованное выражение
+    """
+    return " ".join(expression.split())
+
+
+class ResultCache:
+    """
+    Ограниченный LRU-кэш с учётом занимаемой значениями памяти
+
+    Атрибуты класса:
+        MISSING (object): значение, возвращаемое get при промахе
+
+    Атрибуты объекта:
+        max_entries (int): максимальное количество записей
+        max_bytes (int): максимальный суммарный размер значений в байтах
+        entries (OrderedDict): записи вида ключ -> (значение, размер)
+        bytes_held (int): суммарный размер хранимых значений
+        hits (int): количество попаданий
+        misses (int): количество промахов
+        evictions (int): количество вытесненных записей
+    """
+
+    MISSING = object()
+
+    max_entries: int
+    max_bytes: int
+    entries: OrderedDict
+    bytes_held: int
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Установка ограничений кэша и обнуление статистики
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes_held = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: object) -> object:
+        """
+        Возвращает значение по ключу и помечает запись как недавно использованную
+
+        Аргументы:
+            key (object): ключ
+
+        Возвращаемое значение:
+            object: значение или ResultCache.MISSING при промахе
+        """
+        entry = self.entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return ResultCache.MISSING
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: object, value: object, size: int) -> None:
+        """
+        Сохраняет значение, вытесняя самые давно использованные записи,
+        пока не будут соблюдены ограничения. Значение, которое больше
+        всего кэша, не сохраняется
+
+        Аргументы:
+            key (object): ключ
+            value (object): значение
+            size (int): размер значения в байтах
+
+        Возвращаемое значение:
+            None
+        """
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.bytes_held -= previous[1]
+
+        self.entries[key] = (value, size)
+        self.bytes_held += size
+
+        while len(self.entries) > self.max_entries or self.bytes_held > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.bytes_held -= evicted_size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Удаляет все записи, сохраняя статистику
+
+        Возвращаемое значение:
+            None
+        """
+        self.entries.clear()
+        self.bytes_held = 0
+
+    def get_statistics(self) -> dict[str, int | float]:
+        """
+        Возвращает статистику работы кэша
+
+        Возвращаемое значение:
+            dict[str, int | float]: количество записей, попадания, промахи,
+            доля попаданий, количество вытеснений и занятые байты
+        """
+        requests = self.hits + self.misses
+
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / requests if requests else 0.0,
+            "evictions": self.evictions,
+            "bytes_held": self.bytes_held,
+        }
+
+    def __len__(self) -> int:
+        """
+        Переопределение магического метода для получения количества записей
+
+        Возвращаемое значение:
+            int: количество записей
+        """
+        return len(self.entries)
@@ -2,10 +2,58 @@
 Модуль калькулятора производит вычисления согласно заданной грамматике
 """
 
-from src.tokens import Token, Number, Operator
-from src.exception import DigitsOverFlow
+from src.tokens import Token, Number, Operator, Variable
+from src.program import Program
+from src.parser import Parser
+from src.cache import ResultCache
+from src.subexpression import SubexpressionPlan
+from src.budget import Budget
+from src.exception import (
+    DigitsOverFlow,
+    UndefinedVariableError,
+    BudgetExceededError,
+    InvalidBinaryOperatorError,
+    TwiceNumberError,
+)
 import sys
 import math
+import time
+
+
+class DeferredPower:
+    """
+    Отложенное возведение в степень. Если результат степени сразу делится
+    с остатком, операция % вычисляет pow(base, exponent, modulo), не строя
+    base ** exponent, иначе степень вычисляется обычным образом
+
+    Атрибуты:
+        base (int | float): основание
+        exponent (int | float): показатель
+        operator (Operator): оператор возведения в степень
+        position (int): количество прочитанных токенов в момент возведения в степень
+    """
+
+    __slots__ = ("base", "exponent", "operator", "position")
+
+    base: int | float
+    exponent: int | float
+    operator: Operator
+    position: int
+
+    def __init__(
+        self,
+        base: int | float,
+        exponent: int | float,
+        operator: Operator,
+        position: int,
+    ) -> None:
+        """
+        Инициализация операндов отложенной степени
+        """
+        self.base = base
+        self.exponent = exponent
+        self.operator = operator
+        self.position = position
 
 
 class Calculator:
@@ -14,50 +62,262 @@ class Calculator:
     вычисляя результат арифметического выражения
 
     Атрибуты класса:
-        MAX_INTEGER_COUNT_DIGITS - максимально возможное количество символов выходной строки
+        MAX_INTEGER_COUNT_DIGITS - количество цифр целого результата по умолчанию,
+            равное ограничению встроенного перевода целого числа в строку
+        MAX_FLOAT_EXPONENT_BITS - длина показателя степени в битах, начиная с которой
+            он не может быть преобразован в float
+        LOG10_2 - десятичный логарифм двойки для оценки количества цифр
+        RECURSIVE_ENGINE - движок рекурсивного спуска
+        STACK_ENGINE - движок без рекурсии: компиляция в программу алгоритмом
+            сортировочной станции и вычисление на стеке
 
     Атрибуты объекта:
+        engine (str): движок, которым calculate вычисляет выражение
+        parser (Parser): парсер для движка STACK_ENGINE и для кэширования подвыражений
+        subexpression_cache (ResultCache | None): необязательный кэш результатов
+            выражений в скобках и возведений в степень, общий для всех выражений
+        budget (Budget | None): необязательный бюджет вычисления одного выражения
+        max_digits (int): максимально возможное количество цифр целого результата
+            операции. Результаты длиннее MAX_INTEGER_COUNT_DIGITS выводятся
+            только через ResultFormatter
+        operations (int): количество бинарных операций, выполненных в текущем выражении
+        deadline (float | None): момент time.monotonic(), до которого должно
+            завершиться вычисление текущего выражения
         tokens (list[Token]): токены выражения
         tokens_length (int): длина списка токенов
-        pos (int): индекс, на которой находится класс в процессе вычисления
-        log (str): строка логирования ошибочных выражений
+        variables (dict[str, int | float]): значения переменных выражения
+        pos (int): индекс, на которой находится класс в процессе вычисления.
+            Прочитанные к этому индексу токены образуют текст ошибки, который
+            собирается только при выбрасывании исключения
     """
 
     MAX_INTEGER_COUNT_DIGITS = sys.get_int_max_str_digits()
-
+    MAX_FLOAT_EXPONENT_BITS = sys.float_info.max_exp - 1
+    LOG10_2 = math.log10(2)
+    RECURSIVE_ENGINE = "recursive"
+    STACK_ENGINE = "stack"
+
+    engine: str
+    parser: Parser
+    subexpression_cache: ResultCache | None
+    budget: Budget | None
+    max_digits: int
+    operations: int
+    deadline: float | None
     tokens: list[Token]
     tokens_length: int
+    variables: dict[str, int | float]
     pos: int
-    log: str
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        engine: str = RECURSIVE_ENGINE,
+        subexpression_cache: ResultCache | None = None,
+        budget: Budget | None = None,
+        max_digits: int = MAX_INTEGER_COUNT_DIGITS,
+    ) -> None:
         """
-        Выполняет установку всех значений по умолчанию
+        Выбор движка, внедрение кэша подвыражений и бюджета, установка
+        ограничения количества цифр и всех значений по умолчанию
         """
+        if engine not in (Calculator.RECURSIVE_ENGINE, Calculator.STACK_ENGINE):
+            raise ValueError(f"Неизвестный движок вычислений: {engine}")
+
+        self.engine = engine
+        self.parser = Parser()
+        self.subexpression_cache = subexpression_cache
+        self.budget = budget
+        self.max_digits = max_digits
+        self.operations = 0
+        self.deadline = None
         self.tokens = None
         self.tokens_length = 0
+        self.variables = dict()
         self.pos = 0
-        self.log = ""
 
-    def calculate(self, tokens: list[Token]) -> int | float:
+    def calculate(
+        self,
+        tokens: list[Token],
+        variables: dict[str, int | float] | None = None,
+    ) -> int | float:
         """
         Главная функция данного класса, которая запускает процесс вычисления
-        арифметического выражения
+        арифметического выражения. С кэшем подвыражений выражение сначала
+        компилируется парсером выбранного движка, а затем вычисляется evaluate
 
         Аргументы:
             tokens (list[Token]): токены арифметического выражения
+            variables (dict[str, int | float] | None): значения переменных
 
         Возвращаемое значение:
             int | float: результат расчётов
+
+        Исключения:
+            UndefinedVariableError: если значение переменной не задано
+            BudgetExceededError: если превышен бюджет вычисления
         """
+        if self.engine == Calculator.STACK_ENGINE:
+            return self.evaluate(self.parser.parse_iterative(tokens), variables)
+
+        if self.subexpression_cache is not None:
+            return self.evaluate(self.parser.parse(tokens), variables)
+
         self.tokens = tokens
         self.tokens_length = len(self.tokens)
+        self.variables = variables if variables is not None else dict()
         self.pos = 0
-        self.log = ""
+        self._start_budget()
+
+        result = self._expr()
+        if self._has_next():
+            raise TwiceNumberError(self.tokens, self.pos)
 
-        result = round(self._expr(), 2)
+        return self._round(result)
 
-        return result
+    def evaluate(
+        self,
+        program: Program,
+        variables: dict[str, int | float] | None = None,
+    ) -> int | float:
+        """
+        Функция, вычисляющая скомпилированное выражение без повторного разбора
+        грамматики. Одну и ту же программу можно вычислять многократно,
+        в том числе с разными значениями переменных
+
+        Аргументы:
+            program (Program): выражение, скомпилированное Parser
+            variables (dict[str, int | float] | None): значения переменных
+
+        Возвращаемое значение:
+            int | float: результат расчётов
+
+        Исключения:
+            UndefinedVariableError: если значение переменной не задано
+            BudgetExceededError: если превышен бюджет вычисления
+        """
+        self.tokens = program.tokens
+        self.tokens_length = len(self.tokens)
+        self.variables = variables if variables is not None else dict()
+        self.pos = 0
+        self._start_budget()
+
+        if self.subexpression_cache is not None:
+            return self._evaluate_cached(program, self._get_plan(program))
+
+        stack = list()
+
+        for instruction in program.instructions:
+            self._execute_instruction(stack, *instruction)
+
+        return self._round(stack.pop())
+
+    def _get_plan(self, program: Program) -> SubexpressionPlan:
+        """
+        Вспомогательная функция, возвращающая план кэширования подвыражений
+        программы. План строится при первом вычислении и сохраняется
+        в программе, поэтому заранее скомпилированная программа не хэшируется
+        при каждом вычислении
+
+        Аргументы:
+            program (Program): выражение, скомпилированное Parser
+
+        Возвращаемое значение:
+            SubexpressionPlan: ключи поддеревьев программы
+        """
+        if program.subexpression_plan is None:
+            program.subexpression_plan = SubexpressionPlan(program)
+        return program.subexpression_plan
+
+    def _evaluate_cached(self, program: Program, plan: SubexpressionPlan) -> int | float:
+        """
+        Вспомогательная функция, вычисляющая программу с кэшем подвыражений.
+        Перед первой инструкцией поддерева из плана проверяется кэш: при
+        попадании на стек кладётся готовый результат, а инструкции поддерева
+        пропускаются. Вычисленный результат поддерева сохраняется в кэш,
+        поэтому повторы внутри одного выражения тоже вычисляются один раз
+
+        Аргументы:
+            program (Program): выражение, скомпилированное Parser
+            plan (SubexpressionPlan): ключи поддеревьев программы
+
+        Возвращаемое значение:
+            int | float: результат расчётов
+        """
+        cache = self.subexpression_cache
+        instructions = program.instructions
+        instructions_length = len(instructions)
+        stack = list()
+        index = 0
+
+        while index < instructions_length:
+            for root, key in plan.starts.get(index, ()):
+                value = cache.get(key)
+                if value is not ResultCache.MISSING:
+                    stack.append(value)
+                    index = root + 1
+                    break
+            else:
+                self._execute_instruction(stack, *instructions[index])
+
+                key = plan.roots.get(index)
+                if key is not None:
+                    cache.put(key, stack[-1], sys.getsizeof(stack[-1]))
+                index += 1
+
+        return self._round(stack.pop())
+
+    def _execute_instruction(
+        self, stack: list[int | float], operation: str, argument: object, position: int
+    ) -> None:
+        """
+        Вспомогательная функция, выполняющая одну инструкцию программы над стеком
+
+        Аргументы:
+            stack (list[int | float]): стек значений
+            operation (str): код операции
+            argument (object): аргумент инструкции
+            position (int): количество прочитанных токенов
+
+        Возвращаемое значение:
+            None
+        """
+        if operation is Program.PUSH:
+            stack.append(argument)
+        elif operation is Program.VARIABLE:
+            self.pos = position
+            stack.append(self._get_variable(argument))
+        elif operation is Program.UNARY:
+            if argument.get_token() is Operator.MINUS:
+                stack[-1] = -stack[-1]
+            else:
+                stack[-1] = +stack[-1]
+        elif operation is Program.DEFERRED_POWER:
+            right = stack.pop()
+            stack[-1] = DeferredPower(stack[-1], right, argument, position)
+        else:
+            self.pos = position
+            right = stack.pop()
+            stack[-1] = self._apply_binary(stack[-1], right, argument)
+
+    def _round(self, result: int | float) -> int | float:
+        """
+        Вспомогательная функция, округляющая результат до двух знаков.
+        Целый результат возвращается без вызова round, для остальных типов
+        round вызывается как раньше, поэтому комплексный результат, например
+        у -2 ** 0.5, по-прежнему даёт TypeError
+
+        Аргументы:
+            result (int | float): результат выражения
+
+        Возвращаемое значение:
+            int | float: округлённый результат
+
+        Исключения:
+            TypeError: если результат не поддерживает round
+        """
+        if type(result) is int:
+            return result
+        return round(result, 2)
 
     def _current_token(self) -> Token:
         """
@@ -73,6 +333,17 @@ class Calculator:
             return self.tokens[self.pos]
         raise IndexError("Выход за пределы списка токенов")
 
+    def _get_log(self) -> str:
+        """
+        Вспомогательная функция, восстанавливающая часть выражения, прочитанную
+        к текущей позиции. Вызывается только при выбрасывании исключения,
+        поэтому успешное вычисление не тратит время на построение строки
+
+        Возвращаемое значение:
+            str: часть выражения без пробелов
+        """
+        return "".join(self.tokens[index].get_token() for index in range(self.pos))
+
     def _next_pos(self) -> None:
         """
         Вспомогательная функция, итерирующая индекс
@@ -118,16 +389,10 @@ class Calculator:
             and (token := self._current_token())
             and (token.get_token() in (Operator.PLUS, Operator.MINUS))
         ):
-            self.log += token.get_token()
             self._next_pos()
             right = self._mul()
 
-            self._check_digits_overflow(left, right, token)
-
-            if token.get_token() is Operator.PLUS:
-                left += right
-            else:
-                left -= right
+            left = self._apply_binary(left, right, token)
 
         return left
 
@@ -144,36 +409,21 @@ class Calculator:
 
         while self._has_next() and self._is_mul_groups(self._current_token()):
             token = self._current_token()
-            self.log += token.get_token()
             self._next_pos()
             right = self._pow()
 
-            self._check_digits_overflow(left, right, token)
-
-            match token.get_token():
-                case Operator.MULTIPLICATION:
-                    left *= right
-                case Operator.DIVISION:
-                    self._check_zero_division(right)
-                    left /= right
-                case Operator.INTEGER_DIVISION:
-                    self._check_zero_division(right)
-                    self._check_integer_types(left, right)
-                    left //= right
-                case Operator.REMAINDER_DIVISION:
-                    self._check_zero_division(right)
-                    self._check_integer_types(left, right)
-                    left %= right
+            left = self._apply_binary(left, right, token)
 
         return left
 
     def _pow(self) -> int | float:
         """
         Функция, ответственная за возвезедеие в степень получившихся членов
-        выражений
+        выражений. Если за степенью идёт % или закрывающая скобка, после
+        которой может идти %, возведение в степень откладывается
 
         Возвращаемое значение:
-            int | float: результат выражения
+            int | float | DeferredPower: результат выражения
         """
         left = self._unary()
 
@@ -182,13 +432,15 @@ class Calculator:
             and (token := self._current_token())
             and (token.get_token() is Operator.POWER)
         ):
-            self.log += token.get_token()
             self._next_pos()
             right = self._pow()
 
-            self._check_digits_overflow(left, right, token)
-
-            left **= right
+            if self._is_remainder_possible():
+                left = DeferredPower(
+                    self._force(left), self._force(right), token, self.pos
+                )
+            else:
+                left = self._apply_binary(left, right, token)
 
         return left
 
@@ -204,9 +456,8 @@ class Calculator:
         is_operator = token.get_token() in (Operator.PLUS, Operator.MINUS)
 
         if is_operator:
-            self.log += token.get_token()
             self._next_pos()
-            value = self._unary()
+            value = self._force(self._unary())
 
             if token.get_token() is Operator.PLUS:
                 return +value
@@ -218,26 +469,282 @@ class Calculator:
 
     def _primary(self) -> int | float:
         """
-        Функция, ответственная за возврат числа, или результата более глубокого выражения
+        Функция, ответственная за возврат числа, значения переменной
+        или результата более глубокого выражения
 
         Возвращаемое значение:
             int | float: результат выражения
+
+        Исключения:
+            InvalidBinaryOperatorError: если на месте операнда стоит бинарный оператор
+            TwiceNumberError: если после операнда в скобках нет оператора
         """
-        if self._has_next():
-            token = self._current_token()
-            self.log += token.get_token()
+        if not self._has_next():
+            raise InvalidBinaryOperatorError(self.tokens, self.tokens_length - 1)
+
+        token = self._current_token()
+        self._next_pos()
+
+        if isinstance(token, Number):
+            if token.is_float():
+                return float(token.get_token())
+            return int(token.get_token())
+
+        elif isinstance(token, Variable):
+            return self._get_variable(token.get_token())
+
+        elif token.get_token() is Operator.LEFT_BRACKET:
+            result = self._expr()
+            if self._current_token().get_token() is not Operator.RIGHT_BRACKET:
+                raise TwiceNumberError(self.tokens, self.pos)
             self._next_pos()
+            if not self._is_remainder_possible():
+                result = self._force(result)
+            return result
+
+        raise InvalidBinaryOperatorError(self.tokens, self.pos - 1)
+
+    def _is_remainder_possible(self) -> bool:
+        """
+        Вспомогательная функция, проверяющая, может ли текущее значение
+        стать левым операндом %: следующий токен - % или закрывающая скобка
+
+        Возвращаемое значение:
+            bool
+        """
+        return self._has_next() and self._current_token().get_token() in (
+            Operator.REMAINDER_DIVISION,
+            Operator.RIGHT_BRACKET,
+        )
+
+    def _force(self, value: int | float | DeferredPower) -> int | float:
+        """
+        Вспомогательная функция, вычисляющая отложенную степень с той позицией,
+        на которой она была бы вычислена без откладывания
 
-            if isinstance(token, Number):
-                if token.is_float():
-                    return float(token.get_token())
-                return int(token.get_token())
+        Аргументы:
+            value (int | float | DeferredPower): значение или отложенная степень
 
-            elif token.get_token() is Operator.LEFT_BRACKET:
-                result = self._expr()
-                self.log += self._current_token().get_token()
-                self._next_pos()
-                return result
+        Возвращаемое значение:
+            int | float: значение
+        """
+        if type(value) is not DeferredPower:
+            return value
+
+        position = self.pos
+        self.pos = value.position
+        result = self._apply_binary(value.base, value.exponent, value.operator)
+        self.pos = position
+
+        return result
+
+    def _get_variable(self, name: str) -> int | float:
+        """
+        Вспомогательная функция, возвращающая значение переменной,
+        токен которой прочитан последним
+
+        Аргументы:
+            name (str): имя переменной
+
+        Возвращаемое значение:
+            int | float: значение переменной
+
+        Исключения:
+            UndefinedVariableError: если значение переменной не задано
+        """
+        if name not in self.variables:
+            raise UndefinedVariableError(self.tokens, self.pos - 1)
+        return self.variables[name]
+
+    def _apply_binary(
+        self, left: int | float, right: int | float, operator: Operator
+    ) -> int | float:
+        """
+        Функция, применяющая бинарный оператор к двум операндам после всех
+        предварительных проверок. Отложенная степень слева от % над целыми
+        числами с неотрицательным показателем и ненулевым модулем вычисляется
+        как pow(base, exponent, right), в остальных случаях отложенные
+        степени сначала вычисляются
+
+        Аргументы:
+            left (int | float | DeferredPower): левый операнд
+            right (int | float | DeferredPower): правый операнд
+            operator (Operator): оператор
+
+        Возвращаемое значение:
+            int | float: результат операции
+        """
+        if type(right) is DeferredPower:
+            right = self._force(right)
+
+        if type(left) is DeferredPower:
+            if operator.get_token() is Operator.REMAINDER_DIVISION and (
+                self._is_power_modulo(left, right)
+            ):
+                if self.budget is not None:
+                    self._check_budget(left, right, operator)
+                return pow(left.base, left.exponent, right)
+            left = self._force(left)
+
+        if self.budget is not None:
+            self._check_budget(left, right, operator)
+
+        self._check_digits_overflow(left, right, operator)
+
+        try:
+            match operator.get_token():
+                case Operator.PLUS:
+                    return left + right
+                case Operator.MINUS:
+                    return left - right
+                case Operator.MULTIPLICATION:
+                    return left * right
+                case Operator.DIVISION:
+                    self._check_zero_division(right)
+                    return left / right
+                case Operator.INTEGER_DIVISION:
+                    self._check_zero_division(right)
+                    self._check_integer_types(left, right)
+                    return left // right
+                case Operator.REMAINDER_DIVISION:
+                    self._check_zero_division(right)
+                    self._check_integer_types(left, right)
+                    return left % right
+                case Operator.POWER:
+                    return left**right
+        except OverflowError:
+            raise DigitsOverFlow(self._get_log()) from None
+
+    def _is_power_modulo(self, power: DeferredPower, modulo: int | float) -> bool:
+        """
+        Вспомогательная функция, проверяющая, что (base ** exponent) % modulo
+        можно вычислить как pow(base, exponent, modulo) с тем же результатом
+
+        Аргументы:
+            power (DeferredPower): отложенная степень
+            modulo (int | float): делитель
+
+        Возвращаемое значение:
+            bool
+        """
+        return (
+            type(power.base) is int
+            and type(power.exponent) is int
+            and type(modulo) is int
+            and power.exponent >= 0
+            and modulo != 0
+        )
+
+    def _start_budget(self) -> None:
+        """
+        Вспомогательная функция, обнуляющая счётчик операций и вычисляющая
+        момент окончания времени перед вычислением нового выражения
+
+        Возвращаемое значение:
+            None
+        """
+        self.operations = 0
+        if self.budget is not None:
+            self.deadline = self.budget.get_deadline()
+
+    def _check_budget(
+        self,
+        left: int | float | DeferredPower,
+        right: int | float,
+        operator: Operator,
+    ) -> None:
+        """
+        Функция, проверяющая бюджет перед выполнением бинарной операции:
+        количество операций вместе с текущей, время вычисления и размер
+        операндов и оценки результата в битах. Проверка вызывается из циклов
+        грамматики и вычисления программы, поэтому долгое выражение прерывается
+        между операциями, а слишком большая операция не начинается
+
+        Аргументы:
+            left (int | float | DeferredPower): левый операнд
+            right (int | float): правый операнд
+            operator (Operator): оператор
+
+        Возвращаемое значение:
+            None
+
+        Исключения:
+            BudgetExceededError: если одно из ограничений превышено
+        """
+        budget = self.budget
+
+        self.operations += 1
+        if budget.max_operations is not None and self.operations > budget.max_operations:
+            raise BudgetExceededError(self._get_log(), BudgetExceededError.OPERATIONS)
+
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise BudgetExceededError(self._get_log(), BudgetExceededError.DEADLINE)
+
+        if budget.max_bits is not None and (
+            self._estimate_result_bits(left, right, operator) > budget.max_bits
+        ):
+            raise BudgetExceededError(self._get_log(), BudgetExceededError.BITS)
+
+    def _estimate_result_bits(
+        self,
+        left: int | float | DeferredPower,
+        right: int | float,
+        operator: Operator,
+    ) -> int | float:
+        """
+        Вспомогательная функция, оценивающая сверху длину двоичной записи
+        наибольшего из операндов и результата операции. Вещественные числа
+        имеют фиксированный размер и не учитываются. Для отложенной степени
+        слева от % учитываются основание и показатель, а результат не больше
+        модуля
+
+        Аргументы:
+            left (int | float | DeferredPower): левый операнд
+            right (int | float): правый операнд
+            operator (Operator): оператор
+
+        Возвращаемое значение:
+            int | float: оценка в битах, math.inf для неограниченной оценки
+        """
+        if type(left) is DeferredPower:
+            return max(
+                self._get_bits(left.base), self._get_bits(left.exponent), self._get_bits(right)
+            )
+
+        bits1 = self._get_bits(left)
+        bits2 = self._get_bits(right)
+        operands_bits = max(bits1, bits2)
+
+        if not (isinstance(left, int) and isinstance(right, int)):
+            return operands_bits
+
+        match operator.get_token():
+            case Operator.PLUS | Operator.MINUS:
+                return operands_bits + 1
+            case Operator.MULTIPLICATION:
+                return bits1 + bits2
+            case Operator.POWER:
+                if right <= 0 or abs(left) <= 1:
+                    return operands_bits
+                if bits2 > Calculator.MAX_FLOAT_EXPONENT_BITS:
+                    return math.inf
+                return max(operands_bits, right * math.log2(abs(left)) + 1)
+            case _:
+                return operands_bits
+
+    def _get_bits(self, value: int | float) -> int:
+        """
+        Вспомогательная функция, возвращающая длину двоичной записи целого числа
+
+        Аргументы:
+            value (int | float): число
+
+        Возвращаемое значение:
+            int: длина двоичной записи или 0 для вещественного числа
+        """
+        if isinstance(value, int):
+            return value.bit_length()
+        return 0
 
     def _check_zero_division(self, right: int | float) -> None:
         """
@@ -253,7 +760,7 @@ class Calculator:
             ZeroDivisionError: если right равен нулю
         """
         if right == 0:
-            raise ZeroDivisionError(self.log)
+            raise ZeroDivisionError(self._get_log())
 
     def _check_integer_types(self, left: int | float, right: int | float) -> None:
         """
@@ -271,27 +778,25 @@ class Calculator:
             TypeError: если хотя бы один является float
         """
         if isinstance(left, float) or isinstance(right, float):
-            raise TypeError(self.log)
+            raise TypeError(self._get_log())
 
-    def _get_integer_digits_count(self, number: int) -> int:
+    def _get_integer_digits_bounds(self, number: int) -> tuple[int, int]:
         """
-        Вспомогательная функция для подсчёта количества цифр в целочисленном
-        числе
+        Вспомогательная функция, оценивающая количество цифр в целочисленном
+        числе снизу и сверху по длине его двоичной записи за O(1)
 
         Аргументы:
             number (int): целочисленное число
 
         Возвращаемое значение:
-            int: количество цифр в числе
+            tuple[int, int]: нижняя и верхняя граница количества цифр
         """
-        count = 0
-        number = abs(number)
+        bits = number.bit_length()
 
-        while number != 0:
-            count += 1
-            number //= 10
+        if bits == 0:
+            return 1, 1
 
-        return count
+        return int((bits - 1) * Calculator.LOG10_2), int(bits * Calculator.LOG10_2) + 2
 
     def _is_mul_groups(self, token: Operator) -> bool:
         """
@@ -316,8 +821,9 @@ class Calculator:
     ) -> None:
         """
         Вспомогательная функция, выполняющая предварительную оценку применения
-        арифметической операции к двум числам. Функция вызывает вспомогательные функции
-        для выполнения оценки для целочисленных чисел и чисел с плавающей точкой
+        арифметической операции к двум целочисленным числам. Для чисел с плавающей
+        точкой и деления переполнение обнаруживается при самом вычислении
+        в _apply_binary, поэтому результат не считается дважды
 
         Аргументы:
             num1 (int | float): первое операнд
@@ -333,16 +839,16 @@ class Calculator:
         if (
             isinstance(num1, int)
             and isinstance(num2, int)
-            and operator != Operator.DIVISION
+            and operator.get_token() != Operator.DIVISION
         ):
             self._check_integer_overflow(num1, num2, operator)
-        else:
-            self._check_float_overflow(num1, num2, operator)
 
     def _check_integer_overflow(self, num1: int, num2: int, operator: Operator) -> None:
         """
         Вспомогательная функция, выполняющая предварительную оценку для
-        целочисленных чисел для следующих операций: + - * % // ** /
+        целочисленных чисел для следующих операций: + - * % // **.
+        Количество цифр операндов оценивается по длине двоичной записи,
+        точный подсчёт выполняется, только если оценка попала на границу
 
         Аргументы:
             num1 (int): первое операнд
@@ -355,73 +861,81 @@ class Calculator:
         Исключения:
             DigitsOverflow: при неудачном результате оценки
         """
-        NUM1_DIGITS_COUNT = self._get_integer_digits_count(num1)
-        NUM2_DIGITS_COUNT = self._get_integer_digits_count(num2)
-
-        digits_in_results = None
-
-        match operator.get_token():
-            case Operator.PLUS | Operator.MINUS:
-                digits_in_results = max(NUM1_DIGITS_COUNT, NUM2_DIGITS_COUNT) + 1
+        MAX_DIGITS = self.max_digits
 
-            case Operator.MULTIPLICATION:
-                digits_in_results = NUM1_DIGITS_COUNT + NUM2_DIGITS_COUNT
+        if operator.get_token() is Operator.POWER:
+            if (num1 == 0) or (num2 == 0) or abs(num1) == 1:
+                digits_in_results = 1
+            elif num2.bit_length() > Calculator.MAX_FLOAT_EXPONENT_BITS:
+                digits_in_results = math.inf if num2 > 0 else 0
+            else:
+                digits_in_results = num2 * math.log10(abs(num1)) + 1
 
-            case Operator.REMAINDER_DIVISION:
-                digits_in_results = NUM2_DIGITS_COUNT
+            if digits_in_results > MAX_DIGITS:
+                raise DigitsOverFlow(self._get_log())
+            return
 
-            case Operator.INTEGER_DIVISION:
-                digits_in_results = NUM1_DIGITS_COUNT
+        low1, high1 = self._get_integer_digits_bounds(num1)
+        low2, high2 = self._get_integer_digits_bounds(num2)
 
-            case Operator.POWER:
-                if (num1 == 0) or (num2 == 0) or abs(num1) == 1:
-                    digits_in_results = 1
-                else:
-                    digits_in_results = num2 * math.log10(abs(num1)) + 1
+        if self._estimate_result_digits(high1, high2, operator) <= MAX_DIGITS:
+            return
 
-            case Operator.DIVISION:
-                self._check_float_overflow(num1, num2, operator)
+        if self._estimate_result_digits(low1, low2, operator) <= MAX_DIGITS:
+            digits1 = count_digits(num1)
+            digits2 = count_digits(num2)
+            if self._estimate_result_digits(digits1, digits2, operator) <= MAX_DIGITS:
                 return
 
-        if digits_in_results > Calculator.MAX_INTEGER_COUNT_DIGITS:
-            raise DigitsOverFlow(self.log)
+        raise DigitsOverFlow(self._get_log())
 
-    def _check_float_overflow(
-        self, num1: float, num2: float, operator: Operator
-    ) -> None:
+    def _estimate_result_digits(
+        self, digits1: int, digits2: int, operator: Operator
+    ) -> int:
         """
-        Вспомогательная функция, выполняющая предварительную оценку для
-        чисел с плавающей точкой для следующих операций: + - * / **
+        Вспомогательная функция, оценивающая сверху количество цифр результата
+        операций + - * % // по количеству цифр операндов
 
         Аргументы:
-            num1 (float): первое операнд
-            num2 (float): второй операнд
+            digits1 (int): количество цифр первого операнда
+            digits2 (int): количество цифр второго операнда
             operator (Operator): оператор
 
         Возвращаемое значение:
-            None
-
-        Исключения:
-            DigitsOverflow: при неудачном результате оценки
+            int: оценка количества цифр результата
         """
-        result = None
+        match operator.get_token():
+            case Operator.PLUS | Operator.MINUS:
+                return max(digits1, digits2) + 1
 
-        try:
-            match operator.get_token():
-                case Operator.PLUS:
-                    result = num1 + num2
+            case Operator.MULTIPLICATION:
+                return digits1 + digits2
 
-                case Operator.MINUS:
-                    result = num1 - num2
+            case Operator.REMAINDER_DIVISION:
+                return digits2
 
-                case Operator.MULTIPLICATION:
-                    result = num1 * num2
+            case Operator.INTEGER_DIVISION:
+                return digits1
 
-                case Operator.DIVISION:
-                    self._check_zero_division(num2)
-                    result = num1 / num2
 
-                case Operator.POWER:
-                    result = num1**num2
-        except OverflowError:
-            raise DigitsOverFlow(self.log)
+def count_digits(number: int) -> int:
+    """
+    Функция для точного подсчёта количества десятичных цифр целого числа
+    без перевода в строку: оценка по длине двоичной записи уточняется
+    сравнением со степенью десяти
+
+    Аргументы:
+        number (int): целое число
+
+    Возвращаемое значение:
+        int: количество цифр в числе, 1 для нуля
+    """
+    number = abs(number)
+    count = max(int((number.bit_length() - 1) * Calculator.LOG10_2), 1)
+
+    power = 10**count
+    while power <= number:
+        count += 1
+        power *= 10
+
+    return count
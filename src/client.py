@@ -0,0 +1,122 @@
+"""
+Тонкий клиент сервера вычислений, запущенного с --unix. Передаёт выражения
+через Unix-сокет и печатает ответы. Модуль не импортирует конвейер
+калькулятора и модуль json, поэтому запуск клиента почти не добавляет
+времени к запуску интерпретатора
+
+Использование:
+    python -m src.client [--socket PATH] [ВЫРАЖЕНИЕ ...]
+
+Без выражения в аргументах выражения читаются построчно из стандартного ввода
+"""
+
+import os
+import socket
+import sys
+
+SOCKET_VARIABLE = "CALCULATOR_SOCKET"
+SOCKET_NAME = "calculator.sock"
+RESULT_PREFIX = '{"result": '
+CONNECTION_ERROR_STATUS = 2
+
+
+def get_default_socket_path() -> str:
+    """
+    Функция, возвращающая путь к сокету из переменной окружения
+    CALCULATOR_SOCKET или путь по умолчанию в каталоге пользователя
+    XDG_RUNTIME_DIR, а без него - в каталоге /tmp/calculator-UID,
+    который сервер создаёт доступным только владельцу
+
+    Возвращаемое значение:
+        str: путь к сокету
+    """
+    path = os.environ.get(SOCKET_VARIABLE)
+    if path:
+        return path
+
+    directory = os.environ.get("XDG_RUNTIME_DIR") or f"/tmp/calculator-{os.getuid()}"
+    return os.path.join(directory, SOCKET_NAME)
+
+
+def decode_response(line: str) -> tuple[bool, str]:
+    """
+    Функция, разбирающая строку ответа сервера. Ответ с результатом
+    разбирается без модуля json, который импортируется только для ошибок
+
+    Аргументы:
+        line (str): строка ответа без перевода строки
+
+    Возвращаемое значение:
+        tuple[bool, str]: успешность и текст для вывода: результат
+        или сообщение об ошибке
+    """
+    if line.startswith(RESULT_PREFIX) and line.endswith("}") and "\\" not in line:
+        value = line[len(RESULT_PREFIX):-1]
+        if value == "null":
+            return True, ""
+        return True, value.strip('"')
+
+    import json
+
+    response = json.loads(line)
+    if "result" in response:
+        return True, str(response["result"])
+    return False, response["message"]
+
+
+def main(arguments: list[str]) -> int:
+    """
+    Функция, передающая выражения серверу и печатающая ответы: результаты
+    в стандартный вывод, ошибки в стандартный поток ошибок. Клиент
+    подключается только к сокету, владелец которого - текущий пользователь,
+    чтобы не передавать выражения чужому серверу и не доверять его ответам
+
+    Аргументы:
+        arguments (list[str]): аргументы командной строки без имени программы
+
+    Возвращаемое значение:
+        int: код возврата: 0 без ошибок, 1 при ошибках в выражениях,
+        2 при отсутствии соединения с сервером
+    """
+    path = get_default_socket_path()
+    if arguments[:1] == ["--socket"] and len(arguments) > 1:
+        path = arguments[1]
+        arguments = arguments[2:]
+
+    if arguments:
+        expressions = [" ".join(arguments)]
+    else:
+        expressions = (line.rstrip("\n") for line in sys.stdin)
+
+    try:
+        if os.stat(path).st_uid != os.getuid():
+            print(f"Сокет {path} принадлежит другому пользователю", file=sys.stderr)
+            return CONNECTION_ERROR_STATUS
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(path)
+    except OSError as error:
+        print(f"Нет соединения с сервером {path}: {error.strerror}", file=sys.stderr)
+        return CONNECTION_ERROR_STATUS
+
+    status = 0
+
+    with connection, connection.makefile("rb") as responses:
+        for expression in expressions:
+            connection.sendall(expression.encode() + b"\n")
+            line = responses.readline()
+            if not line:
+                print("Сервер закрыл соединение", file=sys.stderr)
+                return CONNECTION_ERROR_STATUS
+
+            success, text = decode_response(line.decode().rstrip("\n"))
+            if success:
+                print(text)
+            else:
+                print(text, file=sys.stderr)
+                status = 1
+
+    return status
+
+
+if (__name__ == "__main__"):
+    sys.exit(main(sys.argv[1:]))
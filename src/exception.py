@@ -12,30 +12,56 @@ class ExpressionError(Exception):
 
 class TokenErrors(ExpressionError):
     tokens: list[Token]
+    rendered: str | None
 
     UNKNOWN_POSITION = -1
+    # Количество токенов, показываемых слева и справа от ошибочного
+    CONTEXT_TOKENS = 50
+    OMISSION = "..."
 
     def __init__(self, tokens, invalid_position, message):
         super().__init__(invalid_position, message)
         self.tokens = tokens
+        self.rendered = None
 
     def __str__(self):
-        tokens_str = ""
-
-        temp_invalid_position = TokenErrors.UNKNOWN_POSITION
-        for index in range(len(self.tokens)):
+        if self.rendered is None:
+            self.rendered = self._render()
+        return self.rendered
+
+    def _render(self):
+        tokens_length = len(self.tokens)
+        context = self.CONTEXT_TOKENS
+
+        if self.invalid_position == TokenErrors.UNKNOWN_POSITION:
+            start = 0
+            end = min(tokens_length, 2 * context + 1)
+        else:
+            start = max(0, self.invalid_position - context)
+            end = min(tokens_length, self.invalid_position + context + 1)
+
+        parts = list()
+        if start > 0:
+            parts.append(self.OMISSION)
+
+        caret_position = TokenErrors.UNKNOWN_POSITION
+        column = sum(len(part) + 1 for part in parts)
+        for index in range(start, end):
             if index == self.invalid_position:
-                temp_invalid_position = len(tokens_str)
-            tokens_str += self.tokens[index].get_token() + " "
-        self.invalid_position = temp_invalid_position
+                caret_position = column
+            token = self.tokens[index].get_token()
+            parts.append(token)
+            column += len(token) + 1
+
+        if end < tokens_length:
+            parts.append(self.OMISSION)
 
-        tokens_str += "\n"
-        if self.invalid_position != TokenErrors.UNKNOWN_POSITION:
-            tokens_str += self.invalid_position * " "
-            tokens_str += "^\n"
-        tokens_str += self.message
+        lines = ["".join(part + " " for part in parts)]
+        if caret_position != TokenErrors.UNKNOWN_POSITION:
+            lines.append(caret_position * " " + "^")
+        lines.append(self.message)
 
-        return tokens_str
+        return "\n".join(lines)
 
 
 class BracketsBalanceError(TokenErrors):
@@ -74,6 +100,13 @@ class TwiceNumberError(TokenErrors):
         super().__init__(tokens, invalid_position, TwiceNumberError.ERROR_MESSAGE)
 
 
+class UndefinedVariableError(TokenErrors):
+    ERROR_MESSAGE = "ОШИБКА: Значение переменной не задано"
+
+    def __init__(self, tokens, invalid_position):
+        super().__init__(tokens, invalid_position, UndefinedVariableError.ERROR_MESSAGE)
+
+
 class ExpressionStringError(ExpressionError):
     expression: str
 
@@ -106,3 +139,23 @@ class NumberDotError(ExpressionStringError):
 class DigitsOverFlow(Exception):
     def __init__(self, log):
         self.log = log
+
+
+class BudgetExceededError(Exception):
+    OPERATIONS = "operations"
+    BITS = "bits"
+    DEADLINE = "deadline"
+
+    def __init__(self, log, limit):
+        self.log = log
+        self.limit = limit
+
+
+class EvaluationTimeoutError(Exception):
+    def __init__(self, log):
+        self.log = log
+
+
+class WorkerCrashedError(Exception):
+    def __init__(self, log):
+        self.log = log
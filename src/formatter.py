@@ -0,0 +1,224 @@
+"""
+Модуль форматирования результатов вычислений. Длинные целые переводятся
+в десятичную запись алгоритмом "разделяй и властвуй", не ограниченным
+sys.get_int_max_str_digits(), или выводятся в шестнадцатеричном виде,
+в научной записи либо только количеством цифр
+"""
+
+from src.calculator import Calculator, count_digits
+
+import decimal
+import sys
+
+
+class ResultFormatter:
+    """
+    Форматирование результата выражения. Встроенный перевод длинного целого
+    в строку работает за квадратичное время и запрещён для чисел длиннее
+    sys.get_int_max_str_digits() цифр. Число до DIRECT_BITS бит переводится
+    встроенным способом, а более длинное делится пополам по двоичной записи,
+    половины переводятся рекурсивно и собираются в модуле decimal, умножение
+    в котором быстрее квадратичного. Вещественные числа в режиме DIGITS
+    выводятся как есть
+
+    Атрибуты класса:
+        DECIMAL (str): полная десятичная запись
+        HEX (str): шестнадцатеричная запись целых чисел
+        SCIENTIFIC (str): научная запись с significant_digits значащими цифрами
+        DIGITS (str): только количество цифр целого числа
+        MODES (tuple[str]): все режимы
+        DIRECT_BITS (int): длина двоичной записи, до которой целое число
+            переводится в строку встроенным способом
+        LEAF_BITS (int): длина двоичной записи частей, на которых
+            останавливается деление пополам
+
+    Атрибуты объекта:
+        mode (str): режим форматирования
+        significant_digits (int): количество значащих цифр в режиме SCIENTIFIC
+    """
+
+    DECIMAL = "decimal"
+    HEX = "hex"
+    SCIENTIFIC = "scientific"
+    DIGITS = "digits"
+    MODES = (DECIMAL, HEX, SCIENTIFIC, DIGITS)
+    DIRECT_BITS = 2**16
+    LEAF_BITS = 128
+
+    mode: str
+    significant_digits: int
+
+    def __init__(self, mode: str = DECIMAL, significant_digits: int = 10) -> None:
+        """
+        Выбор режима форматирования
+        """
+        if mode not in ResultFormatter.MODES:
+            raise ValueError(f"Неизвестный режим форматирования: {mode}")
+
+        self.mode = mode
+        self.significant_digits = significant_digits
+
+    def format(self, result: int | float) -> str:
+        """
+        Функция, форматирующая результат выражения
+
+        Аргументы:
+            result (int | float): результат
+
+        Возвращаемое значение:
+            str: запись результата
+        """
+        if isinstance(result, float):
+            return self._format_float(result)
+
+        match self.mode:
+            case ResultFormatter.DECIMAL:
+                return self.to_decimal(result)
+            case ResultFormatter.HEX:
+                return hex(result)
+            case ResultFormatter.SCIENTIFIC:
+                return self._to_scientific(result)
+            case ResultFormatter.DIGITS:
+                return str(count_digits(result))
+
+    def is_number(self) -> bool:
+        """
+        Функция, проверяющая, что запись результата - число в формате JSON
+
+        Возвращаемое значение:
+            bool
+        """
+        return self.mode == ResultFormatter.DECIMAL
+
+    def to_decimal(self, number: int) -> str:
+        """
+        Функция, переводящая целое число в десятичную запись
+
+        Аргументы:
+            number (int): число
+
+        Возвращаемое значение:
+            str: десятичная запись
+        """
+        bits = number.bit_length()
+        limit = sys.get_int_max_str_digits()
+
+        if bits <= ResultFormatter.DIRECT_BITS and (
+            limit == 0 or bits * Calculator.LOG10_2 < limit
+        ):
+            return str(number)
+
+        sign = "-" if number < 0 else ""
+        number = abs(number)
+        powers = dict()
+
+        with decimal.localcontext() as context:
+            context.prec = decimal.MAX_PREC
+            context.Emax = decimal.MAX_EMAX
+            context.Emin = decimal.MIN_EMIN
+            context.traps[decimal.Inexact] = True
+
+            return sign + str(self._split_decimal(number, bits, powers))
+
+    def _split_decimal(
+        self, number: int, bits: int, powers: dict[int, decimal.Decimal]
+    ) -> decimal.Decimal:
+        """
+        Вспомогательная функция, переводящая неотрицательное целое число
+        в Decimal: number = high * 2 ** half + low
+
+        Аргументы:
+            number (int): число
+            bits (int): оценка сверху длины двоичной записи числа
+            powers (dict[int, decimal.Decimal]): вычисленные степени двойки
+
+        Возвращаемое значение:
+            decimal.Decimal: число
+        """
+        if bits <= ResultFormatter.LEAF_BITS:
+            return decimal.Decimal(number)
+
+        half = bits >> 1
+        high = number >> half
+        low = number - (high << half)
+
+        return self._split_decimal(low, half, powers) + self._split_decimal(
+            high, bits - half, powers
+        ) * self._get_power_of_two(half, powers)
+
+    def _get_power_of_two(
+        self, exponent: int, powers: dict[int, decimal.Decimal]
+    ) -> decimal.Decimal:
+        """
+        Вспомогательная функция, вычисляющая 2 ** exponent в Decimal
+
+        Аргументы:
+            exponent (int): показатель
+            powers (dict[int, decimal.Decimal]): вычисленные степени двойки
+
+        Возвращаемое значение:
+            decimal.Decimal: степень двойки
+        """
+        power = powers.get(exponent)
+
+        if power is None:
+            if exponent <= ResultFormatter.LEAF_BITS:
+                power = decimal.Decimal(2) ** exponent
+            else:
+                half = exponent >> 1
+                power = self._get_power_of_two(half, powers) * self._get_power_of_two(
+                    exponent - half, powers
+                )
+            powers[exponent] = power
+
+        return power
+
+    def _to_scientific(self, number: int) -> str:
+        """
+        Вспомогательная функция, переводящая целое число в научную запись
+        без перевода в строку всего числа: отбрасываемые цифры отделяются
+        целочисленным делением на степень десяти, последняя значащая цифра
+        округляется
+
+        Аргументы:
+            number (int): число
+
+        Возвращаемое значение:
+            str: научная запись вида 1.234e+56
+        """
+        sign = "-" if number < 0 else ""
+        number = abs(number)
+        digits = count_digits(number)
+        significant = self.significant_digits
+
+        if digits > significant:
+            mantissa = (number // 10 ** (digits - significant - 1) + 5) // 10
+            if mantissa == 10**significant:
+                mantissa //= 10
+                digits += 1
+        else:
+            mantissa = number * 10 ** (significant - digits)
+
+        text = self.to_decimal(mantissa).zfill(significant)
+        if significant > 1:
+            text = text[0] + "." + text[1:]
+
+        return f"{sign}{text}e{digits - 1:+03d}"
+
+    def _format_float(self, result: float) -> str:
+        """
+        Вспомогательная функция, форматирующая вещественный результат
+
+        Аргументы:
+            result (float): результат
+
+        Возвращаемое значение:
+            str: запись результата
+        """
+        match self.mode:
+            case ResultFormatter.HEX:
+                return result.hex()
+            case ResultFormatter.SCIENTIFIC:
+                return f"{result:.{self.significant_digits - 1}e}"
+            case _:
+                return str(result)
@@ -0,0 +1,192 @@
+"""
+Модуль настройки журнала: обработчики файла и терминала, запись журнала
+в фоновом потоке через очередь, записи в формате JSON и ограничение
+частоты записей об ошибках каждого класса
+"""
+
+from logging.handlers import QueueHandler, QueueListener
+import json
+import logging
+import queue
+import time
+
+TEXT_FORMAT = "[%(asctime)s.%(msecs)03d][%(name)s][%(levelname)s]\n%(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Форматирование записи журнала в объект JSON в одну строку. Кроме времени,
+    уровня, имени журнала и сообщения в объект попадают поля ошибки выражения,
+    если они переданы в extra: класс ошибки, позиция и хэш выражения,
+    а также количество записей, отброшенных ограничением частоты
+
+    Атрибуты класса:
+        EXTRA_FIELDS (tuple[str]): дополнительные поля записи
+    """
+
+    EXTRA_FIELDS = ("error", "position", "expression_hash", "suppressed")
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Функция, форматирующая запись журнала
+
+        Аргументы:
+            record (logging.LogRecord): запись
+
+        Возвращаемое значение:
+            str: объект JSON
+        """
+        document = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in JsonFormatter.EXTRA_FIELDS:
+            if hasattr(record, field):
+                document[field] = getattr(record, field)
+        if record.exc_info:
+            document["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(document, ensure_ascii=False)
+
+
+class ErrorRateLimitFilter(logging.Filter):
+    """
+    Ограничение частоты записей об ошибках: за каждый период пропускается
+    не больше limit записей с одним классом ошибки (поле error записи).
+    Количество отброшенных записей сохраняется в поле suppressed первой
+    пропущенной записи следующего периода. Записи без поля error
+    не ограничиваются. Один фильтр можно добавить нескольким обработчикам:
+    запись, уже проверенная последней, получает прежнее решение и не
+    учитывается повторно
+
+    Атрибуты:
+        limit (int): количество записей одного класса за период
+        period (float): длина периода в секундах
+        windows (dict[str, list]): по классу ошибки - начало периода,
+            количество пропущенных и отброшенных записей
+        last_record (logging.LogRecord | None): последняя проверенная запись
+        last_decision (bool): решение для последней проверенной записи
+    """
+
+    limit: int
+    period: float
+    windows: dict[str, list]
+    last_record: logging.LogRecord | None
+    last_decision: bool
+
+    def __init__(self, limit: int, period: float = 1.0) -> None:
+        """
+        Установка ограничения
+        """
+        super().__init__()
+        self.limit = limit
+        self.period = period
+        self.windows = dict()
+        self.last_record = None
+        self.last_decision = True
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Функция, решающая, пропустить ли запись
+
+        Аргументы:
+            record (logging.LogRecord): запись
+
+        Возвращаемое значение:
+            bool: True, если запись нужно записать
+        """
+        error = getattr(record, "error", None)
+        if error is None:
+            return True
+
+        if record is not self.last_record:
+            self.last_record = record
+            self.last_decision = self._count(error, record)
+        return self.last_decision
+
+    def _count(self, error: str, record: logging.LogRecord) -> bool:
+        """
+        Вспомогательная функция, учитывающая запись в окне её класса ошибки
+
+        Аргументы:
+            error (str): класс ошибки
+            record (logging.LogRecord): запись
+
+        Возвращаемое значение:
+            bool: True, если запись нужно записать
+        """
+        now = time.monotonic()
+        window = self.windows.get(error)
+
+        if window is None or now - window[0] >= self.period:
+            suppressed = window[2] if window is not None else 0
+            if suppressed:
+                record.suppressed = suppressed
+            self.windows[error] = [now, 1, 0]
+            return True
+
+        if window[1] < self.limit:
+            window[1] += 1
+            return True
+
+        window[2] += 1
+        return False
+
+
+def configure_logging(
+    filename: str | None = None,
+    level: int = logging.ERROR,
+    structured: bool = False,
+    rate_limit: int | None = None,
+    queued: bool = False,
+    logger: logging.Logger | None = None,
+) -> QueueListener | None:
+    """
+    Функция, настраивающая журнал: запись в терминал и, если задан filename,
+    в файл. С queued журнал получает только QueueHandler, который кладёт
+    запись в очередь, а форматирование и запись в файл и терминал выполняет
+    фоновый поток QueueListener. Ограничение частоты проверяется до очереди,
+    поэтому отброшенные записи не стоят ничего, кроме проверки. Все
+    обработчики разделяют один фильтр, поэтому ограничение общее для файла
+    и терминала
+
+    Аргументы:
+        filename (str | None): файл журнала
+        level (int): уровень журнала
+        structured (bool): записывать ли записи в формате JSON
+        rate_limit (int | None): количество записей об ошибках одного класса
+            в секунду или None без ограничения
+        queued (bool): записывать ли журнал в фоновом потоке
+        logger (logging.Logger | None): настраиваемый журнал, по умолчанию корневой
+
+    Возвращаемое значение:
+        QueueListener | None: запущенный фоновый поток, который нужно
+        остановить методом stop перед выходом, чтобы записать остаток очереди
+    """
+    logger = logger if logger is not None else logging.getLogger()
+    logger.setLevel(level)
+
+    handlers = [logging.StreamHandler()]
+    if filename is not None:
+        handlers.append(logging.FileHandler(filename, delay=True))
+
+    formatter = JsonFormatter() if structured else logging.Formatter(TEXT_FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    listener = None
+    if queued:
+        records = queue.SimpleQueue()
+        listener = QueueListener(records, *handlers, respect_handler_level=True)
+        listener.start()
+        handlers = [QueueHandler(records)]
+
+    limit = ErrorRateLimitFilter(rate_limit) if rate_limit is not None else None
+    for handler in handlers:
+        if limit is not None:
+            handler.addFilter(limit)
+        logger.addHandler(handler)
+
+    return listener
@@ -2,10 +2,404 @@ from src.application import Application
 from src.tokenizer import Tokenizer
 from src.validator import Validator
 from src.calculator import Calculator
+from src.metrics import PipelineMetrics
+from src.cache import ResultCache
+from src.budget import Budget
+from src.supervisor import SupervisedCalculator
+from src.formatter import ResultFormatter
+from src.logs import configure_logging
+
+from logging.handlers import QueueListener
+
+from contextlib import ExitStack
+from typing import TextIO
+import argparse
+import logging
+import sys
+
+STANDARD_STREAM = "-"
+INLINE_ERRORS = "inline"
+SEPARATE_FILE_ERRORS = "separate-file"
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Разбирает аргументы командной строки. Без --input запускается
+    интерактивный режим
+
+    Возвращаемое значение:
+        argparse.Namespace: аргументы
+    """
+    parser = argparse.ArgumentParser(prog="python -m src.main")
+    parser.add_argument(
+        "--input",
+        metavar="FILE|-",
+        help="файл с выражениями по одному на строку, '-' - стандартный ввод",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="FILE|-",
+        default=STANDARD_STREAM,
+        help="файл для результатов, '-' - стандартный вывод",
+    )
+    parser.add_argument(
+        "--errors",
+        choices=(INLINE_ERRORS, SEPARATE_FILE_ERRORS),
+        default=INLINE_ERRORS,
+        help="писать ошибки на место результата или в отдельный файл",
+    )
+    parser.add_argument(
+        "--errors-file",
+        metavar="FILE|-",
+        default="errors.txt",
+        help="файл ошибок для --errors separate-file",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_integer,
+        default=1,
+        help="количество процессов для вычисления блоков выражений",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=positive_integer,
+        default=4096,
+        help="количество выражений в одном блоке",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=(Calculator.RECURSIVE_ENGINE, Calculator.STACK_ENGINE),
+        default=Calculator.RECURSIVE_ENGINE,
+        help="движок вычислений: рекурсивный спуск или стековый без рекурсии",
+    )
+    parser.add_argument(
+        "--subexpression-cache",
+        metavar="ENTRIES",
+        type=positive_integer,
+        help="кэшировать результаты выражений в скобках и возведений в степень, "
+        "храня не больше ENTRIES записей",
+    )
+    add_budget_arguments(parser)
+    add_offload_arguments(parser)
+    add_output_arguments(parser)
+    add_logging_arguments(parser)
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="собирать метрики стадий конвейера, в интерактивном режиме "
+        "они выводятся командой stats",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="FILE|-",
+        default="metrics.json",
+        help="файл, в который метрики пишутся после пакетной обработки",
+    )
+    return parser.parse_args()
+
+
+def add_budget_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Добавляет аргументы бюджета вычисления одного выражения
+
+    Аргументы:
+        parser (argparse.ArgumentParser): парсер аргументов
+
+    Возвращаемое значение:
+        None
+    """
+    parser.add_argument(
+        "--max-operations",
+        metavar="N",
+        type=positive_integer,
+        help="максимальное количество бинарных операций в одном выражении",
+    )
+    parser.add_argument(
+        "--max-bits",
+        metavar="N",
+        type=positive_integer,
+        help="максимальный размер целых операндов и результатов операций в битах",
+    )
+    parser.add_argument(
+        "--timeout",
+        metavar="SECONDS",
+        type=positive_float,
+        help="максимальное время вычисления одного выражения",
+    )
+
+
+def add_offload_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Добавляет аргументы вычисления дорогих выражений в отдельном процессе
+
+    Аргументы:
+        parser (argparse.ArgumentParser): парсер аргументов
+
+    Возвращаемое значение:
+        None
+    """
+    parser.add_argument(
+        "--offload-cost",
+        metavar="NANOSECONDS",
+        type=positive_float,
+        help="вычислять выражения с оценкой стоимости больше NANOSECONDS "
+        "в отдельном процессе, который завершается по истечении --offload-timeout",
+    )
+    parser.add_argument(
+        "--offload-timeout",
+        metavar="SECONDS",
+        type=positive_float,
+        default=10.0,
+        help="время, отведённое отдельному процессу на одно выражение",
+    )
+
+
+def add_output_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Добавляет аргументы форматирования результатов
+
+    Аргументы:
+        parser (argparse.ArgumentParser): парсер аргументов
+
+    Возвращаемое значение:
+        None
+    """
+    parser.add_argument(
+        "--output-format",
+        choices=ResultFormatter.MODES,
+        default=ResultFormatter.DECIMAL,
+        help="вывод результата: полная десятичная запись, шестнадцатеричная, "
+        "научная запись или только количество цифр",
+    )
+    parser.add_argument(
+        "--significant-digits",
+        metavar="N",
+        type=positive_integer,
+        default=10,
+        help="количество значащих цифр в научной записи",
+    )
+    parser.add_argument(
+        "--max-digits",
+        metavar="N",
+        type=positive_integer,
+        default=Calculator.MAX_INTEGER_COUNT_DIGITS,
+        help="максимальное количество цифр целого результата операции",
+    )
+
+
+def add_logging_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Добавляет аргументы журнала
+
+    Аргументы:
+        parser (argparse.ArgumentParser): парсер аргументов
+
+    Возвращаемое значение:
+        None
+    """
+    group = parser.add_argument_group("журнал")
+    group.add_argument(
+        "--log-queue",
+        action="store_true",
+        help="писать журнал в фоновом потоке через очередь, не останавливая вычисления",
+    )
+    group.add_argument(
+        "--log-json",
+        action="store_true",
+        help="писать записи журнала объектами JSON с классом ошибки, "
+        "позицией и хэшем выражения",
+    )
+    group.add_argument(
+        "--log-rate-limit",
+        metavar="N",
+        type=positive_integer,
+        help="записывать не больше N ошибок одного класса в секунду",
+    )
+
+
+def create_logging(
+    arguments: argparse.Namespace, filename: str | None, level: int
+) -> QueueListener | None:
+    """
+    Настраивает журнал по аргументам командной строки
+
+    Аргументы:
+        arguments (argparse.Namespace): аргументы
+        filename (str | None): файл журнала
+        level (int): уровень журнала
+
+    Возвращаемое значение:
+        QueueListener | None: фоновый поток журнала для --log-queue
+    """
+    return configure_logging(
+        filename,
+        level,
+        arguments.log_json,
+        arguments.log_rate_limit,
+        arguments.log_queue,
+    )
+
+
+def get_log_filename(arguments: argparse.Namespace) -> str | None:
+    """
+    Выбирает файл журнала: в пакетном режиме с --errors separate-file
+    ошибки уже пишутся в --errors-file, поэтому файл журнала не создаётся
+
+    Аргументы:
+        arguments (argparse.Namespace): аргументы
+
+    Возвращаемое значение:
+        str | None: файл журнала или None, если журнал пишется только в терминал
+    """
+    if arguments.input is not None and arguments.errors == SEPARATE_FILE_ERRORS:
+        return None
+    return Application.LOG_FILENAME
+
+
+def create_formatter(arguments: argparse.Namespace) -> ResultFormatter:
+    """
+    Создаёт форматирование результатов по аргументам командной строки
+
+    Аргументы:
+        arguments (argparse.Namespace): аргументы
+
+    Возвращаемое значение:
+        ResultFormatter: форматирование результатов
+    """
+    return ResultFormatter(arguments.output_format, arguments.significant_digits)
+
+
+def create_calculator(arguments: argparse.Namespace) -> Calculator | SupervisedCalculator:
+    """
+    Создаёт калькулятор по аргументам командной строки
+
+    Аргументы:
+        arguments (argparse.Namespace): аргументы
+
+    Возвращаемое значение:
+        Calculator | SupervisedCalculator: калькулятор
+    """
+    subexpression_cache = None
+    if arguments.subexpression_cache is not None:
+        subexpression_cache = ResultCache(max_entries=arguments.subexpression_cache)
+
+    calculator = Calculator(
+        arguments.engine,
+        subexpression_cache,
+        create_budget(arguments),
+        arguments.max_digits,
+    )
+    if arguments.offload_cost is None:
+        return calculator
+    return SupervisedCalculator(calculator, arguments.offload_cost, arguments.offload_timeout)
+
+
+def create_budget(arguments: argparse.Namespace) -> Budget | None:
+    """
+    Создаёт бюджет вычисления по аргументам командной строки
+
+    Аргументы:
+        arguments (argparse.Namespace): аргументы
+
+    Возвращаемое значение:
+        Budget | None: бюджет или None, если ни одно ограничение не задано
+    """
+    limits = (arguments.max_operations, arguments.max_bits, arguments.timeout)
+    if all(limit is None for limit in limits):
+        return None
+    return Budget(*limits)
+
+
+def positive_integer(value: str) -> int:
+    """
+    Преобразует аргумент командной строки в положительное целое число
+
+    Аргументы:
+        value (str): значение аргумента
+
+    Возвращаемое значение:
+        int: число
+
+    Исключения:
+        argparse.ArgumentTypeError: если число не положительное
+    """
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError("ожидается положительное целое число")
+    return number
+
+
+def positive_float(value: str) -> float:
+    """
+    Преобразует аргумент командной строки в положительное вещественное число
+
+    Аргументы:
+        value (str): значение аргумента
+
+    Возвращаемое значение:
+        float: число
+
+    Исключения:
+        argparse.ArgumentTypeError: если число не положительное
+    """
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError("ожидается положительное число")
+    return number
+
+
+def open_stream(stack: ExitStack, path: str, mode: str) -> TextIO:
+    """
+    Открывает файл или возвращает стандартный поток для '-'
+
+    Аргументы:
+        stack (ExitStack): стек, закрывающий открытые файлы
+        path (str): путь к файлу или '-'
+        mode (str): режим открытия
+
+    Возвращаемое значение:
+        TextIO: поток
+    """
+    if path == STANDARD_STREAM:
+        return sys.stdin if "r" in mode else sys.stdout
+    return stack.enter_context(open(path, mode, encoding="utf-8"))
+
 
 if (__name__ == "__main__"):
+    arguments = parse_arguments()
+    log_listener = create_logging(arguments, get_log_filename(arguments), logging.ERROR)
+
     tokenizer = Tokenizer()
     validator = Validator(tokenizer)
-    calculator = Calculator()
-    application = Application(validator, tokenizer, calculator)
-    application.execute()
\ No newline at end of file
+    calculator = create_calculator(arguments)
+    metrics = PipelineMetrics() if arguments.metrics else None
+    application = Application(
+        validator,
+        tokenizer,
+        calculator,
+        metrics=metrics,
+        formatter=create_formatter(arguments),
+    )
+
+    try:
+        if arguments.input is None:
+            application.execute()
+        else:
+            with ExitStack() as stack:
+                input_stream = open_stream(stack, arguments.input, "r")
+                output_stream = open_stream(stack, arguments.output, "w")
+                error_stream = None
+                if arguments.errors == SEPARATE_FILE_ERRORS:
+                    error_stream = open_stream(stack, arguments.errors_file, "w")
+                application.execute_batch(
+                    input_stream,
+                    output_stream,
+                    error_stream,
+                    arguments.workers,
+                    arguments.chunk_size,
+                )
+                if metrics is not None:
+                    metrics.dump(open_stream(stack, arguments.metrics_file, "w"))
+    finally:
+        if log_listener is not None:
+            log_listener.stop()
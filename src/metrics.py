@@ -0,0 +1,271 @@
+"""
+Модуль метрик конвейера приложения: гистограммы задержек стадий,
+количество ошибок по классам исключений и количество токенов в выражениях
+"""
+
+from typing import TextIO
+import json
+
+
+class Histogram:
+    """
+    Гистограмма неотрицательных целых значений с корзинами по степеням двойки.
+    Корзина с номером i хранит значения, длина двоичной записи которых равна i,
+    то есть значения из полуинтервала [2 ** (i - 1), 2 ** i)
+
+    Атрибуты класса:
+        BUCKETS_COUNT (int): количество корзин
+        PERCENTILES (tuple[int]): перцентили, попадающие в статистику
+
+    Атрибуты объекта:
+        buckets (list[int]): количество значений в каждой корзине
+        count (int): количество значений
+        total (int): сумма значений
+        minimum (int | None): наименьшее значение
+        maximum (int | None): наибольшее значение
+    """
+
+    BUCKETS_COUNT = 64
+    PERCENTILES = (50, 90, 99)
+
+    buckets: list[int]
+    count: int
+    total: int
+    minimum: int | None
+    maximum: int | None
+
+    def __init__(self) -> None:
+        """
+        Создание пустой гистограммы
+        """
+        self.buckets = [0] * Histogram.BUCKETS_COUNT
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value: int) -> None:
+        """
+        Добавляет значение в гистограмму
+
+        Аргументы:
+            value (int): значение
+
+        Возвращаемое значение:
+            None
+        """
+        self.buckets[min(value.bit_length(), Histogram.BUCKETS_COUNT - 1)] += 1
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: "Histogram") -> None:
+        """
+        Добавляет к гистограмме все значения другой гистограммы
+
+        Аргументы:
+            other (Histogram): гистограмма
+
+        Возвращаемое значение:
+            None
+        """
+        for index, count in enumerate(other.buckets):
+            self.buckets[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.minimum is not None:
+            self.minimum = (
+                other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+            )
+            self.maximum = (
+                other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+            )
+
+    def get_percentile(self, percent: int) -> int | None:
+        """
+        Оценивает перцентиль сверху границей корзины, в которую он попал,
+        но не больше наибольшего значения
+
+        Аргументы:
+            percent (int): перцентиль от 1 до 100
+
+        Возвращаемое значение:
+            int | None: оценка перцентиля или None для пустой гистограммы
+        """
+        if self.count == 0:
+            return None
+
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(2**index - 1, self.maximum)
+
+    def get_statistics(self) -> dict:
+        """
+        Возвращает сводку гистограммы
+
+        Возвращаемое значение:
+            dict: количество, сумма, среднее, минимум, максимум, перцентили
+            и непустые корзины вида {"le": верхняя граница, "count": количество}
+        """
+        statistics = {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.minimum,
+            "max": self.maximum,
+        }
+        for percent in Histogram.PERCENTILES:
+            statistics[f"p{percent}"] = self.get_percentile(percent)
+        statistics["buckets"] = [
+            {"le": 2**index - 1, "count": count}
+            for index, count in enumerate(self.buckets)
+            if count
+        ]
+        return statistics
+
+
+class PipelineMetrics:
+    """
+    Метрики конвейера приложения. Задержки стадий хранятся в наносекундах
+
+    Атрибуты класса:
+        VALIDATION, TOKENIZATION, EVALUATION, OUTPUT (str): стадии конвейера
+        STAGES (tuple[str]): все стадии
+        COMPUTE_STAGES (tuple[str]): стадии вычисления выражения в порядке
+            выполнения: проверка символов, токенизация, проверка токенов, вычисление
+
+    Атрибуты объекта:
+        stages (dict[str, Histogram]): гистограммы задержек по стадиям
+        tokens (Histogram): гистограмма количества токенов в выражении
+        errors (dict[str, int]): количество ошибок по классам исключений
+    """
+
+    VALIDATION = "validation"
+    TOKENIZATION = "tokenization"
+    EVALUATION = "evaluation"
+    OUTPUT = "output"
+    STAGES = (VALIDATION, TOKENIZATION, EVALUATION, OUTPUT)
+    COMPUTE_STAGES = (VALIDATION, TOKENIZATION, VALIDATION, EVALUATION)
+
+    stages: dict[str, Histogram]
+    tokens: Histogram
+    errors: dict[str, int]
+
+    def __init__(self) -> None:
+        """
+        Создание пустых метрик
+        """
+        self.stages = {stage: Histogram() for stage in PipelineMetrics.STAGES}
+        self.tokens = Histogram()
+        self.errors = dict()
+
+    def record_stage(self, stage: str, duration: int) -> None:
+        """
+        Записывает задержку стадии
+
+        Аргументы:
+            stage (str): одна из STAGES
+            duration (int): задержка в наносекундах
+
+        Возвращаемое значение:
+            None
+        """
+        self.stages[stage].add(duration)
+
+    def record_compute(self, marks: list[int]) -> None:
+        """
+        Записывает задержки стадий вычисления одного выражения по отметкам
+        времени, снятым до первой стадии и после каждой выполненной стадии.
+        Если стадия завершилась ошибкой, последняя отметка снята в момент
+        ошибки, а последующие стадии не записываются. Две проверки
+        валидатора складываются в одну задержку валидации
+
+        Аргументы:
+            marks (list[int]): отметки времени в наносекундах
+
+        Возвращаемое значение:
+            None
+        """
+        durations = dict()
+        for stage, start, end in zip(PipelineMetrics.COMPUTE_STAGES, marks, marks[1:]):
+            durations[stage] = durations.get(stage, 0) + end - start
+
+        for stage, duration in durations.items():
+            self.stages[stage].add(duration)
+
+    def record_tokens(self, count: int) -> None:
+        """
+        Записывает количество токенов выражения
+
+        Аргументы:
+            count (int): количество токенов
+
+        Возвращаемое значение:
+            None
+        """
+        self.tokens.add(count)
+
+    def record_error(self, exception: Exception) -> None:
+        """
+        Увеличивает счётчик ошибок класса исключения
+
+        Аргументы:
+            exception (Exception): исключение
+
+        Возвращаемое значение:
+            None
+        """
+        name = type(exception).__name__
+        self.errors[name] = self.errors.get(name, 0) + 1
+
+    def merge(self, other: "PipelineMetrics") -> None:
+        """
+        Добавляет метрики, собранные в другом месте, например в процессе пула
+
+        Аргументы:
+            other (PipelineMetrics): метрики
+
+        Возвращаемое значение:
+            None
+        """
+        for stage, histogram in other.stages.items():
+            self.stages[stage].merge(histogram)
+        self.tokens.merge(other.tokens)
+        for name, count in other.errors.items():
+            self.errors[name] = self.errors.get(name, 0) + count
+
+    def get_statistics(self) -> dict:
+        """
+        Возвращает сводку всех метрик
+
+        Возвращаемое значение:
+            dict: статистика задержек по стадиям в наносекундах, количества
+            токенов и ошибок по классам
+        """
+        return {
+            "stages_ns": {
+                stage: histogram.get_statistics()
+                for stage, histogram in self.stages.items()
+            },
+            "tokens": self.tokens.get_statistics(),
+            "errors": dict(sorted(self.errors.items())),
+        }
+
+    def dump(self, stream: TextIO) -> None:
+        """
+        Записывает сводку метрик в поток в формате JSON
+
+        Аргументы:
+            stream (TextIO): поток
+
+        Возвращаемое значение:
+            None
+        """
+        stream.write(json.dumps(self.get_statistics(), ensure_ascii=False, indent=2))
+        stream.write("\n")
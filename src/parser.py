@@ -0,0 +1,420 @@
+"""
+Модуль парсера, который один раз разбирает токены по грамматике калькулятора
+и строит скомпилированное выражение
+"""
+
+from src.tokens import Token, Number, Operator, Variable
+from src.program import Program
+from src.exception import InvalidBinaryOperatorError, TwiceNumberError
+
+
+class Parser:
+    """
+    Класс-парсер, компилирующий токены в Program по той же грамматике, что
+    и Calculator: рекурсивным спуском (parse) или без рекурсии, алгоритмом
+    сортировочной станции (parse_iterative)
+
+    Атрибуты класса:
+        PRECEDENCE (dict[str, int]): приоритеты бинарных операторов
+        UNARY_PRECEDENCE (int): приоритет унарных операторов, они применяются
+            только к ближайшему числу или скобке
+
+    Атрибуты объекта:
+        tokens (list[Token]): токены выражения
+        tokens_length (int): длина списка токенов
+        pos (int): индекс токена, который предстоит разобрать
+        instructions (list[tuple[str, object, int]]): инструкции строящейся программы
+        groups (set[int]): индексы последних инструкций выражений в скобках
+    """
+
+    PRECEDENCE = {
+        Operator.PLUS: 1,
+        Operator.MINUS: 1,
+        Operator.MULTIPLICATION: 2,
+        Operator.DIVISION: 2,
+        Operator.INTEGER_DIVISION: 2,
+        Operator.REMAINDER_DIVISION: 2,
+        Operator.POWER: 3,
+    }
+    UNARY_PRECEDENCE = 4
+
+    tokens: list[Token]
+    tokens_length: int
+    pos: int
+    instructions: list[tuple[str, object, int]]
+    groups: set[int]
+
+    def __init__(self) -> None:
+        """
+        Выполняет установку всех значений по умолчанию
+        """
+        self.tokens = None
+        self.tokens_length = 0
+        self.pos = 0
+        self.instructions = list()
+        self.groups = set()
+
+    def parse(self, tokens: list[Token]) -> Program:
+        """
+        Главная функция данного класса, компилирующая токены в программу
+
+        Аргументы:
+            tokens (list[Token]): проверенные токены арифметического выражения
+
+        Возвращаемое значение:
+            Program: скомпилированное выражение
+
+        Исключения:
+            InvalidBinaryOperatorError: если на месте операнда стоит бинарный оператор
+            TwiceNumberError: если после операнда идёт скобка без оператора
+        """
+        self.tokens = tokens
+        self.tokens_length = len(self.tokens)
+        self.pos = 0
+        self.instructions = list()
+        self.groups = set()
+
+        self._expr()
+        if self._has_next():
+            raise TwiceNumberError(self.tokens, self.pos)
+
+        return Program(self.tokens, self.instructions, self.groups)
+
+    def parse_iterative(self, tokens: list[Token]) -> Program:
+        """
+        Функция, компилирующая токены в ту же программу, что и parse, но с явным
+        стеком операторов вместо рекурсии, поэтому глубина вложенности скобок
+        ограничена только памятью. Бинарная операция попадает в программу
+        в момент, когда её вытесняет следующий токен, то есть с той же
+        позицией, что и при рекурсивном спуске. Валидатор пропускает
+        некоторые выражения, в которых оператору не хватает операнда,
+        например "8(-2)" или "(//3)", поэтому парсер отслеживает, ожидается
+        ли операнд, и выбрасывает те же ошибки, что и рекурсивный спуск
+
+        Аргументы:
+            tokens (list[Token]): проверенные токены арифметического выражения
+
+        Возвращаемое значение:
+            Program: скомпилированное выражение
+
+        Исключения:
+            InvalidBinaryOperatorError: если на месте операнда стоит бинарный оператор
+            TwiceNumberError: если после операнда идёт скобка без оператора
+        """
+        self.tokens = tokens
+        self.tokens_length = len(self.tokens)
+        self.pos = 0
+        self.instructions = list()
+        self.groups = set()
+
+        operators = list()
+        operand_starts = list()
+        is_operand_expected = True
+
+        for index, token in enumerate(self.tokens):
+            value = token.get_token()
+
+            if isinstance(token, (Number, Variable)):
+                if not is_operand_expected:
+                    raise TwiceNumberError(self.tokens, index)
+                operand_starts.append(len(self.instructions))
+                self.pos = index + 1
+                self._primary_operand(token)
+                is_operand_expected = False
+
+            elif value is Operator.LEFT_BRACKET:
+                if not is_operand_expected:
+                    raise TwiceNumberError(self.tokens, index)
+                operators.append((token, 0))
+
+            elif value is Operator.RIGHT_BRACKET:
+                if is_operand_expected:
+                    raise InvalidBinaryOperatorError(self.tokens, index)
+                while operators[-1][0].get_token() is not Operator.LEFT_BRACKET:
+                    self._emit_operator(operators.pop(), operand_starts, index)
+                operators.pop()
+                self.groups.add(len(self.instructions) - 1)
+                is_operand_expected = False
+
+            elif is_operand_expected:
+                if value is not Operator.PLUS and value is not Operator.MINUS:
+                    raise InvalidBinaryOperatorError(self.tokens, index)
+                operators.append((token, Parser.UNARY_PRECEDENCE))
+
+            else:
+                precedence = Parser.PRECEDENCE[value]
+
+                while operators and self._is_popped_by(operators[-1], precedence):
+                    self._emit_operator(operators.pop(), operand_starts, index)
+
+                operators.append((token, precedence))
+                is_operand_expected = True
+
+        if is_operand_expected:
+            raise InvalidBinaryOperatorError(self.tokens, self.tokens_length - 1)
+
+        while operators:
+            self._emit_operator(operators.pop(), operand_starts, self.tokens_length)
+
+        return Program(self.tokens, self.instructions, self.groups)
+
+    def _is_popped_by(self, operator: tuple[Token, int], precedence: int) -> bool:
+        """
+        Вспомогательная функция, определяющая, должен ли оператор с вершины стека
+        быть применён до бинарного оператора с заданным приоритетом.
+        Возведение в степень правоассоциативно, поэтому не вытесняет само себя
+
+        Аргументы:
+            operator (tuple[Token, int]): оператор с вершины стека и его приоритет
+            precedence (int): приоритет нового бинарного оператора
+
+        Возвращаемое значение:
+            bool
+        """
+        token, top_precedence = operator
+
+        if token.get_token() is Operator.LEFT_BRACKET:
+            return False
+        if top_precedence == precedence:
+            return token.get_token() is not Operator.POWER
+        return top_precedence > precedence
+
+    def _emit_operator(
+        self, operator: tuple[Token, int], operand_starts: list[int], position: int
+    ) -> None:
+        """
+        Вспомогательная функция, добавляющая в программу оператор, снятый со стека
+
+        Аргументы:
+            operator (tuple[Token, int]): оператор и его приоритет
+            operand_starts (list[int]): индексы первых инструкций операндов на стеке
+            position (int): количество прочитанных токенов
+
+        Возвращаемое значение:
+            None
+        """
+        token, precedence = operator
+        self.pos = position
+
+        if precedence == Parser.UNARY_PRECEDENCE:
+            self._emit_unary(token, operand_starts[-1])
+        else:
+            self._emit_binary(token, operand_starts.pop())
+
+    def _current_token(self) -> Token:
+        """
+        Вспомогательная функция, которая возвращает токен на текущей позиции
+
+        Возвращаемое значение:
+            Token: токен на текующей позиции
+
+        Исключения
+            IndexError: вызывается при выходе за границы списка токенов
+        """
+        if self.pos < self.tokens_length:
+            return self.tokens[self.pos]
+        raise IndexError("Выход за пределы списка токенов")
+
+    def _has_next(self) -> bool:
+        """
+        Вспомогательная функция, проверяющая наличия индекс в границах списка
+
+        Возвращаемое значение:
+            bool
+        """
+        return self.pos < self.tokens_length
+
+    def _emit_binary(self, operator: Operator, right_start: int) -> None:
+        """
+        Вспомогательная функция, добавляющая в программу бинарную операцию
+        с текущей позицией разбора. Если левый операнд % - возведение
+        в степень, оно откладывается до вычисления остатка
+
+        Аргументы:
+            operator (Operator): оператор
+            right_start (int): индекс первой инструкции правого операнда
+
+        Возвращаемое значение:
+            None
+        """
+        if operator.get_token() is Operator.REMAINDER_DIVISION:
+            self._defer_power(right_start - 1)
+
+        self.instructions.append((Program.BINARY, operator, self.pos))
+
+    def _defer_power(self, index: int) -> None:
+        """
+        Вспомогательная функция, заменяющая возведение в степень
+        отложенным, если инструкция с индексом index - возведение в степень
+
+        Аргументы:
+            index (int): индекс последней инструкции левого операнда %
+
+        Возвращаемое значение:
+            None
+        """
+        operation, argument, position = self.instructions[index]
+
+        if operation is Program.BINARY and argument.get_token() is Operator.POWER:
+            self.instructions[index] = (Program.DEFERRED_POWER, argument, position)
+
+    def _emit_unary(self, operator: Operator, operand_start: int) -> None:
+        """
+        Вспомогательная функция, добавляющая в программу унарную операцию.
+        Унарный оператор, применённый непосредственно к числу, сворачивается
+        в само число
+
+        Аргументы:
+            operator (Operator): оператор
+            operand_start (int): индекс первой инструкции операнда
+
+        Возвращаемое значение:
+            None
+        """
+        is_literal = len(self.instructions) == operand_start + 1 and (
+            self.instructions[operand_start][0] is Program.PUSH
+        )
+
+        if is_literal:
+            _, value, position = self.instructions[operand_start]
+            value = +value if operator.get_token() is Operator.PLUS else -value
+            self.instructions[operand_start] = (Program.PUSH, value, position)
+        else:
+            self.instructions.append((Program.UNARY, operator, self.pos))
+
+    def _expr(self) -> None:
+        """
+        Функция, которая задаёт начало грамматики
+
+        Возвращаемое значение:
+            None
+        """
+        self._add()
+
+    def _add(self) -> None:
+        """
+        Функция, разбирающая сложение\вычитание членов выражения
+
+        Возвращаемое значение:
+            None
+        """
+        self._mul()
+
+        while (
+            self._has_next()
+            and (token := self._current_token())
+            and (token.get_token() in (Operator.PLUS, Operator.MINUS))
+        ):
+            self.pos += 1
+            right_start = len(self.instructions)
+            self._mul()
+            self._emit_binary(token, right_start)
+
+    def _mul(self) -> None:
+        """
+        Функция, разбирающая умножение, деление, целочисленное деление
+        и получение остатка от деления членов выражения
+
+        Возвращаемое значение:
+            None
+        """
+        self._pow()
+
+        while self._has_next() and self._current_token().get_token() in (
+            Operator.MULTIPLICATION,
+            Operator.DIVISION,
+            Operator.INTEGER_DIVISION,
+            Operator.REMAINDER_DIVISION,
+        ):
+            token = self._current_token()
+            self.pos += 1
+            right_start = len(self.instructions)
+            self._pow()
+            self._emit_binary(token, right_start)
+
+    def _pow(self) -> None:
+        """
+        Функция, разбирающая правоассоциативное возведение в степень
+
+        Возвращаемое значение:
+            None
+        """
+        self._unary()
+
+        while (
+            self._has_next()
+            and (token := self._current_token())
+            and (token.get_token() is Operator.POWER)
+        ):
+            self.pos += 1
+            right_start = len(self.instructions)
+            self._pow()
+            self._emit_binary(token, right_start)
+
+    def _unary(self) -> None:
+        """
+        Функция, разбирающая унарные операторы
+
+        Возвращаемое значение:
+            None
+        """
+        token = self._current_token()
+
+        if token.get_token() in (Operator.PLUS, Operator.MINUS):
+            self.pos += 1
+            start = len(self.instructions)
+            self._unary()
+            self._emit_unary(token, start)
+
+        else:
+            self._primary()
+
+    def _primary(self) -> None:
+        """
+        Функция, разбирающая число, переменную или более глубокое выражение в скобках
+
+        Возвращаемое значение:
+            None
+
+        Исключения:
+            InvalidBinaryOperatorError: если на месте операнда стоит бинарный оператор
+            TwiceNumberError: если после операнда в скобках нет оператора
+        """
+        if not self._has_next():
+            raise InvalidBinaryOperatorError(self.tokens, self.tokens_length - 1)
+
+        token = self._current_token()
+        self.pos += 1
+
+        if isinstance(token, (Number, Variable)):
+            self._primary_operand(token)
+
+        elif token.get_token() is Operator.LEFT_BRACKET:
+            self._expr()
+            if self._current_token().get_token() is not Operator.RIGHT_BRACKET:
+                raise TwiceNumberError(self.tokens, self.pos)
+            self.groups.add(len(self.instructions) - 1)
+            self.pos += 1
+
+        else:
+            raise InvalidBinaryOperatorError(self.tokens, self.pos - 1)
+
+    def _primary_operand(self, token: Number | Variable) -> None:
+        """
+        Вспомогательная функция, добавляющая в программу число или переменную
+
+        Аргументы:
+            token (Number | Variable): токен-число или токен-переменная
+
+        Возвращаемое значение:
+            None
+        """
+        if isinstance(token, Variable):
+            self.instructions.append((Program.VARIABLE, token.get_token(), self.pos))
+            return
+
+        if token.is_float():
+            value = float(token.get_token())
+        else:
+            value = int(token.get_token())
+        self.instructions.append((Program.PUSH, value, self.pos))
@@ -0,0 +1,70 @@
+"""
+Модуль скомпилированного выражения
+"""
+
+from src.tokens import Token
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.subexpression import SubexpressionPlan
+
+
+class Program:
+    """
+    Скомпилированное выражение: плоский список инструкций в обратной польской
+    записи, который можно вычислять многократно без повторного разбора грамматики
+
+    Атрибуты класса:
+        PUSH (str): положить число на стек, аргумент - само число
+        VARIABLE (str): положить на стек значение переменной, аргумент - имя переменной
+        UNARY (str): применить унарный оператор к вершине стека, аргумент - Operator
+        BINARY (str): применить бинарный оператор к двум верхним значениям, аргумент - Operator
+        DEFERRED_POWER (str): заменить два верхних значения отложенным возведением
+            в степень, аргумент - Operator. Следующая за ним операция % над целыми
+            числами вычисляется как pow(a, b, m) без построения a ** b
+
+    Атрибуты объекта:
+        tokens (list[Token]): токены исходного выражения
+        instructions (list[tuple[str, object, int]]): инструкции вида
+            (код операции, аргумент, позиция). Позиция - количество токенов,
+            прочитанных рекурсивным спуском к моменту выполнения операции
+        groups (set[int]): индексы последних инструкций выражений в скобках
+        subexpression_plan (SubexpressionPlan | None): план кэширования
+            подвыражений, который калькулятор с кэшем подвыражений строит
+            при первом вычислении программы и использует при следующих
+    """
+
+    PUSH = "push"
+    VARIABLE = "variable"
+    UNARY = "unary"
+    BINARY = "binary"
+    DEFERRED_POWER = "deferred_power"
+
+    tokens: list[Token]
+    instructions: list[tuple[str, object, int]]
+    groups: set[int]
+    subexpression_plan: "SubexpressionPlan | None"
+
+    def __init__(
+        self,
+        tokens: list[Token],
+        instructions: list[tuple[str, object, int]],
+        groups: set[int] | None = None,
+    ) -> None:
+        """
+        Инициализация программы
+        """
+        self.tokens = tokens
+        self.instructions = instructions
+        self.groups = groups if groups is not None else set()
+        self.subexpression_plan = None
+
+    def __len__(self) -> int:
+        """
+        Переопределение магического метода для получения количества инструкций
+
+        Возвращаемое значение:
+            int: количество инструкций
+        """
+        return len(self.instructions)
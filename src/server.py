@@ -0,0 +1,415 @@
+"""
+Модуль сервера вычислений: долгоживущий процесс принимает выражения
+по одному на строку через TCP-сокет или Unix-сокет и отвечает на каждую
+строку одной строкой JSON, используя один и тот же конвейер приложения
+"""
+
+from src.application import Application
+from src.tokenizer import Tokenizer
+from src.validator import Validator
+from src.calculator import Calculator
+from src.exception import ExpressionError
+from src.main import (
+    positive_integer,
+    add_budget_arguments,
+    add_offload_arguments,
+    add_output_arguments,
+    add_logging_arguments,
+    create_calculator,
+    create_logging,
+    create_formatter,
+)
+from src.client import get_default_socket_path
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import stat
+import sys
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluationServer:
+    """
+    Асинхронный сервер вычислений. Каждое соединение обслуживается своей
+    задачей asyncio, строки одного соединения вычисляются и получают ответы
+    строго по порядку, поэтому клиент может отправлять запросы, не дожидаясь
+    ответов на предыдущие. Ответ - объект JSON в одну строку:
+    {"result": значение} или {"error": класс ошибки, "position": позиция
+    ошибки или null, "message": сообщение}. Пустой строке соответствует
+    {"result": null}. Результат - число в полной десятичной записи или
+    строка, если форматирование приложения выводит его в другом виде.
+    Выражения, которые SupervisedCalculator отправляет в процесс вычислений,
+    ожидаются без остановки цикла событий, поэтому дорогое выражение
+    одного клиента не задерживает ответы другим
+
+    Атрибуты класса:
+        FAIRNESS_BATCH (int): количество строк, после которого соединение
+            уступает цикл событий другим соединениям
+
+    Атрибуты объекта:
+        application (Application): приложение, вычисляющее выражения
+        max_line_length (int): максимальная длина строки запроса в байтах
+    """
+
+    FAIRNESS_BATCH = 64
+
+    application: Application
+    max_line_length: int
+
+    def __init__(self, application: Application, max_line_length: int = 2**20) -> None:
+        """
+        Внедрение приложения и установка ограничения длины строки
+        """
+        self.application = application
+        self.max_line_length = max_line_length
+
+    async def serve_tcp(self, host: str, port: int) -> None:
+        """
+        Функция, запускающая сервер на TCP-сокете и обслуживающая
+        соединения до отмены задачи
+
+        Аргументы:
+            host (str): адрес
+            port (int): порт
+
+        Возвращаемое значение:
+            None
+        """
+        server = await asyncio.start_server(
+            self.handle_connection, host, port, limit=self.max_line_length
+        )
+        for socket in server.sockets:
+            logger.info("Сервер вычислений слушает %s", socket.getsockname())
+
+        async with server:
+            await server.serve_forever()
+
+    async def serve_unix(self, path: str) -> None:
+        """
+        Функция, запускающая сервер на Unix-сокете и обслуживающая соединения
+        до отмены задачи. Отсутствующий каталог сокета создаётся доступным
+        только владельцу, оставшийся от прошлого запуска файл сокета
+        удаляется, созданный сокет доступен только владельцу и удаляется
+        при остановке
+
+        Аргументы:
+            path (str): путь к сокету
+
+        Возвращаемое значение:
+            None
+
+        Исключения:
+            PermissionError: если каталог сокета могут изменять другие
+                пользователи или файл сокета принадлежит другому пользователю
+        """
+        self._prepare_socket_path(path)
+
+        server = await asyncio.start_unix_server(
+            self.handle_connection, path, limit=self.max_line_length
+        )
+        os.chmod(path, 0o600)
+        logger.info("Сервер вычислений слушает %s", path)
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def _prepare_socket_path(self, path: str) -> None:
+        """
+        Вспомогательная функция, проверяющая путь к Unix-сокету. Каталог должен
+        принадлежать текущему пользователю или root, а если в него могут писать
+        другие пользователи, как в /tmp, на нём должен стоять sticky-бит,
+        запрещающий удалять и подменять чужие файлы. Чужой файл по этому пути
+        не удаляется
+
+        Аргументы:
+            path (str): путь к сокету
+
+        Возвращаемое значение:
+            None
+
+        Исключения:
+            PermissionError: если путь небезопасен
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        status = os.stat(directory)
+        is_shared = status.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+        if status.st_uid not in (os.getuid(), 0) or (
+            is_shared and not status.st_mode & stat.S_ISVTX
+        ):
+            raise PermissionError(
+                f"Каталог сокета {directory} могут изменять другие пользователи"
+            )
+
+        if not os.path.lexists(path):
+            return
+
+        status = os.lstat(path)
+        if status.st_uid != os.getuid():
+            raise PermissionError(f"Файл {path} принадлежит другому пользователю")
+        if stat.S_ISSOCK(status.st_mode):
+            os.unlink(path)
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Функция, обслуживающая одно соединение: читает строки до конца потока
+        и пишет ответ на каждую. Строка длиннее max_line_length получает
+        ответ с ошибкой, после чего соединение закрывается
+
+        Аргументы:
+            reader (asyncio.StreamReader): входной поток соединения
+            writer (asyncio.StreamWriter): выходной поток соединения
+
+        Возвращаемое значение:
+            None
+        """
+        processed = 0
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(self._encode_error("LineTooLong", None, "Слишком длинная строка"))
+                    await writer.drain()
+                    break
+
+                if not line:
+                    break
+
+                writer.write(await self.respond_async(line))
+                await writer.drain()
+
+                processed += 1
+                if processed % EvaluationServer.FAIRNESS_BATCH == 0:
+                    await asyncio.sleep(0)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def respond_async(self, line: bytes) -> bytes:
+        """
+        Функция, вычисляющая выражение из строки запроса через
+        Application.process_async и формирующая ответ: пока выражение
+        вычисляется в процессе вычислений SupervisedCalculator, цикл событий
+        обслуживает другие соединения
+
+        Аргументы:
+            line (bytes): строка запроса
+
+        Возвращаемое значение:
+            bytes: строка ответа, оканчивающаяся переводом строки
+        """
+        expression = self._decode(line)
+
+        if expression is None:
+            return self._encode({"result": None})
+
+        try:
+            _, result = await self.application.process_async(expression)
+        except Exception as exception:
+            return self._respond_error(expression, exception)
+
+        return self._encode_result(result)
+
+    def _decode(self, line: bytes) -> str | None:
+        """
+        Вспомогательная функция, извлекающая выражение из строки запроса
+
+        Аргументы:
+            line (bytes): строка запроса
+
+        Возвращаемое значение:
+            str | None: выражение или None для пустой строки
+        """
+        expression = line.decode("utf-8", errors="replace").rstrip("\r\n")
+
+        if expression.isspace() or expression == "":
+            return None
+        return expression
+
+    def _respond_error(self, expression: str, exception: Exception) -> bytes:
+        """
+        Вспомогательная функция, формирующая ответ с ошибкой вычисления.
+        Ошибка выражения записывается в журнал через Application.log_error
+        с классом ошибки, позицией и хэшем выражения, поэтому к ней
+        применяются --log-json и --log-rate-limit. Ошибка, не входящая
+        в EVALUATION_ERRORS, записывается в журнал вместе с трассировкой
+
+        Аргументы:
+            expression (str): выражение
+            exception (Exception): исключение
+
+        Возвращаемое значение:
+            bytes: строка ответа
+        """
+        if not isinstance(exception, Application.EVALUATION_ERRORS):
+            logger.error(
+                "Непредвиденная ошибка при вычислении выражения", exc_info=exception
+            )
+            return self._encode_error(type(exception).__name__, None, str(exception))
+
+        self.application.log_error(expression, exception)
+
+        position = None
+        if isinstance(exception, ExpressionError):
+            position = exception.invalid_position
+        return self._encode_error(
+            type(exception).__name__,
+            position,
+            self.application.format_error_line(exception),
+        )
+
+    def _encode_result(self, result: int | float) -> bytes:
+        """
+        Вспомогательная функция, формирующая ответ с результатом. Десятичная
+        запись целого числа вставляется в ответ напрямую, так как модуль json
+        не переводит в строку целые длиннее sys.get_int_max_str_digits() цифр
+
+        Аргументы:
+            result (int | float): результат
+
+        Возвращаемое значение:
+            bytes: строка ответа
+        """
+        formatter = self.application.formatter
+
+        if not formatter.is_number():
+            return self._encode({"result": formatter.format(result)})
+
+        if isinstance(result, int):
+            return f'{{"result": {formatter.format(result)}}}\n'.encode()
+
+        return self._encode({"result": result})
+
+    def _encode_error(self, name: str, position: int | None, message: str) -> bytes:
+        """
+        Вспомогательная функция, формирующая ответ с ошибкой
+
+        Аргументы:
+            name (str): класс ошибки
+            position (int | None): позиция ошибки
+            message (str): сообщение
+
+        Возвращаемое значение:
+            bytes: строка ответа
+        """
+        return self._encode({"error": name, "position": position, "message": message})
+
+    def _encode(self, response: dict) -> bytes:
+        """
+        Вспомогательная функция, кодирующая ответ в строку JSON
+
+        Аргументы:
+            response (dict): ответ
+
+        Возвращаемое значение:
+            bytes: строка ответа, оканчивающаяся переводом строки
+        """
+        return (json.dumps(response, ensure_ascii=False) + "\n").encode()
+
+
+def stop(signal_number: int, frame: object) -> None:
+    """
+    Обработчик SIGTERM: останавливает сервер так же, как Ctrl+C,
+    чтобы файл Unix-сокета был удалён
+
+    Аргументы:
+        signal_number (int): номер сигнала
+        frame (object): текущий кадр стека
+
+    Возвращаемое значение:
+        None
+    """
+    raise KeyboardInterrupt
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Разбирает аргументы командной строки сервера
+
+    Возвращаемое значение:
+        argparse.Namespace: аргументы
+    """
+    parser = argparse.ArgumentParser(prog="python -m src.server")
+    parser.add_argument("--host", default="127.0.0.1", help="адрес сервера")
+    parser.add_argument("--port", type=int, default=8765, help="порт сервера")
+    parser.add_argument(
+        "--unix",
+        metavar="PATH",
+        nargs="?",
+        const=get_default_socket_path(),
+        help="слушать Unix-сокет вместо TCP, по умолчанию путь из переменной "
+        "окружения CALCULATOR_SOCKET, $XDG_RUNTIME_DIR/calculator.sock "
+        "или /tmp/calculator-UID/calculator.sock",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=(Calculator.RECURSIVE_ENGINE, Calculator.STACK_ENGINE),
+        default=Calculator.RECURSIVE_ENGINE,
+        help="движок вычислений: рекурсивный спуск или стековый без рекурсии",
+    )
+    parser.add_argument(
+        "--subexpression-cache",
+        metavar="ENTRIES",
+        type=positive_integer,
+        help="кэшировать результаты выражений в скобках и возведений в степень, "
+        "храня не больше ENTRIES записей",
+    )
+    add_budget_arguments(parser)
+    add_offload_arguments(parser)
+    add_output_arguments(parser)
+    add_logging_arguments(parser)
+    parser.add_argument(
+        "--max-line-length",
+        metavar="BYTES",
+        type=positive_integer,
+        default=2**20,
+        help="максимальная длина строки запроса",
+    )
+    return parser.parse_args()
+
+
+if (__name__ == "__main__"):
+    arguments = parse_arguments()
+
+    log_listener = create_logging(arguments, None, logging.INFO)
+
+    tokenizer = Tokenizer()
+    validator = Validator(tokenizer)
+    calculator = create_calculator(arguments)
+    application = Application(
+        validator, tokenizer, calculator, formatter=create_formatter(arguments)
+    )
+    server = EvaluationServer(application, arguments.max_line_length)
+
+    if arguments.unix is None:
+        serve = server.serve_tcp(arguments.host, arguments.port)
+    else:
+        serve = server.serve_unix(arguments.unix)
+
+    signal.signal(signal.SIGTERM, stop)
+
+    try:
+        asyncio.run(serve)
+    except KeyboardInterrupt:
+        pass
+    except PermissionError as error:
+        logger.error("%s", error)
+        sys.exit(1)
+    finally:
+        if log_listener is not None:
+            log_listener.stop()
@@ -0,0 +1,136 @@
+"""
+Модуль канонических ключей подвыражений скомпилированной программы
+для кэширования их результатов между выражениями
+"""
+
+from src.tokens import Operator
+from src.program import Program
+
+import hashlib
+
+
+class SubexpressionPlan:
+    """
+    План кэширования подвыражений программы. Каждое поддерево программы
+    получает дерево-хэш (хэш Меркла) из хэшей своих операндов, поэтому
+    одинаковые поддеревья разных выражений получают одинаковые ключи.
+    Операнды коммутативных + и * упорядочиваются, так что a + b и b + a
+    имеют один ключ. Кэшируются выражения в скобках и возведения в степень,
+    кроме отдельных чисел и поддеревьев с переменными, значения которых
+    не известны заранее
+
+    Атрибуты класса:
+        DIGEST_SIZE (int): длина ключа в байтах
+        COMMUTATIVE_OPERATORS (tuple[str]): операторы, операнды которых упорядочиваются
+
+    Атрибуты объекта:
+        starts (dict[int, list[tuple[int, bytes]]]): по индексу первой инструкции
+            поддерева - пары (индекс последней инструкции, ключ), начиная
+            с самого внешнего поддерева
+        roots (dict[int, bytes]): ключи по индексам последних инструкций поддеревьев
+    """
+
+    DIGEST_SIZE = 16
+    COMMUTATIVE_OPERATORS = (Operator.PLUS, Operator.MULTIPLICATION)
+
+    starts: dict[int, list[tuple[int, bytes]]]
+    roots: dict[int, bytes]
+
+    def __init__(self, program: Program) -> None:
+        """
+        Построение плана одним проходом по инструкциям программы
+        """
+        self.starts = dict()
+        self.roots = dict()
+
+        # Элементы стека - (ключ поддерева или None при наличии переменных,
+        # индекс первой инструкции поддерева)
+        stack = list()
+
+        for index, (operation, argument, _) in enumerate(program.instructions):
+            if operation is Program.PUSH:
+                stack.append((self._hash_number(argument), index))
+                continue
+
+            if operation is Program.VARIABLE:
+                stack.append((None, index))
+                continue
+
+            if operation is Program.UNARY:
+                operand, start = stack.pop()
+                digest = self._hash_node(b"u", argument, (operand,))
+            else:
+                right, _ = stack.pop()
+                left, start = stack.pop()
+                operands = (left, right)
+                if argument.get_token() in SubexpressionPlan.COMMUTATIVE_OPERATORS:
+                    operands = self._sort_operands(left, right)
+                digest = self._hash_node(b"b", argument, operands)
+
+            stack.append((digest, start))
+
+            # Отложенная степень - не значение, а операнды для следующей операции %
+            is_cached = operation is not Program.DEFERRED_POWER and (
+                index in program.groups
+                or (operation is Program.BINARY and argument.get_token() is Operator.POWER)
+            )
+            if is_cached and digest is not None:
+                self.roots[index] = digest
+                self.starts.setdefault(start, list()).insert(0, (index, digest))
+
+    def _hash_number(self, value: int | float) -> bytes:
+        """
+        Вспомогательная функция, вычисляющая ключ числа с учётом его типа,
+        так как 2 и 2.0 дают разные результаты операций
+
+        Аргументы:
+            value (int | float): число
+
+        Возвращаемое значение:
+            bytes: ключ
+        """
+        text = f"{type(value).__name__}:{value!r}"
+        return hashlib.blake2b(
+            text.encode(), digest_size=SubexpressionPlan.DIGEST_SIZE
+        ).digest()
+
+    def _hash_node(
+        self, tag: bytes, operator: Operator, operands: tuple[bytes | None, ...]
+    ) -> bytes | None:
+        """
+        Вспомогательная функция, вычисляющая ключ операции по ключам операндов
+
+        Аргументы:
+            tag (bytes): вид операции: унарная или бинарная
+            operator (Operator): оператор
+            operands (tuple[bytes | None, ...]): ключи операндов
+
+        Возвращаемое значение:
+            bytes | None: ключ или None, если хотя бы у одного операнда нет ключа
+        """
+        if None in operands:
+            return None
+
+        hasher = hashlib.blake2b(tag, digest_size=SubexpressionPlan.DIGEST_SIZE)
+        hasher.update(operator.get_token().encode().ljust(2))
+        for operand in operands:
+            hasher.update(operand)
+        return hasher.digest()
+
+    def _sort_operands(
+        self, left: bytes | None, right: bytes | None
+    ) -> tuple[bytes | None, bytes | None]:
+        """
+        Вспомогательная функция, упорядочивающая ключи операндов
+        коммутативной операции
+
+        Аргументы:
+            left (bytes | None): ключ левого операнда
+            right (bytes | None): ключ правого операнда
+
+        Возвращаемое значение:
+            tuple[bytes | None, bytes | None]: ключи по возрастанию
+        """
+        if left is None or right is None or left <= right:
+            return left, right
+        return right, left
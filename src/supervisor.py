@@ -0,0 +1,446 @@
+"""
+Модуль вычисления под надзором: выражения, оценка стоимости которых
+превышает порог, вычисляются в отдельном процессе, который завершается
+принудительно, если не успел за отведённое время
+"""
+
+from src.tokens import Token, Operator
+from src.program import Program
+from src.calculator import Calculator
+from src.exception import EvaluationTimeoutError, WorkerCrashedError
+
+from multiprocessing.connection import Connection
+import asyncio
+import math
+import multiprocessing
+import sys
+import threading
+
+
+def _run_worker(connection: Connection, calculator: Calculator) -> None:
+    """
+    Главный цикл процесса вычислений: сообщает о готовности, получает пары
+    (токены, переменные) и отправляет обратно (True, результат)
+    или (False, исключение). Завершается, получив None. Передаются токены,
+    а не программа, так как коды операций программы сравниваются
+    по идентичности и не переживают копирования между процессами.
+    Токены компилируются parse_iterative и вычисляются evaluate, как
+    в текущем процессе, поэтому глубокая вложенность не выбрасывает
+    RecursionError и ошибки совпадают с ошибками текущего процесса
+
+    Аргументы:
+        connection (Connection): конец канала со стороны процесса вычислений
+        calculator (Calculator): калькулятор
+
+    Возвращаемое значение:
+        None
+    """
+    connection.send(None)
+
+    while (request := connection.recv()) is not None:
+        tokens, variables = request
+        try:
+            program = calculator.parser.parse_iterative(tokens)
+            response = True, calculator.evaluate(program, variables)
+        except Exception as exception:
+            response = False, exception
+        connection.send(response)
+
+
+class CostEstimator:
+    """
+    Оценка стоимости вычисления программы без её выполнения. Для каждого
+    значения на стеке оценивается сверху длина двоичной записи, а для чисел
+    и переменных известно и само значение. Стоимость операции над длинными
+    целыми выражается через количество пар цифр длинной арифметики, на каждую
+    из которых CPython тратит порядка наносекунды, поэтому оценка выражается
+    в условных наносекундах. Целое число длиннее допустимого количества цифр
+    вызывает DigitsOverFlow до вычисления, поэтому длина результата
+    ограничивается этим пределом
+
+    Атрибуты класса:
+        DIGIT_BITS (int): количество бит в одной цифре длинного целого
+        OPERATION_COST (int): стоимость выполнения одной инструкции
+
+    Атрибуты объекта:
+        max_bits (int): наибольшая длина двоичной записи целого результата,
+            не вызывающего DigitsOverFlow
+    """
+
+    DIGIT_BITS = sys.int_info.bits_per_digit
+    OPERATION_COST = 1000
+
+    max_bits: int
+
+    def __init__(self, max_digits: int = Calculator.MAX_INTEGER_COUNT_DIGITS) -> None:
+        """
+        Вычисление наибольшей длины целого результата по ограничению
+        количества цифр калькулятора
+        """
+        self.max_bits = int(max_digits / Calculator.LOG10_2) + 1
+
+    def estimate(
+        self, program: Program, variables: dict[str, int | float] | None = None
+    ) -> int | float:
+        """
+        Функция, оценивающая стоимость вычисления программы
+
+        Аргументы:
+            program (Program): выражение, скомпилированное Parser
+            variables (dict[str, int | float] | None): значения переменных
+
+        Возвращаемое значение:
+            int | float: оценка стоимости в условных наносекундах
+        """
+        variables = variables if variables is not None else dict()
+
+        # Элементы стека - (оценка длины в битах, значение или None,
+        # длина показателя отложенной степени в битах)
+        stack = list()
+        cost = 0
+
+        for operation, argument, _ in program.instructions:
+            cost += CostEstimator.OPERATION_COST
+
+            if operation is Program.PUSH:
+                stack.append(self._get_bound(argument))
+            elif operation is Program.VARIABLE:
+                stack.append(self._get_bound(variables.get(argument, 0)))
+            elif operation is Program.UNARY:
+                bits, value, _ = stack[-1]
+                if value is not None and argument.get_token() is Operator.MINUS:
+                    value = -value
+                stack[-1] = bits, value, 0
+            else:
+                right = stack.pop()
+                bits, operation_cost = self._estimate_binary(stack[-1], right, argument)
+                exponent_bits = right[0] if operation is Program.DEFERRED_POWER else 0
+                stack[-1] = bits, None, exponent_bits
+                cost += operation_cost
+
+        return cost
+
+    def _get_bound(self, value: int | float) -> tuple[int, int | float, int]:
+        """
+        Вспомогательная функция, строящая элемент стека по известному значению
+
+        Аргументы:
+            value (int | float): значение
+
+        Возвращаемое значение:
+            tuple[int, int | float, int]: длина в битах (0 для вещественного
+            числа), значение и длина показателя отложенной степени
+        """
+        if isinstance(value, int):
+            return value.bit_length(), value, 0
+        return 0, value, 0
+
+    def _estimate_binary(
+        self,
+        left: tuple[int, int | float | None, int],
+        right: tuple[int, int | float | None, int],
+        operator: Operator,
+    ) -> tuple[int | float, int | float]:
+        """
+        Вспомогательная функция, оценивающая длину результата бинарной
+        операции и её стоимость
+
+        Аргументы:
+            left (tuple[int, int | float | None, int]): левый элемент стека
+            right (tuple[int, int | float | None, int]): правый элемент стека
+            operator (Operator): оператор
+
+        Возвращаемое значение:
+            tuple[int | float, int | float]: длина результата в битах и стоимость
+        """
+        bits1, _, exponent_bits = left
+        bits2, exponent, _ = right
+        digits1 = self._get_digits(bits1)
+        digits2 = self._get_digits(bits2)
+
+        match operator.get_token():
+            case Operator.PLUS | Operator.MINUS:
+                bits, cost = max(bits1, bits2) + 1, max(digits1, digits2)
+            case Operator.MULTIPLICATION:
+                bits, cost = bits1 + bits2, digits1 * digits2
+            case Operator.DIVISION:
+                bits, cost = 0, digits1 * digits2
+            case Operator.INTEGER_DIVISION:
+                bits, cost = bits1, digits1 * digits2
+            case Operator.REMAINDER_DIVISION:
+                bits, cost = bits2, digits1 * digits2
+                # Возведение в степень по модулю: на каждый бит показателя
+                # приходятся умножение и деление чисел длины модуля
+                cost += exponent_bits * 3 * digits2 * digits2
+            case Operator.POWER:
+                bits = min(
+                    self._estimate_power_bits(bits1, bits2, exponent),
+                    self.max_bits,
+                )
+                cost = self._get_digits(bits) ** 2
+
+        return min(bits, self.max_bits), cost
+
+    def _estimate_power_bits(
+        self, base_bits: int, exponent_bits: int, exponent: int | float | None
+    ) -> int | float:
+        """
+        Вспомогательная функция, оценивающая длину степени в битах. Если
+        показатель не известен, он оценивается сверху по своей длине
+
+        Аргументы:
+            base_bits (int): длина основания в битах
+            exponent_bits (int): длина показателя в битах
+            exponent (int | float | None): показатель, если он известен
+
+        Возвращаемое значение:
+            int | float: длина результата в битах
+        """
+        if base_bits <= 1:
+            return 1
+        if exponent is not None:
+            if isinstance(exponent, float) or exponent < 0:
+                return 0
+            return base_bits * exponent
+        if exponent_bits > Calculator.MAX_FLOAT_EXPONENT_BITS:
+            return math.inf
+        return base_bits * 2**exponent_bits
+
+    def _get_digits(self, bits: int | float) -> int | float:
+        """
+        Вспомогательная функция, переводящая длину в битах в количество
+        цифр длинного целого
+
+        Аргументы:
+            bits (int | float): длина в битах
+
+        Возвращаемое значение:
+            int | float: количество цифр
+        """
+        if bits == math.inf:
+            return math.inf
+        return bits // CostEstimator.DIGIT_BITS + 1
+
+
+class SupervisedCalculator:
+    """
+    Калькулятор с вычислением дорогих выражений в отдельном процессе.
+    CPython не может прервать одну операцию над длинными целыми, поэтому
+    выражение, оценка стоимости которого больше max_cost, отправляется
+    в постоянный процесс вычислений. Если ответ не получен за timeout секунд,
+    процесс завершается принудительно, выбрасывается EvaluationTimeoutError,
+    а для следующего дорогого выражения запускается новый процесс. Дешёвые
+    выражения вычисляются в текущем процессе. Метод calculate_async ждёт
+    процесс вычислений в потоке, не останавливая цикл событий asyncio
+
+    Атрибуты класса:
+        START_METHOD (str): способ запуска процесса вычислений
+
+    Атрибуты объекта:
+        calculator (Calculator): калькулятор, которым вычисляются выражения
+            в обоих процессах
+        estimator (CostEstimator): оценка стоимости выражений
+        max_cost (int | float): наибольшая стоимость выражения, вычисляемого
+            в текущем процессе
+        timeout (float): время, отведённое процессу вычислений на одно выражение
+        worker (multiprocessing.Process | None): процесс вычислений
+        connection (Connection | None): конец канала со стороны текущего процесса
+        lock (threading.Lock): блокировка, под которой процессу вычислений
+            передаётся одно выражение за раз
+    """
+
+    START_METHOD = "forkserver"
+
+    calculator: Calculator
+    estimator: CostEstimator
+    max_cost: int | float
+    timeout: float
+    worker: multiprocessing.Process | None
+    connection: Connection | None
+    lock: threading.Lock
+
+    def __init__(
+        self, calculator: Calculator, max_cost: int | float, timeout: float
+    ) -> None:
+        """
+        Внедрение калькулятора и установка порога стоимости и времени ожидания.
+        Процесс вычислений запускается при первом дорогом выражении
+        """
+        self.calculator = calculator
+        self.estimator = CostEstimator(calculator.max_digits)
+        self.max_cost = max_cost
+        self.timeout = timeout
+        self.worker = None
+        self.connection = None
+        self.lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        """
+        Копия для передачи в другой процесс не наследует процесс вычислений
+        """
+        state = self.__dict__.copy()
+        state["worker"] = None
+        state["connection"] = None
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Восстановление копии с новой блокировкой
+        """
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def calculate(
+        self,
+        tokens: list[Token],
+        variables: dict[str, int | float] | None = None,
+    ) -> int | float:
+        """
+        Функция, компилирующая выражение, оценивающая его стоимость
+        и вычисляющая его в текущем процессе или в процессе вычислений
+
+        Аргументы:
+            tokens (list[Token]): токены арифметического выражения
+            variables (dict[str, int | float] | None): значения переменных
+
+        Возвращаемое значение:
+            int | float: результат расчётов
+
+        Исключения:
+            EvaluationTimeoutError: если процесс вычислений не успел за timeout
+            WorkerCrashedError: если процесс вычислений завершился аварийно
+        """
+        program = self.calculator.parser.parse_iterative(tokens)
+
+        if self.estimator.estimate(program, variables) <= self.max_cost:
+            return self.calculator.evaluate(program, variables)
+
+        return self._evaluate_supervised(program, variables)
+
+    async def calculate_async(
+        self,
+        tokens: list[Token],
+        variables: dict[str, int | float] | None = None,
+    ) -> int | float:
+        """
+        Функция, вычисляющая выражение так же, как calculate, но ожидающая
+        процесс вычислений в потоке исполнителя по умолчанию. Дешёвые
+        выражения вычисляются сразу, поэтому калькулятор используется
+        только из потока цикла событий
+
+        Аргументы:
+            tokens (list[Token]): токены арифметического выражения
+            variables (dict[str, int | float] | None): значения переменных
+
+        Возвращаемое значение:
+            int | float: результат расчётов
+
+        Исключения:
+            EvaluationTimeoutError: если процесс вычислений не успел за timeout
+            WorkerCrashedError: если процесс вычислений завершился аварийно
+        """
+        program = self.calculator.parser.parse_iterative(tokens)
+
+        if self.estimator.estimate(program, variables) <= self.max_cost:
+            return self.calculator.evaluate(program, variables)
+
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._evaluate_supervised, program, variables
+        )
+
+    def close(self) -> None:
+        """
+        Функция, завершающая процесс вычислений
+
+        Возвращаемое значение:
+            None
+        """
+        if self.worker is None:
+            return
+
+        if self.worker.is_alive():
+            try:
+                self.connection.send(None)
+            except OSError:
+                pass
+            self.worker.join(self.timeout)
+
+        self._stop_worker()
+
+    def _evaluate_supervised(
+        self, program: Program, variables: dict[str, int | float] | None
+    ) -> int | float:
+        """
+        Вспомогательная функция, вычисляющая программу в процессе вычислений.
+        Исключение, выброшенное при вычислении, выбрасывается повторно.
+        Выражения из разных потоков передаются процессу по очереди
+
+        Аргументы:
+            program (Program): выражение, скомпилированное Parser
+            variables (dict[str, int | float] | None): значения переменных
+
+        Возвращаемое значение:
+            int | float: результат расчётов
+
+        Исключения:
+            EvaluationTimeoutError: если процесс вычислений не успел за timeout
+            WorkerCrashedError: если процесс вычислений завершился аварийно
+        """
+        log = "".join(token.get_token() for token in program.tokens)
+
+        with self.lock:
+            try:
+                if self.worker is None or not self.worker.is_alive():
+                    self._start_worker()
+
+                self.connection.send((program.tokens, variables))
+
+                if not self.connection.poll(self.timeout):
+                    self._stop_worker()
+                    raise EvaluationTimeoutError(log)
+
+                success, value = self.connection.recv()
+            except (EOFError, BrokenPipeError):
+                self._stop_worker()
+                raise WorkerCrashedError(log) from None
+
+        if success:
+            return value
+        raise value
+
+    def _start_worker(self) -> None:
+        """
+        Вспомогательная функция, запускающая процесс вычислений и ожидающая
+        его готовности, чтобы запуск не входил во время ожидания выражения.
+        Процесс создаётся через forkserver, а не копированием текущего
+        процесса: копия многопоточного процесса наследует блокировки,
+        захваченные другими потоками, например потоком журнала
+
+        Возвращаемое значение:
+            None
+        """
+        self._stop_worker()
+        context = multiprocessing.get_context(SupervisedCalculator.START_METHOD)
+        self.connection, worker_connection = context.Pipe()
+        self.worker = context.Process(
+            target=_run_worker, args=(worker_connection, self.calculator), daemon=True
+        )
+        self.worker.start()
+        worker_connection.close()
+        self.connection.recv()
+
+    def _stop_worker(self) -> None:
+        """
+        Вспомогательная функция, принудительно завершающая процесс вычислений
+
+        Возвращаемое значение:
+            None
+        """
+        if self.worker is not None:
+            self.worker.kill()
+            self.worker.join()
+            self.worker = None
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
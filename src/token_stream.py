@@ -0,0 +1,154 @@
+"""
+Модуль компактного представления токенов
+"""
+
+from src.tokens import Token, Number, Operator, Variable, OPERATORS
+
+from array import array
+from collections.abc import Iterator
+
+
+class TokenStream:
+    """
+    Компактный поток токенов: вместо списка объектов хранит три параллельных
+    массива - вид токена (1 байт) и границы токена в исходной строке (по 4 байта
+    для выражений короче 4 ГиБ). Числа вырезаются
+    из строки только при обращении к ним, операторы возвращаются единственными
+    экземплярами из OPERATORS. Последнее созданное число или переменная
+    запоминается, поэтому повторные обращения калькулятора к токену текущей
+    позиции не создают объект заново. Поток ведёт себя как последовательность
+    токенов, поэтому валидатор, парсер и калькулятор принимают его вместо списка
+
+    Атрибуты класса:
+        INTEGER (int): вид целого числа
+        FLOAT (int): вид числа с плавающей точкой
+        VARIABLE (int): вид переменной
+        OPERATOR_KINDS (dict[str, int]): виды операторов
+        KIND_OPERATORS (dict[int, Operator]): операторы по видам
+        MAX_SHORT_SOURCE (int): длина выражения, до которой границы токенов
+            хранятся 4-байтовыми числами
+
+    Атрибуты объекта:
+        source (str): исходное выражение
+        kinds (array): виды токенов
+        starts (array): индексы начала токенов в source
+        ends (array): индексы конца токенов в source
+        last_index (int | None): индекс последнего созданного числа или переменной
+        last_token (Token | None): последнее созданное число или переменная
+    """
+
+    INTEGER = 0
+    FLOAT = 1
+    VARIABLE = 2
+    OPERATOR_KINDS = {operator: kind for kind, operator in enumerate(OPERATORS, 3)}
+    KIND_OPERATORS = {kind: OPERATORS[operator] for operator, kind in OPERATOR_KINDS.items()}
+    MAX_SHORT_SOURCE = 2**32
+
+    source: str
+    kinds: array
+    starts: array
+    ends: array
+    last_index: int | None
+    last_token: Token | None
+
+    def __init__(self, source: str) -> None:
+        """
+        Создание пустого потока для выражения source
+        """
+        offset_type = "I" if len(source) < TokenStream.MAX_SHORT_SOURCE else "Q"
+
+        self.source = source
+        self.kinds = array("B")
+        self.starts = array(offset_type)
+        self.ends = array(offset_type)
+        self.last_index = None
+        self.last_token = None
+
+    def __len__(self) -> int:
+        """
+        Переопределение магического метода для получения количества токенов
+
+        Возвращаемое значение:
+            int: количество токенов
+        """
+        return len(self.kinds)
+
+    def __getitem__(self, index: int) -> Token:
+        """
+        Переопределение магического метода для получения токена по индексу.
+        Объект числа или переменной создаётся заново, только если индекс
+        отличается от индекса предыдущего созданного токена
+
+        Аргументы:
+            index (int): индекс токена
+
+        Возвращаемое значение:
+            Token: токен
+
+        Исключения:
+            IndexError: при выходе за границы потока
+        """
+        kind = self.kinds[index]
+
+        if kind > TokenStream.VARIABLE:
+            return TokenStream.KIND_OPERATORS[kind]
+
+        if index < 0:
+            index += len(self.kinds)
+        if index == self.last_index:
+            return self.last_token
+
+        if kind == TokenStream.VARIABLE:
+            token = Variable(self.get_text(index))
+        else:
+            token = Number(self.get_text(index), kind == TokenStream.INTEGER)
+
+        self.last_index = index
+        self.last_token = token
+        return token
+
+    def __iter__(self) -> Iterator[Token]:
+        """
+        Переопределение магического метода для перебора токенов
+
+        Возвращаемое значение:
+            Iterator[Token]: токены по порядку
+        """
+        for index in range(len(self.kinds)):
+            yield self[index]
+
+    def get_text(self, index: int) -> str:
+        """
+        Функция, возвращающая текст токена без создания объекта токена
+
+        Аргументы:
+            index (int): индекс токена
+
+        Возвращаемое значение:
+            str: текст токена
+        """
+        return self.source[self.starts[index] : self.ends[index]]
+
+    def is_number(self, index: int) -> bool:
+        """
+        Функция, проверяющая, является ли токен числом, без создания объекта токена
+
+        Аргументы:
+            index (int): индекс токена
+
+        Возвращаемое значение:
+            bool
+        """
+        return self.kinds[index] <= TokenStream.FLOAT
+
+    def get_operator(self, index: int) -> Operator | None:
+        """
+        Функция, возвращающая оператор по индексу
+
+        Аргументы:
+            index (int): индекс токена
+
+        Возвращаемое значение:
+            Operator | None: оператор или None, если токен - число или переменная
+        """
+        return TokenStream.KIND_OPERATORS.get(self.kinds[index])
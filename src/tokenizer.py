@@ -2,178 +2,134 @@
 Модуль, отвечающий за токенизацию выражения
 """
 
-from src.tokens import Token, Operator, Number
+from src.tokens import Token, Number, Variable, OPERATORS
+from src.token_stream import TokenStream
+
+import re
 
 
 class Tokenizer:
     """
-    Класс-токенизатор, выполнаяющий единственную функцию: токенизация выражения
+    Класс-токенизатор, выполнаяющий единственную функцию: токенизация выражения.
+    Сканирование выполняется одним скомпилированным регулярным выражением,
+    поэтому цикл по символам идёт на уровне C, а на уровне Python обрабатываются
+    только готовые токены
+
+    Атрибуты класса:
+        TOKEN_PATTERN (re.Pattern): шаблон сканера: число из цифр и точек,
+            имя переменной, оператор или любой другой непробельный символ.
+            Пробелы пропускаются
+        VARIABLE_PATTERN (re.Pattern): шаблон имени переменной
+        OPERATORS (dict[str, Operator]): единственные экземпляры токенов операторов
 
     Атрибуты:
-        expression (str): выражение, которое предстоит токенезировать
-        expression_length (int): длина выражения (строки)
-        pos (int): индекс на символ, с которым токенизатору предстоит работать
+        expression (str): последнее токенизированное выражение
     """
 
+    TOKEN_PATTERN = re.compile(
+        r"[\d.]+|" + Variable.NAME_PATTERN + r"|\*\*|//|[-+*/%()]|\S"
+    )
+    VARIABLE_PATTERN = re.compile(Variable.NAME_PATTERN)
+    OPERATORS = OPERATORS
+
     expression: str
-    expression_length: int
-    pos: int
 
     def __init__(self) -> None:
         """
         Выполняет установку всех значений по умолочанию
         """
         self.expression = ""
-        self.expression_length = 0
-        self.pos = 0
 
-    def tokenize(self, expression: str) -> list[Token]:
+    def tokenize(self, expression: str, allow_variables: bool = False) -> list[Token]:
         """
-        Главная функция данного класса, которая выполняет токенизацию выражения
+        Главная функция данного класса, которая выполняет токенизацию выражения.
+        Число - это последовательность цифр и точек, является ли оно целым,
+        определяется отсутствием точки. Операторы ** и // считываются целиком
 
         Аргументы:
             expression (str): выражение
+            allow_variables (bool): считывать ли имена переменных
 
         Возвращаемое значение:
             list[Token]: список готовых токенов, идущих по порядку согласно выражению
+
+        Исключения:
+            SyntaxError: вызывается при нахождении неизвестного символа
         """
         tokens = list()
+        append = tokens.append
+        operators = Tokenizer.OPERATORS
         self.expression = expression
-        self.expression_length = len(self.expression)
-        self.pos = 0
-
-        while self._is_correct_pos():
-            if self._get_current_letter().isspace():
-                self._next_pos()
-            elif (
-                self._get_current_letter().isdigit()
-                or self._get_current_letter() == Number.NUMBER_DOT
-            ):
-                number = self._read_number()
-                tokens.append(number)
+
+        for text in Tokenizer.TOKEN_PATTERN.findall(expression):
+            operator = operators.get(text)
+
+            if operator is not None:
+                append(operator)
+            elif text[0].isdigit() or text[0] == Number.NUMBER_DOT:
+                append(Number(text, Number.NUMBER_DOT not in text))
+            elif allow_variables and self._is_variable_name(text):
+                append(Variable(text))
             else:
-                operator = self._read_operator()
-                tokens.append(operator)
+                raise SyntaxError("Неизвестный оператор")
 
         return tokens
 
-    def _is_correct_pos(self) -> bool:
-        """
-        Вспомогательная функция, проверяющая, не вашел ли индекс за пределы длины выражения
-
-        Возвращаемое значение:
-            bool
+    def tokenize_compact(
+        self, expression: str, allow_variables: bool = False
+    ) -> TokenStream:
         """
-        return self.pos < self.expression_length
+        Функция, выполняющая токенизацию в компактное представление: вместо
+        объектов токенов сохраняются только вид токена и его границы в исходной
+        строке. Правила токенизации те же, что и у tokenize
 
-    def _get_current_letter(self) -> str:
-        """
-        Вспомогательная функция, возвращающся элемент на текущей позиции
+        Аргументы:
+            expression (str): выражение
+            allow_variables (bool): считывать ли имена переменных
 
         Возвращаемое значение:
-            str
+            TokenStream: компактный поток токенов
 
         Исключения:
-            IndexError: вызывается, если была вызвана функция, но индекс уже вышел за границы
-        """
-        if self._is_correct_pos():
-            return self.expression[self.pos]
-        else:
-            raise IndexError("Некорректная индекс в выражении")
-
-    def _next_pos(self) -> None:
-        """
-        Вспомогательная функция, итерирующая индекс на 1 символ
-
-        Возвращаемое значение:
-            None
-        """
-        self.pos += 1
-
-    def _is_digit(self) -> bool:
-        """
-        Вспомогательная функция, определяющая, является ли символ числом или точкой
-
-        Возвращаемое значение:
-            bool
-        """
-        return (self._get_current_letter().isdigit()) or (
-            self._get_current_letter() == Number.NUMBER_DOT
-        )
-
-    def _read_number(self) -> Number:
-        """
-        Функция, которая считывает число, пока не будет обнаружено вхождение
-        не численного символа. Функция также проверяет, является ли число
-        целочисленным или с плавающей точкой, указывая это при создании объекта Number
-
-        Возвращаемое значение:
-            Number: объект типа Number
+            SyntaxError: вызывается при нахождении неизвестного символа
         """
-        start_index = self.pos
-        is_integer = True
+        stream = TokenStream(expression)
+        kinds = stream.kinds
+        starts = stream.starts
+        ends = stream.ends
+        operator_kinds = TokenStream.OPERATOR_KINDS
+        self.expression = expression
 
-        while self._is_correct_pos() and self._is_digit():
-            if self._get_current_letter() == Number.NUMBER_DOT:
-                is_integer = False
-            self._next_pos()
+        for match in Tokenizer.TOKEN_PATTERN.finditer(expression):
+            start, end = match.span()
+            kind = operator_kinds.get(match.group())
+
+            if kind is None:
+                first = expression[start]
+                if first.isdigit() or first == Number.NUMBER_DOT:
+                    if expression.find(Number.NUMBER_DOT, start, end) == -1:
+                        kind = TokenStream.INTEGER
+                    else:
+                        kind = TokenStream.FLOAT
+                elif allow_variables and self._is_variable_name(match.group()):
+                    kind = TokenStream.VARIABLE
+                else:
+                    raise SyntaxError("Неизвестный оператор")
 
-        number = self.expression[start_index : self.pos]
+            kinds.append(kind)
+            starts.append(start)
+            ends.append(end)
 
-        return Number(number, is_integer)
+        return stream
 
-    def _read_operator(self) -> str:
+    def _is_variable_name(self, text: str) -> bool:
         """
-        Функция, которая считывает оператор, создавая под него конкретный токен, указывая оператор
+        Вспомогательная функция, проверяющая, что считанный текст - имя переменной
 
         Аргументы:
-            expression (str): выражение
+            text (str): текст токена
 
         Возвращаемое значение:
-            list[Token]: список готовых токенов, идущих по порядку согласно выражению
-
-        Исключения:
-            SyntaxError: вызывается при нахождении неизвестного символа
+            bool
         """
-        operator = self._get_current_letter()
-        result = ""
-
-        match operator:
-            case (
-                Operator.PLUS
-                | Operator.MINUS
-                | Operator.LEFT_BRACKET
-                | Operator.RIGHT_BRACKET
-                | Operator.REMAINDER_DIVISION
-            ):
-                result = operator
-                self._next_pos()
-
-            case Operator.MULTIPLICATION:
-                self._next_pos()
-                is_power = (
-                    self._is_correct_pos()
-                    and self._get_current_letter() == Operator.MULTIPLICATION
-                )
-                if is_power:
-                    result = Operator.POWER
-                    self._next_pos()
-                else:
-                    result = Operator.MULTIPLICATION
-
-            case Operator.DIVISION:
-                self._next_pos()
-                is_integer_division = (
-                    self._is_correct_pos()
-                    and self._get_current_letter() == Operator.DIVISION
-                )
-                if is_integer_division:
-                    result = Operator.INTEGER_DIVISION
-                    self._next_pos()
-                else:
-                    result = Operator.DIVISION
-
-            case _:
-                raise SyntaxError("Неизвестный оператор")
-
-        return Operator(result)
+        return Tokenizer.VARIABLE_PATTERN.fullmatch(text) is not None
@@ -11,6 +11,8 @@ class Token:
         value (str): значение токена
     """
 
+    __slots__ = ("value",)
+
     value: str
 
     def __init__(self, token: str) -> None:
@@ -73,12 +75,25 @@ class Operator(Token):
     RIGHT_BRACKET = ")"
     REMAINDER_DIVISION = "%"
 
+    __slots__ = ()
+
     def __init__(self, token: str):
         """
         Инициализация атрибутов родительского класс
         """
         super().__init__(token)
 
+    def __reduce__(self) -> tuple:
+        """
+        Оператор передаётся в другой процесс как единственный экземпляр
+        из OPERATORS, так как вычисление сравнивает значения операторов
+        с константами класса по идентичности
+
+        Возвращаемое значение:
+            tuple: функция восстановления и её аргументы
+        """
+        return get_operator, (self.value,)
+
 
 class Number(Token):
     """
@@ -93,14 +108,17 @@ class Number(Token):
 
     NUMBER_DOT = "."
 
+    __slots__ = ("__is_integer",)
+
     __is_integer: bool
 
     def __init__(self, token: str, is_integer: bool):
         """
-        Инициализация атрибутов родительского класса
+        Инициализация значения токена без вызова конструктора родительского
+        класса: числа создаются токенизатором массово
         Установка флага __is_integer
         """
-        super().__init__(token)
+        self.value = token
         self.__is_integer = is_integer
 
     def is_integer(self) -> bool:
@@ -120,3 +138,54 @@ class Number(Token):
             bool
         """
         return not self.__is_integer
+
+
+class Variable(Token):
+    """
+    Класс, представляющий токен-переменную, являющийся дочерним классом Token.
+    Значение переменной подставляется при вычислении
+
+    Атрибуты класс:
+        NAME_PATTERN (str): регулярное выражение имени переменной
+    """
+
+    NAME_PATTERN = r"[A-Za-z_][A-Za-z0-9_]*"
+
+    __slots__ = ()
+
+    def __init__(self, token: str):
+        """
+        Инициализация атрибутов родительского класс
+        """
+        super().__init__(token)
+
+
+# Единственные экземпляры токенов операторов. Токены неизменяемы,
+# поэтому один объект оператора переиспользуется во всех выражениях
+OPERATORS = {
+    operator: Operator(operator)
+    for operator in (
+        Operator.PLUS,
+        Operator.MINUS,
+        Operator.MULTIPLICATION,
+        Operator.POWER,
+        Operator.DIVISION,
+        Operator.INTEGER_DIVISION,
+        Operator.LEFT_BRACKET,
+        Operator.RIGHT_BRACKET,
+        Operator.REMAINDER_DIVISION,
+    )
+}
+
+
+def get_operator(token: str) -> Operator:
+    """
+    Функция, возвращающая единственный экземпляр токена оператора
+
+    Аргументы:
+        token (str): строковое представление оператора
+
+    Возвращаемое значение:
+        Operator: токен оператора из OPERATORS
+    """
+    return OPERATORS[token]
@@ -5,7 +5,8 @@
 """
 
 from src.tokenizer import Tokenizer
-from src.tokens import Token, Operator, Number
+from src.tokens import Token, Operator, Number, Variable
+from src.token_stream import TokenStream
 from src.exception import (
     BracketsBalanceError,
     EmptyBracketsError,
@@ -15,22 +16,82 @@ from src.exception import (
     TwiceNumberError,
 )
 
+from collections.abc import Iterator
+import re
+import string
+
 
 class Validator:
     """
     Класс, выполняющий валидацию входного выражения
+
+    Атрибуты класса:
+        NUMBER, LEFT_BRACKET, RIGHT_BRACKET, UNARY_OPERATOR, BINARY_OPERATOR (int):
+            классы токенов для проверки токенов. Классы операторов идут последними,
+            поэтому любой оператор, кроме скобок, имеет класс не меньше UNARY_OPERATOR.
+            Переменная проверяется так же, как число
+        OPERATOR_CLASSES (dict[str, int]): классы операторов
+        KIND_CLASSES (dict[int, int]): классы видов токенов компактного потока
+        NUMBER_DOT_PATTERN (re.Pattern): ищет первую точку, за которой идёт
+            вторая точка того же числа или не идёт ни одной цифры
+        VARIABLE_ALPHABET (str): символы имён переменных
+
+    Атрибуты объекта:
+        tokenizer (Tokenizer): токенайзер
+        allow_variables (bool): разрешены ли в выражении переменные
+        alphabet (set): рабочий алфавит
+        unknown_symbol_pattern (re.Pattern): шаблон поиска символов вне алфавита
     """
 
+    NUMBER = 0
+    LEFT_BRACKET = 1
+    RIGHT_BRACKET = 2
+    UNARY_OPERATOR = 3
+    BINARY_OPERATOR = 4
+
+    OPERATOR_CLASSES = {
+        Operator.LEFT_BRACKET: LEFT_BRACKET,
+        Operator.RIGHT_BRACKET: RIGHT_BRACKET,
+        Operator.PLUS: UNARY_OPERATOR,
+        Operator.MINUS: UNARY_OPERATOR,
+        Operator.MULTIPLICATION: BINARY_OPERATOR,
+        Operator.DIVISION: BINARY_OPERATOR,
+        Operator.INTEGER_DIVISION: BINARY_OPERATOR,
+        Operator.POWER: BINARY_OPERATOR,
+        Operator.REMAINDER_DIVISION: BINARY_OPERATOR,
+    }
+    KIND_CLASSES = {
+        TokenStream.INTEGER: NUMBER,
+        TokenStream.FLOAT: NUMBER,
+        TokenStream.VARIABLE: NUMBER,
+        **{
+            TokenStream.OPERATOR_KINDS[operator]: token_class
+            for operator, token_class in OPERATOR_CLASSES.items()
+        },
+    }
+    NUMBER_DOT_PATTERN = re.compile(r"\.(?:[0-9]*\.|(?![0-9]))")
+    VARIABLE_ALPHABET = string.ascii_letters + "_"
+
     tokenizer: Tokenizer
+    allow_variables: bool
     alphabet: set
+    unknown_symbol_pattern: re.Pattern
 
-    def __init__(self, tokenizer: Tokenizer) -> None:
+    def __init__(self, tokenizer: Tokenizer, allow_variables: bool = False) -> None:
         """
         Внедрение токенайзера как зависимости.
-        Установка рабочего алфавита программы
+        Установка рабочего алфавита программы, в который при allow_variables
+        входят символы имён переменных, и скомпилированного шаблона поиска
+        символов вне алфавита
         """
         self.tokenizer = tokenizer
+        self.allow_variables = allow_variables
         self.alphabet = set(".0123456789()+-/*% ")
+        if allow_variables:
+            self.alphabet.update(Validator.VARIABLE_ALPHABET)
+        self.unknown_symbol_pattern = re.compile(
+            "[^" + re.escape("".join(sorted(self.alphabet))) + "]"
+        )
 
     def check_correctness_expression(self, expression: str) -> None:
         """
@@ -50,273 +111,195 @@ class Validator:
             InvalidBinaryOperatorError: если нарушены правила расстановки операторов
             TwiceNumberError: если есть два числа, между которыми нет оператора
         """
-        self._check_correctness_by_alphabet(expression)
-        self._check_correctness_number_dot(expression)
-
-        tokens = self.tokenizer.tokenize(expression)
+        self.compile(expression)
 
-        self._check_correctness_brackets_balance(tokens)
-        self._check_absence_empty_brackets(tokens)
-        self._check_correctness_binary_operators(tokens)
-        self._check_absence_double_twice_numbers(tokens)
-
-    def _check_correctness_brackets_balance(self, tokens: list[Token]) -> None:
+    def compile(
+        self, expression: str, compact: bool = False
+    ) -> list[Token] | TokenStream:
         """
-        Выполняет проверку баланса скобок в выражении
+        Единая точка входа конвейера: выполняет проверку строки выражения,
+        токенизирует её ровно один раз и проверяет полученные токены.
+        Возвращённые токены можно сразу передавать калькулятору
 
-        Аргументы:
-            tokens (list[Token]): токены выражения
+        Аргумент:
+            expression (str): выражение
+            compact (bool): вернуть компактный поток токенов вместо списка
 
         Возвращает:
-            None
+            list[Token] | TokenStream: проверенные токены выражения
 
         Исключения:
-            BracketsBalanceError: если нарушен баланс скобок в выражении
-        """
-        brackets = list()
-
-        for token in tokens:
-            str_token = token.get_token()
-            if str_token == Operator.LEFT_BRACKET:
-                brackets.append(str_token)
-            elif str_token == Operator.RIGHT_BRACKET:
-                if len(brackets) == 0:
-                    raise BracketsBalanceError(tokens)
-                brackets.pop()
-
-        if len(brackets) != 0:
-            raise BracketsBalanceError(tokens)
-
-    def _check_correctness_by_alphabet(self, expression: str) -> None:
+            те же, что и у check_correctness_expression
         """
-        Выполняет проверку корректности выражения относительно алфавита
-
-        Аргументы:
-            expression (str): выражение
+        self.check_correctness_symbols(expression)
 
-        Возвращает:
-            None
+        if compact:
+            tokens = self.tokenizer.tokenize_compact(expression, self.allow_variables)
+        else:
+            tokens = self.tokenizer.tokenize(expression, self.allow_variables)
 
-        Исключения:
-            UnknownSymbolError: если найден неизвестный символ
-        """
-        expression_length = len(expression)
+        self.check_correctness_tokens(tokens)
 
-        for index in range(expression_length):
-            if expression[index] not in self.alphabet:
-                raise UnknownSymbolError(expression, index)
+        return tokens
 
-    def _check_correctness_number_dot(self, expression: str) -> None:
+    def check_correctness_symbols(self, expression: str) -> None:
         """
-        Выполняет проверку корректности выражения расстановки плавающей точки
+        Выполняет проверки выражения, которые не требуют токенизации
 
-        Аргументы:
+        Аргумент:
             expression (str): выражение
 
         Возвращает:
             None
 
         Исключения:
+            UnknownSymbolError: если найден неизвестный символ
             NumberDotError: если нарушены правила расставление точки числа с плавающей точкой
         """
-        expression_length = len(expression)
-
-        if expression[expression_length - 1] == Number.NUMBER_DOT:
-            raise NumberDotError(expression, expression_length - 1)
-
-        for index in range(expression_length):
-            if expression[index] == Number.NUMBER_DOT:
-                index += 1
-
-                while index < expression_length and expression[index].isdigit():
-                    index += 1
-
-                if index < expression_length and expression[index] == Number.NUMBER_DOT:
-                    raise NumberDotError(expression, index)
-                elif expression[index - 1] == Number.NUMBER_DOT:
-                    raise NumberDotError(expression, index - 1)
+        self._check_correctness_by_alphabet(expression)
+        self._check_correctness_number_dot(expression)
 
-    def _check_absence_empty_brackets(self, tokens: list[Token]) -> None:
+    def check_correctness_tokens(self, tokens: list[Token] | TokenStream) -> None:
         """
-        Выполняет проверку на отсутствие пустых скобок в выражении
+        Выполняет проверки уже токенизированного выражения за один линейный
+        проход конечным автоматом, который хранит глубину скобок, класс
+        предыдущего токена и класс предыдущего токена, не являющегося скобкой.
+        Первая ошибка каждого вида запоминается, а в конце выбрасывается
+        исключение в прежнем порядке проверок: баланс скобок, пустые скобки,
+        бинарные операторы, два числа подряд
 
-        Аргументы:
-            tokens (list[Token]): токены выражения
+        Аргумент:
+            tokens (list[Token] | TokenStream): токены выражения
 
         Возвращает:
             None
 
         Исключения:
+            BracketsBalanceError: если нарушен баланс скобок в выражении
             EmptyBracketsError: если есть в выражении пустые скобки '()'
-        """
-        tokens_size = len(tokens)
-
-        for index in range(tokens_size):
-            str_token = tokens[index].get_token()
-            if str_token == Operator.LEFT_BRACKET:
-                next_index = index + 1
-                if (next_index < tokens_size) and tokens[
-                    next_index
-                ].get_token() == Operator.RIGHT_BRACKET:
-                    raise EmptyBracketsError(tokens, index)
-
-    def _check_correctness_binary_operators(self, tokens: list[Token]) -> None:
-        """
-        Выполняет проверку отсутствия ввода двух операторов подряд
-
-        Аргументы:
-            tokens (list[Token]): токены выражения
-
-        Возвращает:
-            None
-
-        Исключения:
             InvalidBinaryOperatorError: если нарушены правила расстановки операторов
+            TwiceNumberError: если есть два числа, между которыми нет оператора
         """
-        TOKENS_SIZE = len(tokens)
-        LAST_INDEX = TOKENS_SIZE - 1
-
-        is_last_token_operator = (
-            self._is_operator(tokens[LAST_INDEX])
-            and tokens[LAST_INDEX].get_token() != Operator.RIGHT_BRACKET
-        )
-
-        if is_last_token_operator:
-            raise InvalidBinaryOperatorError(tokens, LAST_INDEX)
-        else:
-            self._check_correctness_operators_inside(tokens, TOKENS_SIZE)
-
-    def _check_correctness_operators_inside(
-        self, tokens: list[Token], tokens_size: int
-    ) -> None:
-        """
-        Вспомогательная функция для функции _check_correctness_binary_operators,
-        которая сама уже производит проверку корректности операторов
+        NUMBER = Validator.NUMBER
+        LEFT_BRACKET = Validator.LEFT_BRACKET
+        RIGHT_BRACKET = Validator.RIGHT_BRACKET
+        OPERATOR = Validator.UNARY_OPERATOR
+
+        depth = 0
+        empty_brackets_position = None
+        operator_position = None
+        twice_number_position = None
+        first = None
+        previous = None
+        previous_operand = None
+
+        for index, token_class in enumerate(self._classify_tokens(tokens)):
+            if token_class == NUMBER:
+                if previous_operand == NUMBER and twice_number_position is None:
+                    twice_number_position = index
+            elif token_class == LEFT_BRACKET:
+                depth += 1
+            elif token_class == RIGHT_BRACKET:
+                if depth == 0:
+                    raise BracketsBalanceError(tokens)
+                depth -= 1
+                if previous == LEFT_BRACKET and empty_brackets_position is None:
+                    empty_brackets_position = index - 1
+
+            is_after_operator = previous is not None and previous >= OPERATOR
+            if (
+                is_after_operator
+                and token_class != NUMBER
+                and token_class != LEFT_BRACKET
+                and operator_position is None
+            ):
+                operator_position = index
 
-        Аргументы:
-            tokens (list[Token]): токены выражения
+            if token_class != LEFT_BRACKET and token_class != RIGHT_BRACKET:
+                previous_operand = token_class
+            if previous is None:
+                first = token_class
+            previous = token_class
 
-        Возвращает:
-            None
-
-        Исключения:
-            InvalidBinaryOperatorError: если нарушены правила расстановки операторов
-        """
-        if (
-            not self._is_bracket(tokens[0])
-            and (tokens[0].get_token() not in (Operator.PLUS, Operator.MINUS))
-            and not self._is_number(tokens[0])
-        ):
+        if depth != 0:
+            raise BracketsBalanceError(tokens)
+        if empty_brackets_position is not None:
+            raise EmptyBracketsError(tokens, empty_brackets_position)
+
+        if previous is None:
+            raise IndexError("Выражение не содержит токенов")
+        if previous >= OPERATOR:
+            raise InvalidBinaryOperatorError(tokens, len(tokens) - 1)
+        if first == Validator.BINARY_OPERATOR:
             raise InvalidBinaryOperatorError(tokens, 0)
-        for index in range(tokens_size):
-            if self._is_operator(tokens[index]) and (
-                not self._is_bracket(tokens[index])
-            ):
-                for cursor in range(index + 1, tokens_size):
-                    index = cursor
-                    if (
-                        self._is_number(tokens[index])
-                        or tokens[cursor].get_token() == Operator.LEFT_BRACKET
-                    ):
-                        break
-                    raise InvalidBinaryOperatorError(tokens, cursor)
-
-    def _check_absence_double_twice_numbers(self, tokens: list[Token]) -> None:
+        if operator_position is not None:
+            raise InvalidBinaryOperatorError(tokens, operator_position)
+        if twice_number_position is not None:
+            raise TwiceNumberError(tokens, twice_number_position)
+
+    def _classify_tokens(self, tokens: list[Token] | TokenStream) -> Iterator[int]:
         """
-        Выполняет проверку на отсутствие двух идущих подряд чисел
+        Вспомогательная функция, лениво возвращающая классы токенов.
+        Для компактного потока классы берутся прямо из массива видов
+        без создания объектов токенов
 
         Аргументы:
-            tokens (list[Token]): токены выражения
+            tokens (list[Token] | TokenStream): токены выражения
 
         Возвращает:
-            None
-
-        Исключения:
-            TwiceNumberError: если есть два числа, между которыми нет оператора
+            Iterator[int]: классы токенов по порядку
         """
-        tokens_size = len(tokens)
+        if isinstance(tokens, TokenStream):
+            return map(Validator.KIND_CLASSES.__getitem__, tokens.kinds)
 
-        for index in range(tokens_size):
-            if self._is_number(tokens[index]):
-                next_index = index + 1
+        CLASSES = Validator.OPERATOR_CLASSES
+        NUMBER = Validator.NUMBER
 
-                while next_index < tokens_size and self._is_bracket(tokens[next_index]):
-                    next_index += 1
-
-                if (next_index < tokens_size) and self._is_number(tokens[next_index]):
-                    raise TwiceNumberError(tokens, next_index)
+        return (
+            NUMBER
+            if isinstance(token, (Number, Variable))
+            else CLASSES[token.get_token()]
+            for token in tokens
+        )
 
-    def _is_unary_operator(self, token: Token) -> bool:
+    def _check_correctness_by_alphabet(self, expression: str) -> None:
         """
-        Проверяет, является ли токен унарным оператором
+        Выполняет проверку корректности выражения относительно алфавита
 
         Аргументы:
-            token (Token): токен
+            expression (str): выражение
 
         Возвращает:
-            bool
-        """
-        if isinstance(token, Operator):
-            if token.get_token() in (Operator.PLUS, Operator.MINUS):
-                return True
-        return False
+            None
 
-    def _is_binary_operator(self, token: Token) -> bool:
+        Исключения:
+            UnknownSymbolError: если найден неизвестный символ
         """
-        Проверяет, является ли токен бинарным оператором
+        unknown_symbol = self.unknown_symbol_pattern.search(expression)
 
-        Аргументы:
-            token (Token): токен
-
-        Возвращает:
-            bool
-        """
-        if isinstance(token, Operator):
-            if token.get_token() in (
-                Operator.MULTIPLICATION,
-                Operator.DIVISION,
-                Operator.INTEGER_DIVISION,
-                Operator.POWER,
-                Operator.REMAINDER_DIVISION,
-            ):
-                return True
-        return False
+        if unknown_symbol is not None:
+            raise UnknownSymbolError(expression, unknown_symbol.start())
 
-    def _is_bracket(self, token: Token) -> bool:
+    def _check_correctness_number_dot(self, expression: str) -> None:
         """
-        Проверяет, является ли токен скобками
+        Выполняет проверку корректности выражения расстановки плавающей точки
 
         Аргументы:
-            token (Token): токен
+            expression (str): выражение
 
         Возвращает:
-            bool
-        """
-        if isinstance(token, Operator):
-            if token.get_token() in (Operator.LEFT_BRACKET, Operator.RIGHT_BRACKET):
-                return True
-        return False
-
-    def _is_number(self, token: Token) -> bool:
-        """
-        Проверяет, является ли токен числом
-
-        Аргументы:
-            token (Token): токен
+            None
 
-        Возвращает:
-            bool
+        Исключения:
+            NumberDotError: если нарушены правила расставление точки числа с плавающей точкой
         """
-        return isinstance(token, Number)
+        expression_length = len(expression)
 
-    def _is_operator(self, token: Token) -> bool:
-        """
-        Проверяет, является ли токен оператором в целом
+        if expression[expression_length - 1] == Number.NUMBER_DOT:
+            raise NumberDotError(expression, expression_length - 1)
 
-        Аргументы:
-            token (Token): токен
+        wrong_dot = self.NUMBER_DOT_PATTERN.search(expression)
 
-        Возвращает:
-            bool
-        """
-        return isinstance(token, Operator)
+        if wrong_dot is not None:
+            # Одиночная точка без цифр указывает на себя, иначе на вторую точку числа
+            raise NumberDotError(expression, wrong_dot.end() - 1)
@@ -0,0 +1,408 @@
+"""
+Модуль векторизованного вычисления: скомпилированное выражение вычисляется
+один раз над целыми столбцами значений переменных. Требует NumPy
+"""
+
+from src.tokens import Token, Operator
+from src.program import Program
+from src.parser import Parser
+from src.calculator import DeferredPower
+from src.exception import UndefinedVariableError
+
+import math
+import numpy as np
+
+
+class VectorizedResult:
+    """
+    Результат векторизованного вычисления. Ошибки, которые Calculator
+    выбрасывает для одного выражения, здесь отмечаются масками строк,
+    а значения в отмеченных строках не определены
+
+    Атрибуты:
+        values (np.ndarray): значения выражения по строкам
+        zero_division (np.ndarray): маска строк с делением на ноль
+        integer_type (np.ndarray): маска строк, в которых операнд // или %
+            не является целым
+        overflow (np.ndarray): маска строк, в которых целый промежуточный
+            результат не помещается в int64
+    """
+
+    values: np.ndarray
+    zero_division: np.ndarray
+    integer_type: np.ndarray
+    overflow: np.ndarray
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        zero_division: np.ndarray,
+        integer_type: np.ndarray,
+        overflow: np.ndarray,
+    ) -> None:
+        """
+        Инициализация результата
+        """
+        self.values = values
+        self.zero_division = zero_division
+        self.integer_type = integer_type
+        self.overflow = overflow
+
+    def get_valid(self) -> np.ndarray:
+        """
+        Функция, возвращающая маску строк, вычисленных без ошибок
+
+        Возвращаемое значение:
+            np.ndarray: маска корректных строк
+        """
+        return ~(self.zero_division | self.integer_type | self.overflow)
+
+
+class VectorizedCalculator:
+    """
+    Калькулятор, вычисляющий программу поэлементно над массивами NumPy.
+    Каждая инструкция программы выполняется один раз для всех строк.
+    Столбцы переменных приводятся к общей форме по правилам broadcasting.
+    Целые столбцы вычисляются в int64. Calculator вычисляет целые любой
+    длины, поэтому строки, в которых целая операция выходит за пределы int64,
+    отмечаются маской overflow: результат каждой целой операции заранее
+    оценивается в float64. Оценка округлена, поэтому результаты, отличающиеся
+    от границы int64 меньше чем на 2 ** 10, тоже отмечаются. Как и в Calculator,
+    целое число в отрицательной степени даёт вещественный результат,
+    вещественный результат округляется до двух знаков, а x ** y % m над целыми
+    с неотрицательным показателем и ненулевым модулем вычисляется
+    возведением в степень по модулю без построения x ** y
+
+    Атрибуты класса:
+        INTEGER_LIMIT (float): наименьшая оценка модуля, не помещающаяся в int64
+        MAX_EXACT_MODULO (int): наибольший модуль, при котором произведения
+            в возведении в степень по модулю помещаются в int64
+
+    Атрибуты:
+        parser (Parser): парсер, компилирующий токены в программу
+    """
+
+    INTEGER_LIMIT = 2.0**63
+    MAX_EXACT_MODULO = math.isqrt(2**63 - 1)
+
+    parser: Parser
+
+    def __init__(self) -> None:
+        """
+        Создание парсера
+        """
+        self.parser = Parser()
+
+    def calculate(
+        self, tokens: list[Token], variables: dict[str, np.ndarray]
+    ) -> VectorizedResult:
+        """
+        Функция, компилирующая проверенные токены и вычисляющая их над столбцами
+
+        Аргументы:
+            tokens (list[Token]): токены арифметического выражения
+            variables (dict[str, np.ndarray]): столбцы значений переменных
+
+        Возвращаемое значение:
+            VectorizedResult: значения и маски ошибок
+
+        Исключения:
+            UndefinedVariableError: если столбец переменной не задан
+            ValueError: если формы столбцов несовместимы
+        """
+        return self.evaluate(self.parser.parse_iterative(tokens), variables)
+
+    def evaluate(
+        self, program: Program, variables: dict[str, np.ndarray]
+    ) -> VectorizedResult:
+        """
+        Функция, вычисляющая скомпилированное выражение над столбцами
+
+        Аргументы:
+            program (Program): выражение, скомпилированное Parser
+            variables (dict[str, np.ndarray]): столбцы значений переменных
+
+        Возвращаемое значение:
+            VectorizedResult: значения и маски ошибок
+
+        Исключения:
+            UndefinedVariableError: если столбец переменной не задан
+            ValueError: если формы столбцов несовместимы
+        """
+        columns = {name: np.asarray(values) for name, values in variables.items()}
+        shape = np.broadcast_shapes(*(column.shape for column in columns.values()))
+        zero_division = np.zeros(shape, dtype=bool)
+        integer_type = np.zeros(shape, dtype=bool)
+        overflow = np.zeros(shape, dtype=bool)
+
+        stack = list()
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            for operation, argument, position in program.instructions:
+                if operation is Program.PUSH:
+                    stack.append(self._push_number(argument, overflow))
+                elif operation is Program.VARIABLE:
+                    if argument not in columns:
+                        raise UndefinedVariableError(program.tokens, position - 1)
+                    stack.append(columns[argument])
+                elif operation is Program.UNARY:
+                    if argument.get_token() is Operator.MINUS:
+                        self._mark_overflow(np.negative, stack[-1], None, overflow)
+                        stack[-1] = -stack[-1]
+                    else:
+                        stack[-1] = +stack[-1]
+                elif operation is Program.DEFERRED_POWER:
+                    right = stack.pop()
+                    stack[-1] = DeferredPower(stack[-1], right, argument, position)
+                elif type(stack[-2]) is DeferredPower:
+                    right = stack.pop()
+                    stack[-1] = self._apply_power_modulo(
+                        stack[-1], right, argument, zero_division, integer_type, overflow
+                    )
+                else:
+                    right = stack.pop()
+                    stack[-1] = self._apply_binary(
+                        stack[-1], right, argument, zero_division, integer_type, overflow
+                    )
+
+        values = np.broadcast_to(stack.pop(), shape)
+        if not self._is_integer(values):
+            values = np.round(values, 2)
+
+        return VectorizedResult(values, zero_division, integer_type, overflow)
+
+    def _push_number(self, number: int | float, overflow: np.ndarray) -> np.ndarray:
+        """
+        Вспомогательная функция, превращающая число программы в массив.
+        Целое число вне int64 отмечает все строки маской переполнения
+
+        Аргументы:
+            number (int | float): число
+            overflow (np.ndarray): маска переполнения, дополняется на месте
+
+        Возвращаемое значение:
+            np.ndarray: число в виде массива NumPy
+        """
+        if isinstance(number, int) and abs(number) >= VectorizedCalculator.INTEGER_LIMIT:
+            overflow[...] = True
+            return np.asarray(0)
+        return np.asarray(number)
+
+    def _apply_binary(
+        self,
+        left: np.ndarray,
+        right: np.ndarray,
+        operator: Operator,
+        zero_division: np.ndarray,
+        integer_type: np.ndarray,
+        overflow: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Вспомогательная функция, применяющая бинарный оператор к столбцам.
+        Строки с ошибкой отмечаются в масках, а вместо нулевого делителя
+        подставляется единица, чтобы операция не выдавала предупреждений
+
+        Аргументы:
+            left (np.ndarray): левый операнд
+            right (np.ndarray): правый операнд
+            operator (Operator): оператор
+            zero_division (np.ndarray): маска деления на ноль, дополняется на месте
+            integer_type (np.ndarray): маска нецелых операндов, дополняется на месте
+            overflow (np.ndarray): маска переполнения int64, дополняется на месте
+
+        Возвращаемое значение:
+            np.ndarray: результат операции
+        """
+        match operator.get_token():
+            case Operator.PLUS:
+                self._mark_overflow(np.add, left, right, overflow)
+                return left + right
+            case Operator.MINUS:
+                self._mark_overflow(np.subtract, left, right, overflow)
+                return left - right
+            case Operator.MULTIPLICATION:
+                self._mark_overflow(np.multiply, left, right, overflow)
+                return left * right
+            case Operator.DIVISION:
+                return left / self._mark_zero_division(right, zero_division)
+            case Operator.INTEGER_DIVISION:
+                right = self._mark_zero_division(right, zero_division)
+                self._mark_integer_type(left, right, integer_type)
+                self._mark_overflow(np.floor_divide, left, right, overflow)
+                return left // right
+            case Operator.REMAINDER_DIVISION:
+                right = self._mark_zero_division(right, zero_division)
+                self._mark_integer_type(left, right, integer_type)
+                return left % right
+            case Operator.POWER:
+                zero_division |= (left == 0) & (right < 0)
+                if self._is_integer(left) and self._is_integer(right):
+                    if np.any(right < 0):
+                        left = left.astype(np.float64)
+                self._mark_overflow(np.power, left, right, overflow)
+                return left**right
+
+    def _apply_power_modulo(
+        self,
+        power: DeferredPower,
+        modulo: np.ndarray,
+        operator: Operator,
+        zero_division: np.ndarray,
+        integer_type: np.ndarray,
+        overflow: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Вспомогательная функция, вычисляющая % над отложенной степенью так же,
+        как Calculator: строки с целыми операндами, неотрицательным показателем
+        и ненулевым модулем вычисляются возведением в степень по модулю,
+        остальные строки - степенью, а затем %. Маски ошибок второго способа
+        дополняются только в его строках
+
+        Аргументы:
+            power (DeferredPower): отложенная степень над столбцами
+            modulo (np.ndarray): делитель
+            operator (Operator): оператор %
+            zero_division (np.ndarray): маска деления на ноль, дополняется на месте
+            integer_type (np.ndarray): маска нецелых операндов, дополняется на месте
+            overflow (np.ndarray): маска переполнения int64, дополняется на месте
+
+        Возвращаемое значение:
+            np.ndarray: результат операции
+        """
+        base, exponent = power.base, power.exponent
+        masks = (zero_division, integer_type, overflow)
+
+        if not all(self._is_integer(column) for column in (base, exponent, modulo)):
+            left = self._apply_binary(base, exponent, power.operator, *masks)
+            return self._apply_binary(left, modulo, operator, *masks)
+
+        is_fused = (exponent >= 0) & (modulo != 0)
+        result = self._power_modulo(base, exponent, modulo, is_fused, overflow)
+        if np.all(is_fused):
+            return result
+
+        rest_masks = tuple(np.zeros_like(mask) for mask in masks)
+        left = self._apply_binary(base, exponent, power.operator, *rest_masks)
+        rest = self._apply_binary(left, modulo, operator, *rest_masks)
+        for mask, rest_mask in zip(masks, rest_masks):
+            mask |= rest_mask & ~is_fused
+
+        return np.where(is_fused, result, rest)
+
+    def _power_modulo(
+        self,
+        base: np.ndarray,
+        exponent: np.ndarray,
+        modulo: np.ndarray,
+        is_fused: np.ndarray,
+        overflow: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Вспомогательная функция, вычисляющая pow(base, exponent, modulo)
+        в строках is_fused двоичным возведением в степень. Остатки берутся
+        по правилам Python, поэтому знак результата совпадает со знаком модуля.
+        Строки с модулем больше MAX_EXACT_MODULO по абсолютной величине
+        отмечаются маской переполнения, значения остальных строк не определены
+
+        Аргументы:
+            base (np.ndarray): основание
+            exponent (np.ndarray): показатель
+            modulo (np.ndarray): модуль
+            is_fused (np.ndarray): маска строк, вычисляемых по модулю
+            overflow (np.ndarray): маска переполнения, дополняется на месте
+
+        Возвращаемое значение:
+            np.ndarray: результат
+        """
+        limit = VectorizedCalculator.MAX_EXACT_MODULO
+        is_exact = is_fused & (modulo >= -limit) & (modulo <= limit)
+        overflow |= is_fused & ~is_exact
+
+        modulo = np.where(is_exact, modulo, 1)
+        exponent = np.where(is_exact, exponent, 0)
+        base = np.remainder(base, modulo)
+        result = np.remainder(np.ones_like(base), modulo)
+
+        while np.any(exponent > 0):
+            is_odd = (exponent & 1) == 1
+            result = np.where(is_odd, np.remainder(result * base, modulo), result)
+            base = np.remainder(base * base, modulo)
+            exponent = exponent >> 1
+
+        return result
+
+    def _mark_overflow(
+        self,
+        operation: np.ufunc,
+        left: np.ndarray,
+        right: np.ndarray | None,
+        overflow: np.ndarray,
+    ) -> None:
+        """
+        Вспомогательная функция, отмечающая строки, в которых результат целой
+        операции не помещается в int64. Результат оценивается той же операцией
+        над операндами, приведёнными к float64. Операции с вещественным
+        операндом не проверяются
+
+        Аргументы:
+            operation (np.ufunc): операция NumPy
+            left (np.ndarray): левый или единственный операнд
+            right (np.ndarray | None): правый операнд или None для унарной операции
+            overflow (np.ndarray): маска переполнения, дополняется на месте
+
+        Возвращаемое значение:
+            None
+        """
+        operands = (left,) if right is None else (left, right)
+        if not all(self._is_integer(operand) for operand in operands):
+            return
+
+        estimate = operation(*(operand.astype(np.float64) for operand in operands))
+        overflow |= ~(np.abs(estimate) < VectorizedCalculator.INTEGER_LIMIT)
+
+    def _mark_zero_division(
+        self, right: np.ndarray, zero_division: np.ndarray
+    ) -> np.ndarray:
+        """
+        Вспомогательная функция, отмечающая строки с нулевым делителем
+
+        Аргументы:
+            right (np.ndarray): делитель
+            zero_division (np.ndarray): маска деления на ноль
+
+        Возвращаемое значение:
+            np.ndarray: делитель, в котором нули заменены единицами
+        """
+        is_zero = right == 0
+        zero_division |= is_zero
+        return np.where(is_zero, np.ones_like(right), right)
+
+    def _mark_integer_type(
+        self, left: np.ndarray, right: np.ndarray, integer_type: np.ndarray
+    ) -> None:
+        """
+        Вспомогательная функция, отмечающая все строки, если хотя бы один
+        из операндов // или % не целого типа
+
+        Аргументы:
+            left (np.ndarray): делимое
+            right (np.ndarray): делитель
+            integer_type (np.ndarray): маска нецелых операндов
+
+        Возвращаемое значение:
+            None
+        """
+        if not (self._is_integer(left) and self._is_integer(right)):
+            integer_type[...] = True
+
+    def _is_integer(self, column: np.ndarray) -> bool:
+        """
+        Вспомогательная функция, проверяющая, что столбец целого типа
+
+        Аргументы:
+            column (np.ndarray): столбец
+
+        Возвращаемое значение:
+            bool
+        """
+        return np.issubdtype(column.dtype, np.integer)
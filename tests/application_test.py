@@ -0,0 +1,121 @@
+import io
+import logging
+import pytest
+
+from src.exception import (
+    BracketsBalanceError,
+    DigitsOverFlow,
+    InvalidBinaryOperatorError,
+    UnknownSymbolError,
+)
+
+
+def test_evaluate_many_yields_results_and_errors(make_application):
+    application = make_application()
+    expressions = ["1 + 2", "(1 + 2", "", "1 / 0", "7.5 // 2", "10 ** 10 ** 10", "a"]
+
+    results = list(application.evaluate_many(expressions))
+
+    assert [index for index, _ in results] == list(range(len(expressions)))
+    assert results[0][1] == 3
+    assert isinstance(results[1][1], BracketsBalanceError)
+    assert results[2][1] is None
+    assert isinstance(results[3][1], ZeroDivisionError)
+    assert isinstance(results[4][1], TypeError)
+    assert isinstance(results[5][1], DigitsOverFlow)
+    assert isinstance(results[6][1], UnknownSymbolError)
+
+
+def test_evaluate_many_is_lazy(make_application):
+    application = make_application()
+
+    def expressions():
+        yield "2 * 3"
+        raise RuntimeError("генератор не должен читаться дальше")
+
+    results = application.evaluate_many(expressions())
+    assert next(results) == (0, 6)
+    with pytest.raises(RuntimeError):
+        next(results)
+
+
+def test_execute_batch_writes_inline_errors(make_application):
+    application = make_application()
+    input_stream = io.StringIO("1 + 2\n(1 + 2\n\n2 ** 10\n")
+    output_stream = io.StringIO()
+
+    application.execute_batch(input_stream, output_stream)
+
+    assert output_stream.getvalue() == (
+        "3\n" + BracketsBalanceError.ERROR_MESSAGE + "\n\n1024\n"
+    )
+
+
+def test_execute_batch_writes_errors_to_separate_stream(make_application):
+    application = make_application()
+    input_stream = io.StringIO("1 + 2\r\n(1 + 2\r\n")
+    output_stream = io.StringIO()
+    error_stream = io.StringIO()
+
+    application.execute_batch(input_stream, output_stream, error_stream)
+
+    assert output_stream.getvalue() == "3\n\n"
+    assert error_stream.getvalue() == "2: " + BracketsBalanceError.ERROR_MESSAGE + "\n"
+
+
+def test_execute_batch_in_parallel_keeps_input_order(make_application):
+    application = make_application()
+    expressions = [f"{index} * 2" if index % 3 else "(1" for index in range(50)]
+    output_stream = io.StringIO()
+    error_stream = io.StringIO()
+
+    application.execute_batch(
+        io.StringIO("\n".join(expressions)),
+        output_stream,
+        error_stream,
+        workers=2,
+        chunk_size=7,
+    )
+
+    expected_output = [
+        f"{index * 2}" if index % 3 else "" for index in range(50)
+    ]
+    expected_errors = [
+        f"{index + 1}: {BracketsBalanceError.ERROR_MESSAGE}"
+        for index in range(50)
+        if index % 3 == 0
+    ]
+    assert output_stream.getvalue().splitlines() == expected_output
+    assert error_stream.getvalue().splitlines() == expected_errors
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_execute_batch_complex_result_is_error(make_application, workers):
+    application = make_application()
+    output_stream = io.StringIO()
+
+    application.execute_batch(
+        io.StringIO("1 + 1\n-2 ** 0.5\n(**0)\n2 * 3\n"),
+        output_stream,
+        workers=workers,
+        chunk_size=1,
+    )
+
+    lines = output_stream.getvalue().splitlines()
+    assert lines[0] == "2"
+    assert "complex" in lines[1]
+    assert lines[2] == InvalidBinaryOperatorError.ERROR_MESSAGE
+    assert lines[3] == "6"
+
+
+def test_main_loop_reports_complex_result(make_application, monkeypatch, caplog, capsys):
+    application = make_application()
+    application.logger = logging.getLogger("tests.application")
+    inputs = iter(["-2 ** 0.5", "1 + 1", "q"])
+    monkeypatch.setattr("builtins.input", lambda prompt: next(inputs))
+
+    with caplog.at_level(logging.ERROR, logger="tests.application"):
+        application._start_main_loop()
+
+    assert [record.error for record in caplog.records] == ["TypeError"]
+    assert "= 2" in capsys.readouterr().out
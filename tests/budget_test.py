@@ -0,0 +1,85 @@
+import pytest
+
+from src.budget import Budget
+from src.calculator import Calculator
+from src.tokenizer import Tokenizer
+from src.cache import ResultCache
+from src.exception import BudgetExceededError, DigitsOverFlow
+
+ENGINES = (Calculator.RECURSIVE_ENGINE, Calculator.STACK_ENGINE)
+
+
+def calculate(expression, budget, engine=Calculator.RECURSIVE_ENGINE):
+    return Calculator(engine, budget=budget).calculate(Tokenizer().tokenize(expression))
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_operations_limit(engine):
+    budget = Budget(max_operations=3)
+
+    assert calculate("1 + 2 * 3 - 4", budget, engine) == 3
+
+    with pytest.raises(BudgetExceededError) as error:
+        calculate("1 + 2 * 3 - 4 + 5", budget, engine)
+    assert error.value.limit == BudgetExceededError.OPERATIONS
+    assert error.value.log == "1+2*3-4+5"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_bits_limit(engine):
+    budget = Budget(max_bits=64)
+
+    assert calculate("2 ** 63", budget, engine) == 2**63
+    assert calculate("1.5 * 10 ** 18 * 1000.5", budget, engine) == 1.5 * 10**18 * 1000.5
+
+    for expression in ("2 ** 64", "2 ** 40 * 2 ** 30", "18446744073709551616 + 1"):
+        with pytest.raises(BudgetExceededError) as error:
+            calculate(expression, budget, engine)
+        assert error.value.limit == BudgetExceededError.BITS
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_bits_limit_power_modulo(engine):
+    budget = Budget(max_bits=64)
+
+    assert calculate("3 ** 100000 % 7", budget, engine) == pow(3, 100000, 7)
+
+    with pytest.raises(BudgetExceededError):
+        calculate("3 ** 10 ** 100 % 7", budget, engine)
+
+
+def test_budget_checked_before_digits_overflow():
+    with pytest.raises(BudgetExceededError):
+        calculate("10 ** 10 ** 10", Budget(max_bits=1024))
+
+    with pytest.raises(DigitsOverFlow):
+        calculate("10 ** 10 ** 10", None)
+
+
+def test_deadline():
+    expression = " + ".join(["1"] * 20000)
+
+    with pytest.raises(BudgetExceededError) as error:
+        calculate(expression, Budget(timeout=1e-9))
+    assert error.value.limit == BudgetExceededError.DEADLINE
+
+    assert calculate(expression, Budget(timeout=60)) == 20000
+
+
+def test_budget_restarts_for_each_expression():
+    calculator = Calculator(budget=Budget(max_operations=2))
+    tokens = Tokenizer().tokenize("1 + 2 + 3")
+
+    for _ in range(3):
+        assert calculator.calculate(tokens) == 6
+
+
+def test_deadline_error_is_not_cached(make_application):
+    calculator = Calculator(budget=Budget(timeout=1e-9))
+    application = make_application(calculator, cache=ResultCache())
+
+    with pytest.raises(BudgetExceededError):
+        application.process("1 + 2")
+
+    calculator.budget = Budget(timeout=60)
+    assert application.process("1 + 2")[1] == 3
@@ -0,0 +1,66 @@
+import pytest
+
+from src.cache import ResultCache, normalize_expression
+from src.exception import BracketsBalanceError
+
+
+@pytest.mark.parametrize(
+    "expression, result",
+    [
+        ("1+2", "1+2"),
+        ("  1 +   2 ", "1 + 2"),
+        ("1 2", "1 2"),
+        ("\t(3)\t", "(3)"),
+    ],
+)
+def test_normalize_expression(expression, result):
+    assert normalize_expression(expression) == result
+
+
+def test_cache_returns_cached_result(make_application):
+    cache = ResultCache()
+    application = make_application(cache=cache)
+
+    _, first = application.process("7 ** 20")
+    _, second = application.process(" 7  **  20 ")
+
+    assert first == second == 7**20
+    statistics = cache.get_statistics()
+    assert statistics["hits"] == 1
+    assert statistics["misses"] == 1
+    assert statistics["hit_ratio"] == 0.5
+    assert statistics["bytes_held"] > 0
+
+
+def test_cache_returns_cached_validation_error(make_application):
+    cache = ResultCache()
+    application = make_application(cache=cache)
+
+    for _ in range(3):
+        with pytest.raises(BracketsBalanceError):
+            application.process("(1 + 2")
+
+    assert cache.get_statistics()["hits"] == 2
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1, 1)
+    cache.put("b", 2, 1)
+    cache.get("a")
+    cache.put("c", 3, 1)
+
+    assert cache.get("b") is ResultCache.MISSING
+    assert cache.get("a") == 1
+    assert cache.get_statistics()["evictions"] == 1
+
+
+def test_cache_respects_memory_limit():
+    cache = ResultCache(max_bytes=100)
+    cache.put("a", 1, 60)
+    cache.put("b", 2, 60)
+    cache.put("huge", 3, 1000)
+
+    assert cache.get("a") is ResultCache.MISSING
+    assert cache.get("huge") is ResultCache.MISSING
+    assert cache.get_statistics()["bytes_held"] == 60
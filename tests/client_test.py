@@ -0,0 +1,140 @@
+import asyncio
+import os
+import socket
+import sys
+import pytest
+
+from src.server import EvaluationServer
+from src import client
+
+
+@pytest.fixture
+def server(make_application):
+    return EvaluationServer(make_application())
+
+
+async def wait_listening(path):
+    while True:
+        try:
+            _, writer = await asyncio.open_unix_connection(path)
+        except OSError:
+            await asyncio.sleep(0.01)
+        else:
+            writer.close()
+            return
+
+
+async def run_client(server, path, arguments):
+    task = asyncio.create_task(server.serve_unix(path))
+    await wait_listening(path)
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, client.main, ["--socket", path, *arguments]
+        )
+    finally:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+def test_decode_response():
+    assert client.decode_response('{"result": 3}') == (True, "3")
+    assert client.decode_response('{"result": 3.5}') == (True, "3.5")
+    assert client.decode_response('{"result": "0xff"}') == (True, "0xff")
+    assert client.decode_response('{"result": null}') == (True, "")
+    assert client.decode_response(
+        '{"error": "ZeroDivisionError", "position": null, "message": "ОШИБКА: \\"x\\""}'
+    ) == (False, 'ОШИБКА: "x"')
+
+
+def test_client_evaluates_arguments(server, tmp_path, capsys):
+    path = str(tmp_path / "calculator.sock")
+
+    status = asyncio.run(run_client(server, path, ["2", "**", "10"]))
+
+    assert status == 0
+    assert capsys.readouterr().out == "1024\n"
+    assert not os.path.exists(path)
+
+
+def test_client_reads_standard_input(server, tmp_path, capsys, monkeypatch):
+    path = str(tmp_path / "calculator.sock")
+    monkeypatch.setattr(sys, "stdin", iter(["1 + 2\n", "(1 + 2\n", "\n", "7 / 2\n"]))
+
+    status = asyncio.run(run_client(server, path, []))
+
+    captured = capsys.readouterr()
+    assert status == 1
+    assert captured.out == "3\n\n3.5\n"
+    assert "скобок" in captured.err
+
+
+def test_client_without_server(tmp_path, capsys):
+    status = client.main(["--socket", str(tmp_path / "missing.sock"), "1"])
+
+    assert status == client.CONNECTION_ERROR_STATUS
+    assert "Нет соединения" in capsys.readouterr().err
+
+
+def test_serve_unix_replaces_stale_socket(server, tmp_path, capsys):
+    path = str(tmp_path / "calculator.sock")
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(path)
+    stale.close()
+
+    assert asyncio.run(run_client(server, path, ["1", "+", "1"])) == 0
+    assert capsys.readouterr().out == "2\n"
+
+
+def test_default_socket_path(monkeypatch):
+    monkeypatch.delenv(client.SOCKET_VARIABLE, raising=False)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+    assert client.get_default_socket_path() == "/run/user/1000/calculator.sock"
+
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    assert client.get_default_socket_path() == (
+        f"/tmp/calculator-{os.getuid()}/calculator.sock"
+    )
+
+
+def test_client_refuses_foreign_socket(tmp_path, capsys, monkeypatch):
+    path = tmp_path / "calculator.sock"
+    listener = socket.socket(socket.AF_UNIX)
+    listener.bind(str(path))
+    uid = os.getuid()
+    monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+
+    try:
+        status = client.main(["--socket", str(path), "1"])
+    finally:
+        listener.close()
+
+    assert status == client.CONNECTION_ERROR_STATUS
+    assert "другому пользователю" in capsys.readouterr().err
+
+
+def test_serve_unix_keeps_foreign_file(server, tmp_path, monkeypatch):
+    path = tmp_path / "calculator.sock"
+    path.touch()
+    uid = os.getuid()
+    monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+
+    with pytest.raises(PermissionError):
+        asyncio.run(server.serve_unix(str(path)))
+    assert path.exists()
+
+
+def test_serve_unix_creates_private_directory(server, tmp_path):
+    path = tmp_path / "run" / "calculator.sock"
+
+    assert asyncio.run(run_client(server, str(path), ["1", "+", "1"])) == 0
+    assert (path.parent.stat().st_mode & 0o777) == 0o700
+
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(PermissionError):
+        asyncio.run(server.serve_unix(str(shared / "calculator.sock")))
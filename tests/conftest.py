@@ -0,0 +1,27 @@
+import pytest
+
+from src.application import Application
+from src.calculator import Calculator
+from src.tokenizer import Tokenizer
+from src.validator import Validator
+
+
+@pytest.fixture
+def make_application():
+    def make(calculator=None, **components):
+        tokenizer = Tokenizer()
+        calculator = calculator if calculator is not None else Calculator()
+        return Application(Validator(tokenizer), tokenizer, calculator, **components)
+
+    return make
+
+
+@pytest.fixture
+def big_number():
+    return "9" * 4000
+
+
+@pytest.fixture
+def expensive_expression(big_number):
+    # pow(a, b, m) над числами в 4000 цифр вычисляется несколько секунд
+    return f"{big_number} ** {big_number} % ({big_number} - 2)"
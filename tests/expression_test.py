@@ -1,14 +1,20 @@
 import pytest
 
 from src.calculator import Calculator
+from src.parser import Parser
+from src.tokens import Number
 from src.tokenizer import Tokenizer
 from src.validator import Validator
+from src.cache import ResultCache
 from src.exception import (
     BracketsBalanceError,
     EmptyBracketsError,
     InvalidBinaryOperatorError,
     NumberDotError,
     TwiceNumberError,
+    UnknownSymbolError,
+    UndefinedVariableError,
+    DigitsOverFlow,
 )
 
 
@@ -296,3 +302,445 @@ def test_correctness_zero_division(expression):
     calculator = Calculator()
     with pytest.raises(ZeroDivisionError):
         calculator.calculate(tokens)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["1 + 2", "(1+(2*3))-4", "2 ** 3 ** 2", ".5 * 4", "10 // 3 % 2"],
+)
+def test_compile_returns_validated_tokens(expression):
+    tokenizer = Tokenizer()
+    validator = Validator(tokenizer)
+    tokens = validator.compile(expression)
+    expected = Tokenizer().tokenize(expression)
+    assert [repr(token) for token in tokens] == [repr(token) for token in expected]
+
+
+@pytest.mark.parametrize(
+    "expression, exception",
+    [
+        ("1 + (2 * 3", BracketsBalanceError),
+        ("1 + ()", EmptyBracketsError),
+        ("7 + * 8", InvalidBinaryOperatorError),
+        ("12..34", NumberDotError),
+        ("(2)(3)", TwiceNumberError),
+    ],
+)
+def test_compile_raises_validation_errors(expression, exception):
+    tokenizer = Tokenizer()
+    validator = Validator(tokenizer)
+    with pytest.raises(exception):
+        validator.compile(expression)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "1 + 2 * 3 - 4 // 2",
+        "3 ** 2 ** 2",
+        "-2 ** 2",
+        "-(2 ** 2)",
+        "- (- (3))",
+        "((2 + 3) ** 2 - 1) // 2",
+        "-7 % 3",
+        "1.5 + 2.3",
+        "100 / 10 * 2",
+        "2 ** -2",
+    ],
+)
+def test_compiled_program_matches_calculate(expression):
+    tokens = Tokenizer().tokenize(expression)
+    program = Parser().parse(tokens)
+    calculator = Calculator()
+    expected = Calculator().calculate(tokens)
+    assert calculator.evaluate(program) == expected
+    assert calculator.evaluate(program) == expected
+
+
+@pytest.mark.parametrize(
+    "expression, exception",
+    [
+        ("(4 + 5) / (2 - 2)", ZeroDivisionError),
+        ("1 // (0.0)", ZeroDivisionError),
+        ("7.5 // 2", TypeError),
+        ("5 % 1.5", TypeError),
+        ("10 ** 10 ** 10", DigitsOverFlow),
+    ],
+)
+def test_compiled_program_errors_match_calculate(expression, exception):
+    tokens = Tokenizer().tokenize(expression)
+    program = Parser().parse(tokens)
+    with pytest.raises(exception) as expected:
+        Calculator().calculate(tokens)
+    with pytest.raises(exception) as actual:
+        Calculator().evaluate(program)
+    assert actual.value.args == expected.value.args
+
+
+@pytest.mark.parametrize("engine", [Calculator.RECURSIVE_ENGINE, Calculator.STACK_ENGINE])
+@pytest.mark.parametrize(
+    "expression, exception, log",
+    [
+        ("1 + 2 / 0", ZeroDivisionError, "1+2/0"),
+        ("(4 + 5) / (2 - 2)", ZeroDivisionError, "(4+5)/(2-2)"),
+        ("3 * (2 + 1) // (1 - 1) + 5", ZeroDivisionError, "3*(2+1)//(1-1)"),
+        ("7 % 0", ZeroDivisionError, "7%0"),
+        ("7.5 // 2", TypeError, "7.5//2"),
+        ("1 + 5 % 1.5", TypeError, "1+5%1.5"),
+        ("2 * (3.0 // 1)", TypeError, "2*(3.0//1"),
+        ("1 + 10 ** 10 ** 10", DigitsOverFlow, "1+10**10**10"),
+        ("(2 + 3) * 10 ** 10 ** 10", DigitsOverFlow, "(2+3)*10**10**10"),
+        ("10 ** 5000 * 10 ** 5000 - 1", DigitsOverFlow, "10**5000"),
+    ],
+)
+def test_error_log_is_expression_read_so_far(engine, expression, exception, log):
+    tokens = Tokenizer().tokenize(expression)
+    with pytest.raises(exception) as error:
+        Calculator(engine).calculate(tokens)
+    message = error.value.log if exception is DigitsOverFlow else str(error.value)
+    assert message == log
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "10 ** 4299 * 10",
+        "10 ** 4298 * 100",
+        "10 ** 4299 + 1",
+        "10 ** 4300",
+        "2 ** (10 ** 400)",
+        "10 ** 400 * 1.5",
+        "10 ** 400 / 3",
+        "2.0 ** 5000",
+    ],
+)
+def test_digits_overflow(expression):
+    tokens = Tokenizer().tokenize(expression)
+    with pytest.raises(DigitsOverFlow):
+        Calculator().calculate(tokens)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "10 ** 4298 * 9 + 10 ** 4298",
+        "10 ** 4299 % 10 ** 4299",
+        "10 ** 4299 // 3",
+        "10 ** 400 / 10 ** 390",
+        "9 ** 4500",
+    ],
+)
+def test_no_digits_overflow_on_boundary(expression):
+    tokens = Tokenizer().tokenize(expression)
+    Calculator().calculate(tokens)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "1 + 2 * 3 - 4 // 2",
+        "3 ** 2 ** 2",
+        "-2 ** 2",
+        "2 ** -2 ** 2",
+        "-(2 ** 2)",
+        "- (- (3))",
+        "--3",
+        "-3 + 4 * -2",
+        "((2 + 3) ** 2 - 1) // 2",
+        "100 - 50 // 5 * 2",
+        "-7 % 3",
+        "1.5 + 2.3",
+        "(1 + 2) * (3 + 4) // (5 - 2)",
+    ],
+)
+def test_stack_engine_matches_recursive_engine(expression):
+    tokens = Tokenizer().tokenize(expression)
+    expected = Calculator(Calculator.RECURSIVE_ENGINE).calculate(tokens)
+    assert Calculator(Calculator.STACK_ENGINE).calculate(tokens) == expected
+
+
+@pytest.mark.parametrize(
+    "expression, exception",
+    [
+        ("(4 + 5) / (2 - 2) + 1", ZeroDivisionError),
+        ("2 ** (1 / 0)", ZeroDivisionError),
+        ("7.5 // 2 * 3", TypeError),
+        ("1 + 10 ** 10 ** 10", DigitsOverFlow),
+    ],
+)
+def test_stack_engine_errors_match_recursive_engine(expression, exception):
+    tokens = Tokenizer().tokenize(expression)
+    with pytest.raises(exception) as expected:
+        Calculator(Calculator.RECURSIVE_ENGINE).calculate(tokens)
+    with pytest.raises(exception) as actual:
+        Calculator(Calculator.STACK_ENGINE).calculate(tokens)
+    assert actual.value.args == expected.value.args
+
+
+@pytest.mark.parametrize(
+    "expression, exception, position",
+    [
+        ("8(-2)", TwiceNumberError, 1),
+        ("8(**1.543)+24", TwiceNumberError, 1),
+        ("(//3)+72", InvalidBinaryOperatorError, 1),
+        ("(**0)", InvalidBinaryOperatorError, 1),
+        ("(8(-2)) * 3", TwiceNumberError, 2),
+    ],
+)
+def test_engines_reject_missing_operands(expression, exception, position):
+    # Валидатор пропускает эти выражения, поэтому их отклоняют оба движка
+    tokens = Validator(Tokenizer()).compile(expression)
+    for calculator in (
+        Calculator(Calculator.RECURSIVE_ENGINE),
+        Calculator(Calculator.STACK_ENGINE),
+        Calculator(Calculator.RECURSIVE_ENGINE, ResultCache()),
+    ):
+        with pytest.raises(exception) as error:
+            calculator.calculate(tokens)
+        assert error.value.invalid_position == position
+
+
+def test_stack_engine_handles_deep_nesting():
+    depth = 100000
+    expression = "-(" * depth + "1" + ")" * depth + " + 1"
+    tokens = Validator(Tokenizer()).compile(expression)
+    assert Calculator(Calculator.STACK_ENGINE).calculate(tokens) == 2
+
+
+@pytest.mark.parametrize(
+    "expression, result",
+    [
+        ("1+2", ["Number(1)", "Operator(+)", "Number(2)"]),
+        (" 2 ** 3 ", ["Number(2)", "Operator(**)", "Number(3)"]),
+        ("7//2%3", ["Number(7)", "Operator(//)", "Number(2)", "Operator(%)", "Number(3)"]),
+        ("2***3", ["Number(2)", "Operator(**)", "Operator(*)", "Number(3)"]),
+        (".5*(1.25)", ["Number(.5)", "Operator(*)", "Operator(()", "Number(1.25)", "Operator())"]),
+        ("1.2.3 / 4", ["Number(1.2.3)", "Operator(/)", "Number(4)"]),
+        ("\t-3\n", ["Operator(-)", "Number(3)"]),
+        ("", []),
+    ],
+)
+def test_tokenize(expression, result):
+    assert [repr(token) for token in Tokenizer().tokenize(expression)] == result
+
+
+@pytest.mark.parametrize("expression", ["1 & 2", "x", "2 ^ 3"])
+def test_tokenize_unknown_symbol(expression):
+    with pytest.raises(SyntaxError):
+        Tokenizer().tokenize(expression)
+
+
+def test_tokenize_number_types():
+    tokens = Tokenizer().tokenize("12 + 1.5 + .5")
+    assert [token.is_integer() for token in tokens if isinstance(token, Number)] == [
+        True,
+        False,
+        False,
+    ]
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["1 + 2", "(1+(2*3))-4", "2 ** 3 ** 2 // 5", ".5 * 4.25", "-(3 % 2)"],
+)
+def test_compact_token_stream_matches_token_list(expression):
+    tokenizer = Tokenizer()
+    validator = Validator(tokenizer)
+    stream = validator.compile(expression, compact=True)
+    tokens = tokenizer.tokenize(expression)
+
+    assert len(stream) == len(tokens)
+    assert [repr(token) for token in stream] == [repr(token) for token in tokens]
+    for engine in (Calculator.RECURSIVE_ENGINE, Calculator.STACK_ENGINE):
+        assert Calculator(engine).calculate(stream) == Calculator(engine).calculate(
+            tokens
+        )
+
+
+@pytest.mark.parametrize(
+    "expression, exception",
+    [
+        ("1 + (2 * 3", BracketsBalanceError),
+        ("1 + ()", EmptyBracketsError),
+        ("7 + * 8", InvalidBinaryOperatorError),
+        ("(2)(3)", TwiceNumberError),
+    ],
+)
+def test_compact_token_stream_validation_errors(expression, exception):
+    tokenizer = Tokenizer()
+    validator = Validator(tokenizer)
+    with pytest.raises(exception) as expected:
+        validator.compile(expression)
+    with pytest.raises(exception) as actual:
+        validator.compile(expression, compact=True)
+    assert str(actual.value) == str(expected.value)
+
+
+def test_compact_token_stream_shares_operators():
+    stream = Tokenizer().tokenize_compact("1 + 2 + 3")
+    assert stream[1] is stream[3]
+    assert stream.get_text(4) == "3"
+
+
+def test_compact_token_stream_reuses_last_number():
+    stream = Tokenizer().tokenize_compact("1 + 2")
+    number = stream[2]
+
+    assert stream[2] is number
+    assert stream[-1] is number
+    assert stream[0] is not number
+    assert repr(stream[2]) == repr(number)
+
+
+@pytest.mark.parametrize(
+    "expression, exception, position",
+    [
+        ("() 1 2 (", BracketsBalanceError, -1),
+        (")(", BracketsBalanceError, -1),
+        ("1 2 + ()", EmptyBracketsError, 3),
+        ("1 2 * (3) +", InvalidBinaryOperatorError, 6),
+        ("* 1 2", InvalidBinaryOperatorError, 0),
+        ("1 2 + * 3", InvalidBinaryOperatorError, 3),
+        ("1 + 2 (3) (4)", TwiceNumberError, 4),
+        ("(1)(2)", TwiceNumberError, 4),
+    ],
+)
+def test_validation_error_priority_and_position(expression, exception, position):
+    validator = Validator(Tokenizer())
+    with pytest.raises(exception) as error:
+        validator.check_correctness_expression(expression)
+    assert error.value.invalid_position == position
+
+
+@pytest.mark.parametrize(
+    "expression, exception, position",
+    [
+        ("1 + 2 & 3 $", UnknownSymbolError, 6),
+        ("1 + ١", UnknownSymbolError, 4),
+        ("1. + 2", NumberDotError, 1),
+        ("1 + .", NumberDotError, 4),
+        ("12.34.5 + 1", NumberDotError, 5),
+        ("1 + 2 ..3", NumberDotError, 7),
+        ("1.5 + 2.", NumberDotError, 7),
+    ],
+)
+def test_symbol_error_position(expression, exception, position):
+    validator = Validator(Tokenizer())
+    with pytest.raises(exception) as error:
+        validator.check_correctness_symbols(expression)
+    assert error.value.invalid_position == position
+
+
+def test_token_error_rendering_is_idempotent():
+    tokens = Tokenizer().tokenize("1 + 2 3")
+    error = TwiceNumberError(tokens, 3)
+    rendered = str(error)
+    assert str(error) == rendered
+    assert error.invalid_position == 3
+    assert rendered.splitlines()[1] == "      ^"
+
+
+def test_token_error_rendering_window():
+    tokens = Tokenizer().tokenize(" + ".join(["12"] * 1000) + " + * 1")
+    error = InvalidBinaryOperatorError(tokens, 2000)
+    error.CONTEXT_TOKENS = 2
+    expression_line, caret_line, message = str(error).splitlines()
+    assert expression_line == "... 12 + * 1 "
+    assert caret_line == "         ^"
+    assert message == InvalidBinaryOperatorError.ERROR_MESSAGE
+
+
+@pytest.mark.parametrize(
+    "expression, variables, result",
+    [
+        ("x + 1", {"x": 2}, 3),
+        ("-x ** 2", {"x": 3}, 9),
+        ("rate * (base_1 - 0.5)", {"rate": 2, "base_1": 1.5}, 2.0),
+        ("x // y % 4", {"x": 17, "y": 2}, 0),
+    ],
+)
+def test_calculate_with_variables(expression, variables, result):
+    validator = Validator(Tokenizer(), allow_variables=True)
+    for engine in (Calculator.RECURSIVE_ENGINE, Calculator.STACK_ENGINE):
+        tokens = validator.compile(expression)
+        assert Calculator(engine).calculate(tokens, variables) == result
+        compact = validator.compile(expression, compact=True)
+        assert Calculator(engine).calculate(compact, variables) == result
+
+
+@pytest.mark.parametrize("engine", [Calculator.RECURSIVE_ENGINE, Calculator.STACK_ENGINE])
+def test_calculate_undefined_variable(engine):
+    tokens = Validator(Tokenizer(), allow_variables=True).compile("1 + (x * y)")
+    with pytest.raises(UndefinedVariableError) as error:
+        Calculator(engine).calculate(tokens, {"x": 1})
+    assert error.value.invalid_position == 5
+
+
+@pytest.mark.parametrize("expression", ["x + 1", "2 * rate"])
+def test_variables_not_allowed_by_default(expression):
+    with pytest.raises(UnknownSymbolError):
+        Validator(Tokenizer()).compile(expression)
+
+
+@pytest.mark.parametrize("expression", ["x y", "2x", "x (1)"])
+def test_variables_validated_as_numbers(expression):
+    with pytest.raises(TwiceNumberError):
+        Validator(Tokenizer(), allow_variables=True).compile(expression)
+
+
+def test_tokenize_variables():
+    tokens = Tokenizer().tokenize("x1 + _y*2", allow_variables=True)
+    assert [repr(token) for token in tokens] == [
+        "Variable(x1)",
+        "Operator(+)",
+        "Variable(_y)",
+        "Operator(*)",
+        "Number(2)",
+    ]
+
+
+@pytest.mark.parametrize("engine", [Calculator.RECURSIVE_ENGINE, Calculator.STACK_ENGINE])
+@pytest.mark.parametrize(
+    "expression, result",
+    [
+        ("7 ** 200000 % 13", pow(7, 200000, 13)),
+        ("(7 ** 200000) % 13 + 1", pow(7, 200000, 13) + 1),
+        ("((3 ** 100000)) % 1000", pow(3, 100000, 1000)),
+        ("2 ** 3 ** 4 % 1000", pow(2, 81, 1000)),
+        ("(-7) ** 3 % (-5)", -3),
+        ("0 ** 0 % 5", 1),
+    ],
+)
+def test_fused_power_modulo(engine, expression, result):
+    tokens = Validator(Tokenizer()).compile(expression)
+    assert Calculator(engine).calculate(tokens) == result
+
+
+@pytest.mark.parametrize("engine", [Calculator.RECURSIVE_ENGINE, Calculator.STACK_ENGINE])
+@pytest.mark.parametrize(
+    "expression, exception, log",
+    [
+        ("7 ** 200000 % 0", DigitsOverFlow, "7**200000"),
+        ("7 ** 20 % (1 - 1)", ZeroDivisionError, "7**20%(1-1)"),
+        ("7 ** 2 % 2.0", TypeError, "7**2%2.0"),
+        ("2 ** (-1) % 3", TypeError, "2**(-1)%3"),
+        ("-(7 ** 200000) % 13", DigitsOverFlow, "-(7**200000"),
+        ("(7 ** 200000 + 0) % 13", DigitsOverFlow, "(7**200000"),
+    ],
+)
+def test_power_modulo_fallback_keeps_checks(engine, expression, exception, log):
+    tokens = Validator(Tokenizer()).compile(expression)
+    with pytest.raises(exception) as error:
+        Calculator(engine).calculate(tokens)
+    message = error.value.log if exception is DigitsOverFlow else str(error.value)
+    assert message == log
+
+
+def test_power_before_remainder_is_deferred_in_program():
+    tokens = Validator(Tokenizer()).compile("2 ** 3 % 5 + 2 ** 3")
+    operations = [operation for operation, _, _ in Parser().parse(tokens).instructions]
+    assert operations.count("deferred_power") == 1
+    assert operations == [
+        operation
+        for operation, _, _ in Parser().parse_iterative(tokens).instructions
+    ]
@@ -0,0 +1,104 @@
+import random
+import sys
+import pytest
+
+from src.calculator import Calculator, count_digits
+from src.tokenizer import Tokenizer
+from src.formatter import ResultFormatter
+
+
+@pytest.fixture
+def unlimited_str_digits():
+    limit = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    yield
+    sys.set_int_max_str_digits(limit)
+
+
+def test_decimal_matches_builtin(unlimited_str_digits):
+    formatter = ResultFormatter()
+    generator = random.Random(0)
+
+    for bits in (0, 1, 64, 127, 128, 129, 1000, 2**16, 2**16 + 1, 300_000):
+        number = generator.getrandbits(bits) if bits else 0
+        for value in (number, -number, 2**bits, 2**bits - 1):
+            assert formatter.format(value) == str(value)
+
+
+def test_decimal_above_str_digits_limit():
+    number = 10**10000 - 1
+
+    with pytest.raises(ValueError):
+        str(number)
+
+    text = ResultFormatter().format(number)
+    assert text == "9" * 10000
+    assert ResultFormatter().format(-number) == "-" + text
+
+
+def test_scientific(unlimited_str_digits):
+    formatter = ResultFormatter(ResultFormatter.SCIENTIFIC, significant_digits=4)
+
+    assert formatter.format(0) == "0.000e+00"
+    assert formatter.format(7) == "7.000e+00"
+    assert formatter.format(123456) == "1.235e+05"
+    assert formatter.format(-123449) == "-1.234e+05"
+    assert formatter.format(99995) == "1.000e+05"
+    assert formatter.format(2.5) == "2.500e+00"
+
+    digits = str(3**50000)
+    head = str((int(digits[:5]) + 5) // 10)
+    assert formatter.format(3**50000) == f"{head[0]}.{head[1:]}e+{len(digits) - 1}"
+
+    assert ResultFormatter(ResultFormatter.SCIENTIFIC, 1).format(250) == "3e+02"
+
+
+def test_hex_and_digits(unlimited_str_digits):
+    hex_formatter = ResultFormatter(ResultFormatter.HEX)
+    digits_formatter = ResultFormatter(ResultFormatter.DIGITS)
+
+    assert hex_formatter.format(255) == "0xff"
+    assert hex_formatter.format(-255) == "-0xff"
+    assert hex_formatter.format(0.5) == "0x1.0000000000000p-1"
+
+    for number in (0, 9, 10, 99, 100, 10**4000 - 1, 10**4000, -(7**9999)):
+        expected = len(str(abs(number)))
+        assert count_digits(number) == expected
+        assert digits_formatter.format(number) == str(expected)
+    assert digits_formatter.format(2.5) == "2.5"
+
+
+def test_digits_of_zero_result(make_application):
+    application = make_application(formatter=ResultFormatter(ResultFormatter.DIGITS))
+
+    output, _ = application.process_chunk(0, ["0", "5 - 5", "-7"], False)
+
+    assert output == "1\n1\n1\n"
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        ResultFormatter("octal")
+
+
+def test_max_digits_allows_longer_results(make_application):
+    tokenizer = Tokenizer()
+    tokens = tokenizer.tokenize("2 ** 100000")
+
+    assert Calculator(max_digits=40000).calculate(tokens) == 2**100000
+
+    application = make_application(
+        Calculator(max_digits=40000),
+        formatter=ResultFormatter(ResultFormatter.DIGITS),
+    )
+    output, _ = application.process_chunk(0, ["2 ** 100000", "10 ** 5000"], False)
+    assert output == "30103\n5001\n"
+
+
+def test_integer_results_are_not_rounded():
+    calculator = Calculator()
+    tokens = Tokenizer().tokenize("2 ** 3000 + 1")
+
+    result = calculator.calculate(tokens)
+    assert type(result) is int and result == 2**3000 + 1
+    assert calculator.calculate(Tokenizer().tokenize("10 / 3")) == 3.33
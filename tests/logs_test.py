@@ -0,0 +1,120 @@
+import asyncio
+import json
+import logging
+
+from src.application import Application
+from src.server import EvaluationServer
+from src.logs import ErrorRateLimitFilter, JsonFormatter, configure_logging
+
+
+def create_logger(name):
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.handlers.clear()
+    return logger
+
+
+def log_errors(application, expressions):
+    for expression in expressions:
+        try:
+            application.process(expression)
+        except Application.EVALUATION_ERRORS as exception:
+            application.log_error(expression, exception)
+
+
+def read_records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_queued_json_records(make_application, tmp_path, capsys):
+    path = tmp_path / "log.txt"
+    logger = create_logger("tests.logs.queued")
+    listener = configure_logging(str(path), structured=True, queued=True, logger=logger)
+
+    application = make_application()
+    application.logger = logger
+    log_errors(application, ["1 + $", "1 / 0", "1 + 2"])
+    listener.stop()
+
+    records = read_records(path)
+    assert [record["error"] for record in records] == [
+        "UnknownSymbolError",
+        "ZeroDivisionError",
+    ]
+    assert records[0]["position"] == 4
+    assert records[1]["position"] is None
+    assert records[0]["level"] == "ERROR"
+    assert len(records[0]["expression_hash"]) == 16
+    assert records[0]["expression_hash"] != records[1]["expression_hash"]
+    assert "Запрещено делить на ноль" in records[1]["message"]
+    assert capsys.readouterr().err.count("\n") == 2
+
+
+def test_rate_limit_per_error_class(make_application, tmp_path):
+    path = tmp_path / "log.txt"
+    logger = create_logger("tests.logs.limited")
+    configure_logging(str(path), structured=True, rate_limit=2, logger=logger)
+
+    application = make_application()
+    application.logger = logger
+    log_errors(application, ["1 / 0"] * 5 + ["1 + $"] * 3)
+    for handler in logger.handlers:
+        handler.close()
+
+    records = read_records(path)
+    assert [record["error"] for record in records] == [
+        "ZeroDivisionError",
+        "ZeroDivisionError",
+        "UnknownSymbolError",
+        "UnknownSymbolError",
+    ]
+
+
+def test_rate_limit_shared_between_handlers(make_application, tmp_path, capsys):
+    path = tmp_path / "log.txt"
+    logger = create_logger("tests.logs.shared")
+    configure_logging(str(path), structured=True, rate_limit=2, logger=logger)
+
+    application = make_application()
+    application.logger = logger
+    log_errors(application, ["1 / 0"] * 5)
+    for handler in logger.handlers:
+        handler.close()
+
+    file_filters, stream_filters = (handler.filters for handler in logger.handlers)
+    assert file_filters[0] is stream_filters[0]
+    assert file_filters[0].windows["ZeroDivisionError"][1:] == [2, 3]
+    assert len(read_records(path)) == 2
+    assert capsys.readouterr().err.count("\n") == 2
+
+
+def test_rate_limit_reports_suppressed():
+    limit = ErrorRateLimitFilter(1, period=0)
+    limit.windows["ZeroDivisionError"] = [float("-inf"), 1, 3]
+    record = logging.makeLogRecord({"error": "ZeroDivisionError"})
+
+    assert limit.filter(record)
+    assert record.suppressed == 3
+    assert limit.filter(logging.makeLogRecord({"msg": "без класса ошибки"}))
+
+
+def test_json_formatter_without_extra_fields():
+    record = logging.makeLogRecord({"msg": "сервер запущен", "levelname": "INFO"})
+
+    document = json.loads(JsonFormatter().format(record))
+
+    assert document["message"] == "сервер запущен"
+    assert "error" not in document
+
+
+def test_server_logs_expression_errors(make_application, caplog):
+    server = EvaluationServer(make_application())
+
+    with caplog.at_level(logging.ERROR, logger="src.application"):
+        asyncio.run(server.respond_async(b"1 + $\n"))
+        asyncio.run(server.respond_async(b"1 + 2\n"))
+
+    (record,) = caplog.records
+    assert record.error == "UnknownSymbolError"
+    assert record.position == 4
+    assert len(record.expression_hash) == 16
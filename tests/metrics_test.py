@@ -0,0 +1,82 @@
+import io
+
+from src.cache import ResultCache
+from src.metrics import Histogram, PipelineMetrics
+
+
+def test_histogram_statistics():
+    histogram = Histogram()
+    for value in [1, 2, 3, 100, 1000]:
+        histogram.add(value)
+
+    statistics = histogram.get_statistics()
+
+    assert statistics["count"] == 5
+    assert statistics["total"] == 1106
+    assert statistics["min"] == 1
+    assert statistics["max"] == 1000
+    assert statistics["p50"] == 3
+    assert statistics["p99"] == 1000
+    assert sum(bucket["count"] for bucket in statistics["buckets"]) == 5
+
+
+def test_histogram_merge():
+    first = Histogram()
+    second = Histogram()
+    first.add(5)
+    second.add(50)
+    second.add(500)
+
+    first.merge(second)
+
+    assert (first.count, first.total, first.minimum, first.maximum) == (3, 555, 5, 500)
+
+
+def test_pipeline_metrics_record_stages_tokens_and_errors(make_application):
+    metrics = PipelineMetrics()
+    application = make_application(metrics=metrics)
+
+    results = dict(application.evaluate_many(["1 + 2", "(1 + 2", "1 / 0", "1 $ 2"]))
+
+    assert results[0] == 3
+    statistics = metrics.get_statistics()
+    assert statistics["errors"] == {
+        "BracketsBalanceError": 1,
+        "UnknownSymbolError": 1,
+        "ZeroDivisionError": 1,
+    }
+    assert statistics["stages_ns"]["validation"]["count"] == 4
+    assert statistics["stages_ns"]["tokenization"]["count"] == 3
+    assert statistics["stages_ns"]["evaluation"]["count"] == 2
+    assert statistics["tokens"]["total"] == 3 + 4 + 3
+
+
+def test_pipeline_metrics_merged_from_parallel_batch(make_application):
+    metrics = PipelineMetrics()
+    application = make_application(metrics=metrics)
+    input_stream = io.StringIO("".join(f"{index} * 2\n" for index in range(20)))
+    output_stream = io.StringIO()
+
+    application.execute_batch(input_stream, output_stream, workers=2, chunk_size=3)
+
+    statistics = metrics.get_statistics()
+    assert statistics["stages_ns"]["evaluation"]["count"] == 20
+    assert statistics["stages_ns"]["output"]["count"] == 20
+    assert statistics["tokens"]["total"] == 60
+
+
+def test_pipeline_metrics_count_cached_errors(make_application):
+    metrics = PipelineMetrics()
+    application = make_application(cache=ResultCache(), metrics=metrics)
+
+    dict(application.evaluate_many(["1 / 0", "1 / 0", "(1 + 2", "(1 + 2", "1 + 2"]))
+
+    assert metrics.get_statistics()["errors"] == {
+        "BracketsBalanceError": 2,
+        "ZeroDivisionError": 2,
+    }
+
+
+def test_application_without_metrics(make_application):
+    application = make_application()
+    assert dict(application.evaluate_many(["2 ** 3"])) == {0: 8}
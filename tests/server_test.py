@@ -0,0 +1,156 @@
+import asyncio
+import json
+import os
+import signal
+import pytest
+
+from src.calculator import Calculator
+from src.server import EvaluationServer
+from src.formatter import ResultFormatter
+from src.metrics import PipelineMetrics
+from src.supervisor import SupervisedCalculator
+
+@pytest.fixture
+def make_server(make_application):
+    def make(max_line_length=2**20, **components):
+        return EvaluationServer(make_application(**components), max_line_length)
+
+    return make
+
+
+def respond(server, line):
+    return asyncio.run(server.respond_async(line))
+
+
+async def exchange(server, requests, clients=1):
+    listener = await asyncio.start_server(
+        server.handle_connection, "127.0.0.1", 0, limit=server.max_line_length
+    )
+    port = listener.sockets[0].getsockname()[1]
+
+    async def client():
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        # Все запросы отправляются до чтения первого ответа
+        writer.write(b"".join(request + b"\n" for request in requests))
+        await writer.drain()
+        writer.write_eof()
+        responses = [json.loads(line) async for line in reader]
+        writer.close()
+        return responses
+
+    async with listener:
+        return await asyncio.gather(*(client() for _ in range(clients)))
+
+
+def test_respond_result_and_error(make_server):
+    server = make_server()
+
+    assert json.loads(respond(server, b"2 ** 10\n")) == {"result": 1024}
+    assert json.loads(respond(server, b"7 / 2\r\n")) == {"result": 3.5}
+    assert json.loads(respond(server, b"\n")) == {"result": None}
+
+    response = json.loads(respond(server, b"1 + $\n"))
+    assert response["error"] == "UnknownSymbolError"
+    assert response["position"] == 4
+    assert response["message"]
+
+    response = json.loads(respond(server, b"1 / 0\n"))
+    assert response["error"] == "ZeroDivisionError"
+    assert response["position"] is None
+
+
+def test_respond_complex_result_is_error(make_server):
+    server = make_server()
+
+    response = json.loads(respond(server, b"-2 ** 0.5\n"))
+
+    assert response["error"] == "TypeError"
+    assert json.loads(respond(server, b"1 + 1\n")) == {"result": 2}
+
+
+def test_pipelined_requests_keep_order(make_server):
+    server = make_server()
+    requests = [b"1 + 2", b"(1 + 2", b"", b"3 * 4", b"1.5 // 2", b"2 ** 100"]
+
+    (responses,) = asyncio.run(exchange(server, requests))
+
+    assert responses[0] == {"result": 3}
+    assert responses[1]["error"] == "BracketsBalanceError"
+    assert responses[2] == {"result": None}
+    assert responses[3] == {"result": 12}
+    assert responses[4]["error"] == "TypeError"
+    assert responses[5] == {"result": 2**100}
+
+
+def test_concurrent_clients(make_server):
+    server = make_server()
+    requests = [str(index).encode() + b" * 2" for index in range(200)]
+
+    all_responses = asyncio.run(exchange(server, requests, clients=8))
+
+    expected = [{"result": index * 2} for index in range(200)]
+    assert all(responses == expected for responses in all_responses)
+
+
+def test_line_too_long_closes_connection(make_server):
+    server = make_server(max_line_length=64)
+
+    (responses,) = asyncio.run(exchange(server, [b"1 + 1", b"1" * 1000, b"2 + 2"]))
+
+    assert responses[0] == {"result": 2}
+    assert responses[1]["error"] == "LineTooLong"
+    assert len(responses) == 2
+
+
+def test_respond_uses_application_formatter(make_server):
+    server = make_server(
+        calculator=Calculator(max_digits=20000),
+        formatter=ResultFormatter(ResultFormatter.HEX),
+    )
+
+    assert json.loads(respond(server, b"255\n")) == {"result": "0xff"}
+
+    server.application.formatter = ResultFormatter()
+    response = respond(server, b"10 ** 9999\n")
+    assert response == b'{"result": 1' + b"0" * 9999 + b"}\n"
+
+
+@pytest.mark.parametrize("measured", [False, True])
+def test_slow_expression_does_not_block_other_clients(
+    make_server, expensive_expression, measured
+):
+    calculator = SupervisedCalculator(Calculator(), max_cost=10**7, timeout=60)
+    metrics = PipelineMetrics() if measured else None
+    server = make_server(calculator=calculator, metrics=metrics)
+    finished = list()
+
+    async def request(port, expression):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(expression.encode() + b"\n")
+        response = json.loads(await reader.readline())
+        writer.close()
+        finished.append(expression)
+        return response
+
+    async def run():
+        listener = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            slow = asyncio.create_task(request(port, expensive_expression))
+            # Дорогое выражение отправлено в процесс вычислений
+            while calculator.worker is None or calculator.worker.pid is None:
+                await asyncio.sleep(0.01)
+            cheap = await request(port, "1 + 1")
+            assert finished == ["1 + 1"]
+            os.kill(calculator.worker.pid, signal.SIGKILL)
+            return cheap, await slow
+
+    try:
+        cheap, slow = asyncio.run(run())
+    finally:
+        calculator.close()
+
+    assert cheap == {"result": 2}
+    assert slow["error"] == "WorkerCrashedError"
+    if measured:
+        assert metrics.errors == {"WorkerCrashedError": 1}
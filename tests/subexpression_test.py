@@ -0,0 +1,81 @@
+import pytest
+
+from src.cache import ResultCache
+from src.calculator import Calculator
+from src.parser import Parser
+from src.subexpression import SubexpressionPlan
+from src.tokenizer import Tokenizer
+from src.validator import Validator
+
+
+def create_plan(expression, allow_variables=False):
+    tokens = Validator(Tokenizer(), allow_variables).compile(expression)
+    return SubexpressionPlan(Parser().parse(tokens))
+
+
+def get_root_keys(plan):
+    return [plan.roots[index] for index in sorted(plan.roots)]
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [("(1 + 2)", "(2 + 1)"), ("(2 * 3.5)", "(3.5*2)"), ("2 ** 3", "(2 ** 3)")],
+)
+def test_equivalent_subtrees_have_same_key(first, second):
+    assert get_root_keys(create_plan(first))[-1] == get_root_keys(create_plan(second))[-1]
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [("(1 - 2)", "(2 - 1)"), ("(2 ** 3)", "(3 ** 2)"), ("(1 + 2)", "(1 + 2.0)")],
+)
+def test_different_subtrees_have_different_keys(first, second):
+    assert get_root_keys(create_plan(first)) != get_root_keys(create_plan(second))
+
+
+def test_plan_skips_numbers_and_variables():
+    plan = create_plan("(5) + (x * 2) + (2 * 3)", allow_variables=True)
+    assert len(plan.roots) == 1
+
+
+def test_plan_orders_nested_subtrees_from_outermost():
+    plan = create_plan("((2 ** 3) + 1)")
+    assert [root for root, _ in plan.starts[0]] == [4, 2]
+
+
+@pytest.mark.parametrize("engine", [Calculator.RECURSIVE_ENGINE, Calculator.STACK_ENGINE])
+def test_subexpression_cache_reuses_results(engine):
+    cache = ResultCache()
+    calculator = Calculator(engine, cache)
+    validator = Validator(Tokenizer())
+
+    assert calculator.calculate(validator.compile("(2 ** 10 + 1) * (1 + 2 ** 10)")) == 1050625
+    assert cache.hits == 1
+    assert calculator.calculate(validator.compile("3 - (1 + 1024)")) == -1022
+    assert cache.hits == 1
+    assert calculator.calculate(validator.compile("-(2 ** 10 + 1) // 2")) == -513
+    assert cache.hits == 2
+
+
+@pytest.mark.parametrize("engine", [Calculator.RECURSIVE_ENGINE, Calculator.STACK_ENGINE])
+def test_subexpression_cache_keeps_errors(engine):
+    calculator = Calculator(engine, ResultCache())
+    tokens = Validator(Tokenizer()).compile("(2 ** 3) + (2 ** 3) / (1 - 1)")
+
+    for _ in range(2):
+        with pytest.raises(ZeroDivisionError) as error:
+            calculator.calculate(tokens)
+        assert str(error.value) == "(2**3)+(2**3)/(1-1)"
+
+
+def test_plan_is_built_once_per_program():
+    tokens = Validator(Tokenizer()).compile("(2 ** 10 + 1) * (3 + 4)")
+    program = Parser().parse_iterative(tokens)
+    calculator = Calculator(subexpression_cache=ResultCache())
+
+    assert calculator.evaluate(program) == 1025 * 7
+    plan = program.subexpression_plan
+    assert plan is not None
+
+    assert calculator.evaluate(program) == 1025 * 7
+    assert program.subexpression_plan is plan
@@ -0,0 +1,174 @@
+import asyncio
+import os
+import pickle
+import signal
+import threading
+import time
+import pytest
+
+from src.calculator import Calculator
+from src.parser import Parser
+from src.tokenizer import Tokenizer
+from src.tokens import OPERATORS
+from src.supervisor import CostEstimator, SupervisedCalculator
+from src.exception import (
+    EvaluationTimeoutError,
+    WorkerCrashedError,
+    DigitsOverFlow,
+    UndefinedVariableError,
+)
+
+def estimate(expression, variables=None):
+    tokens = Tokenizer().tokenize(expression, allow_variables=True)
+    return CostEstimator().estimate(Parser().parse_iterative(tokens), variables)
+
+
+@pytest.fixture
+def supervised():
+    calculator = SupervisedCalculator(Calculator(), max_cost=10**7, timeout=0.5)
+    yield calculator
+    calculator.close()
+
+
+def test_operator_pickles_as_singleton():
+    for operator in OPERATORS.values():
+        assert pickle.loads(pickle.dumps(operator)) is operator
+
+
+def test_estimate_orders_expressions_by_cost(big_number, expensive_expression):
+    product = f"{big_number} * {big_number}"
+
+    assert estimate("1 + 2") < estimate(product) < estimate(expensive_expression)
+    assert estimate(expensive_expression) > 10**9
+
+
+def test_estimate_bounds_results_by_digits_limit():
+    # Результат больше допустимого количества цифр вызывает DigitsOverFlow
+    # до вычисления, поэтому такие степени дешёвые
+    assert estimate("9 ** 9999999") < 10**6
+    assert estimate("2 ** 10 ** 10 ** 10") < 10**6
+
+
+def test_estimate_uses_variable_values(big_number):
+    big = int(big_number)
+
+    assert estimate("x ** y % m", {"x": 3, "y": 5, "m": 7}) < estimate(
+        "x ** y % m", {"x": big, "y": big, "m": big}
+    )
+
+
+def test_cheap_expressions_stay_in_process(supervised):
+    tokenizer = Tokenizer()
+
+    assert supervised.calculate(tokenizer.tokenize("2 ** 100 % 7")) == 2
+    assert supervised.calculate(tokenizer.tokenize("7 / 2")) == 3.5
+    with pytest.raises(DigitsOverFlow):
+        supervised.calculate(tokenizer.tokenize("9 ** 9999999"))
+    assert supervised.worker is None
+
+
+def test_expensive_expression_is_killed(supervised, expensive_expression):
+    tokenizer = Tokenizer()
+
+    with pytest.raises(EvaluationTimeoutError) as error:
+        supervised.calculate(tokenizer.tokenize(expensive_expression))
+    assert error.value.log.startswith("999")
+    assert supervised.worker is None
+
+    supervised.max_cost = 0
+    assert supervised.calculate(tokenizer.tokenize("1 + 2")) == 3
+    assert supervised.worker.is_alive()
+
+
+def test_worker_results_and_errors():
+    calculator = SupervisedCalculator(Calculator(), max_cost=0, timeout=5)
+    tokenizer = Tokenizer()
+
+    try:
+        assert calculator.calculate(tokenizer.tokenize("3 ** 200 % 1000")) == pow(
+            3, 200, 1000
+        )
+        worker = calculator.worker
+        assert worker.is_alive()
+
+        with pytest.raises(ZeroDivisionError):
+            calculator.calculate(tokenizer.tokenize("(2 ** 3) / 0"))
+        with pytest.raises(UndefinedVariableError):
+            calculator.calculate(tokenizer.tokenize("x + 1", allow_variables=True))
+        assert calculator.calculate(
+            tokenizer.tokenize("x * 2", allow_variables=True), {"x": 21}
+        ) == 42
+
+        assert calculator.worker is worker
+    finally:
+        calculator.close()
+
+    assert calculator.worker is None
+
+
+def test_worker_evaluates_deep_nesting_like_current_process():
+    calculator = SupervisedCalculator(Calculator(), max_cost=0, timeout=5)
+    tokenizer = Tokenizer()
+    nested = "(" * 5000 + "{}" + ")" * 5000
+
+    try:
+        assert calculator.calculate(tokenizer.tokenize(nested.format("1 + 2"))) == 3
+        with pytest.raises(ZeroDivisionError):
+            calculator.calculate(tokenizer.tokenize(nested.format("1 / 0")))
+        assert calculator.worker.is_alive()
+    finally:
+        calculator.close()
+
+
+def test_copy_does_not_share_worker():
+    calculator = SupervisedCalculator(Calculator(), max_cost=0, timeout=5)
+
+    try:
+        calculator.calculate(Tokenizer().tokenize("1 + 1"))
+        copy = pickle.loads(pickle.dumps(calculator))
+        assert copy.worker is None and copy.connection is None
+    finally:
+        calculator.close()
+
+
+def test_crashed_worker_is_evaluation_error(make_application, expensive_expression):
+    calculator = SupervisedCalculator(Calculator(), max_cost=10**7, timeout=30)
+    application = make_application(calculator)
+
+    def kill_worker():
+        while calculator.worker is None or calculator.worker.pid is None:
+            time.sleep(0.01)
+        os.kill(calculator.worker.pid, signal.SIGKILL)
+
+    killer = threading.Thread(target=kill_worker)
+    killer.start()
+    try:
+        results = dict(application.evaluate_many([expensive_expression, "1 + 2"]))
+    finally:
+        killer.join()
+        calculator.close()
+
+    assert isinstance(results[0], WorkerCrashedError)
+    assert results[1] == 3
+
+
+def test_calculate_async_does_not_block_event_loop(supervised, expensive_expression):
+    tokenizer = Tokenizer()
+    finished = list()
+
+    async def calculate(expression):
+        try:
+            await supervised.calculate_async(tokenizer.tokenize(expression))
+        except EvaluationTimeoutError:
+            pass
+        finished.append(expression)
+
+    async def run():
+        expensive = asyncio.create_task(calculate(expensive_expression))
+        await asyncio.sleep(0)
+        await calculate("1 + 1")
+        assert finished == ["1 + 1"]
+        await expensive
+
+    asyncio.run(run())
+    assert finished == ["1 + 1", expensive_expression]
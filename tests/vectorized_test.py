@@ -0,0 +1,117 @@
+import pytest
+
+from src.calculator import Calculator
+from src.tokenizer import Tokenizer
+from src.validator import Validator
+from src.exception import UndefinedVariableError
+
+np = pytest.importorskip("numpy")
+
+from src.vectorized import VectorizedCalculator  # noqa: E402
+
+
+def compile_expression(expression):
+    return Validator(Tokenizer(), allow_variables=True).compile(expression)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "x + y * 2",
+        "-x ** 2 + (y - 1) * f",
+        "x / y",
+        "x // y",
+        "(x + 1) % (y + 10) ** 2",
+        "2 ** (-y)",
+        "0 ** (y - 3)",
+        "f // 2",
+    ],
+)
+def test_vectorized_matches_calculator(expression):
+    columns = {
+        "x": np.arange(-5, 6),
+        "y": np.array([0, 1, 2, 3, -2, 0, 4, 5, 6, -1, 2]),
+        "f": np.arange(-5, 6) * 0.5,
+    }
+    tokens = compile_expression(expression)
+
+    result = VectorizedCalculator().calculate(tokens, columns)
+
+    for row in range(11):
+        variables = {name: column[row].item() for name, column in columns.items()}
+        try:
+            expected = Calculator().calculate(tokens, variables)
+        except ZeroDivisionError:
+            assert result.zero_division[row]
+        except TypeError:
+            assert result.integer_type[row]
+        else:
+            assert result.get_valid()[row]
+            assert result.values[row] == pytest.approx(expected)
+
+
+def test_vectorized_masks():
+    tokens = compile_expression("a / b + a // c")
+    result = VectorizedCalculator().calculate(
+        tokens, {"a": np.array([1, 2, 3]), "b": np.array([1, 0, 1]), "c": 1.5}
+    )
+
+    assert result.zero_division.tolist() == [False, True, False]
+    assert result.integer_type.tolist() == [True, True, True]
+    assert result.get_valid().tolist() == [False, False, False]
+
+
+def test_vectorized_undefined_variable():
+    with pytest.raises(UndefinedVariableError):
+        VectorizedCalculator().calculate(compile_expression("x + z"), {"x": np.ones(3)})
+
+
+def test_vectorized_integer_overflow():
+    calculator = VectorizedCalculator()
+
+    result = calculator.calculate(compile_expression("3 ** 40 * x"), {"x": np.ones(2, int)})
+    assert result.overflow.tolist() == [True, True]
+    assert not result.get_valid().any()
+
+    result = calculator.calculate(
+        compile_expression("x ** 40 - (x * 2 ** 62 + x * 2 ** 62)"),
+        {"x": np.array([1, 2, 3])},
+    )
+    assert result.overflow.tolist() == [True, True, True]
+
+    x = np.array([1, 2, 3, -3])
+    result = calculator.calculate(compile_expression("-(x ** 40) // 1 + 1"), {"x": x})
+    assert result.overflow.tolist() == [False, False, True, True]
+    assert result.values[:2].tolist() == [
+        Calculator().calculate(compile_expression(f"-({value} ** 40) // 1 + 1"))
+        for value in (1, 2)
+    ]
+
+    result = calculator.calculate(compile_expression("x * 1.5 ** 100"), {"x": x})
+    assert not result.overflow.any()
+
+
+@pytest.mark.parametrize("expression", ["x ** y % m", "(x + 1) ** y % m - 1"])
+def test_vectorized_power_modulo_matches_calculator(expression):
+    columns = {
+        "x": np.array([3, -7, 2, 10, 5, 2, 0, 12, 3]),
+        "y": np.array([200, 10**12, 3, 2**62, -1, 5, 0, 7, 4]),
+        "m": np.array([1000, 13, -5, 97, 3, 0, 7, -1, 2**40]),
+    }
+    tokens = compile_expression(expression)
+
+    result = VectorizedCalculator().calculate(tokens, columns)
+
+    for row in range(len(columns["x"]) - 1):
+        variables = {name: column[row].item() for name, column in columns.items()}
+        try:
+            expected = Calculator().calculate(tokens, variables)
+        except ZeroDivisionError:
+            assert result.zero_division[row]
+        except TypeError:
+            assert result.integer_type[row]
+        else:
+            assert result.get_valid()[row]
+            assert result.values[row] == expected
+
+    assert result.overflow.tolist() == [False] * 8 + [True]